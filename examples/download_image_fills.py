@@ -7,28 +7,21 @@ export_components.py. The URLs expire, so download them now rather than storing
 """
 
 import sys
-from pathlib import Path
-
-import httpx
 
 import figmapy
 
 
 def main(url, out_dir="."):
-    out = Path(out_dir)
-    out.mkdir(parents=True, exist_ok=True)
-
     figma = figmapy.Figma()
     fills = figma.get_image_fills(figmapy.file_key_from_url(url))
 
-    for image_ref, image_url in fills.meta.images.items():
-        response = httpx.get(image_url, follow_redirects=True)
-        suffix = {"image/png": ".png", "image/jpeg": ".jpg", "image/svg+xml": ".svg"}.get(
-            response.headers.get("content-type", "").split(";")[0], ""
-        )
-        path = out / f"{image_ref}{suffix}"
-        path.write_bytes(response.content)
-        print(path)
+    report = figmapy.download_images(
+        fills, out_dir, progress=lambda done, total: print(f"\r{done}/{total}", end="", flush=True)
+    )
+    print()
+    for image_ref, error in report.failed.items():
+        print(f"  failed: {image_ref}: {error}")
+    print(f"{len(report.paths)} images, {report.bytes} bytes")
 
 
 if __name__ == "__main__":
@@ -14,7 +14,10 @@ import figmapy
 
 async def main(urls):
     keys = [figmapy.file_key_from_url(u) for u in urls]
-    async with figmapy.AsyncFigma() as figma:
+    # Gather as many as you like: the policy decides how many are in flight at once,
+    # and backs off by itself when Figma starts answering 429.
+    policy = figmapy.AIMDConcurrency(initial=4, maximum=16)
+    async with figmapy.AsyncFigma(concurrency=policy) as figma:
         # depth=1 keeps the responses small: we only want the names here.
         files = await asyncio.gather(*(figma.get_file(k, depth=1) for k in keys))
     for key, file in zip(keys, files, strict=True):
@@ -0,0 +1,30 @@
+"""List every file in a team, with its folder and last edit, as CSV.
+
+    python examples/team_inventory.py 1535685101263221741 > inventory.csv
+
+The team id is in the URL of the team's page in the Figma file browser. Progress is
+saved to inventory-checkpoint.json: if the run dies, run it again and it carries on.
+Delete the checkpoint to start over.
+"""
+
+import asyncio
+import csv
+import sys
+
+import figmapy
+
+
+async def main(team_id):
+    writer = csv.writer(sys.stdout)
+    policy = figmapy.AIMDConcurrency(initial=4, maximum=16)
+    async with figmapy.AsyncFigma(concurrency=policy) as figma:
+        crawler = figmapy.TeamCrawler(figma, team_id, concurrency=16, checkpoint="inventory-checkpoint.json")
+        async for file in crawler:
+            touched = file.meta.last_touched_at.isoformat() if file.meta else ""
+            writer.writerow(["/".join(file.folder_path), file.name, file.key, touched])
+    for folder_id, error in crawler.errors.items():
+        print(f"skipped folder {folder_id}: {error}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1]))
@@ -15,18 +15,35 @@ have; ``figmapy.__version__`` follows date-based versioning (YEAR.RELEASE.PATCH)
 
 from . import helpers, models
 from ._endpoints import FIGMA_SPEC_VERSION
+from .analytics import (
+    ANALYTICS_ASSETS,
+    ANALYTICS_METRICS,
+    AnalyticsTable,
+    alibrary_analytics,
+    library_analytics,
+)
+from .assets import AssetStore
+from .cache import DirectoryStore, FileCache, HTTPCache, MemoryStore, SQLiteStore
 from .client import AsyncFigma, Figma
+from .concurrency import AIMDConcurrency
+from .crawl import CrawledFile, TeamCrawler
+from .diff import FileDiff, NodeChange, diff_files
+from .download import DownloadReport, adownload_images, download_images
 from .errors import (
     FigmaAuthError,
     FigmaError,
     FigmaHTTPError,
     FigmaNotFoundError,
+    FigmaPartialResultWarning,
     FigmaRateLimitError,
     FigmaServerError,
     FigmaSpecWarning,
     FigmaValidationError,
 )
+from .hashing import VOLATILE_FIELDS, NodeHashes, hash_nodes
 from .helpers import (
+    NodeIndex,
+    aiter_pages,
     file_key_from_url,
     find,
     find_all,
@@ -37,6 +54,18 @@ from .helpers import (
     pages,
     walk,
 )
+from .incremental import (
+    DEFAULT_OPERATIONS,
+    IncrementalSync,
+    SyncedFile,
+    SyncReport,
+    Watermark,
+    WatermarkStore,
+)
+from .query import Selector, select, select_many
+from .ratelimit import RateLimiter
+from .spatial import SpatialIndex
+from .variables import VariableBatch, VariableBatchReport
 
 try:
     from importlib.metadata import version as _pkg_version
@@ -63,14 +92,53 @@ __all__ = [
     "FigmaRateLimitError",
     "FigmaServerError",
     "FigmaSpecWarning",
+    "FigmaPartialResultWarning",
     "FigmaValidationError",
+    "RateLimiter",
+    "AIMDConcurrency",
+    "FileCache",
+    "MemoryStore",
+    "DirectoryStore",
+    "HTTPCache",
+    "SQLiteStore",
     "file_key_from_url",
     "node_id_from_url",
     "walk",
     "find",
     "find_all",
+    "NodeIndex",
     "pages",
     "page",
     "image_urls",
     "iter_pages",
+    "aiter_pages",
+    "Selector",
+    "select",
+    "select_many",
+    "SpatialIndex",
+    "diff_files",
+    "FileDiff",
+    "NodeChange",
+    "hash_nodes",
+    "NodeHashes",
+    "VOLATILE_FIELDS",
+    "download_images",
+    "adownload_images",
+    "DownloadReport",
+    "AssetStore",
+    "TeamCrawler",
+    "CrawledFile",
+    "IncrementalSync",
+    "WatermarkStore",
+    "Watermark",
+    "SyncedFile",
+    "SyncReport",
+    "DEFAULT_OPERATIONS",
+    "AnalyticsTable",
+    "library_analytics",
+    "alibrary_analytics",
+    "ANALYTICS_ASSETS",
+    "ANALYTICS_METRICS",
+    "VariableBatch",
+    "VariableBatchReport",
 ]
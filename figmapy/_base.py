@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import functools
+from typing import TYPE_CHECKING, Any
+
 from pydantic import BaseModel, ConfigDict
 
+from ._parsing import build_deferred
+
 
 class FigmaModel(BaseModel):
     """Base for all generated Figma models.
@@ -21,3 +26,20 @@ class FigmaModel(BaseModel):
         if name is not None:
             return f"{type(self).__name__}({name!r})"
         return f"{type(self).__name__}()"
+
+    # pydantic serialises a list straight from its storage, so nodes that parse="lazy"
+    # has not built yet would come out as the raw JSON. Build them first; on a model
+    # parsed any other way this finds nothing to do. The overrides take pydantic's own
+    # signature: type checkers never see them, and functools.wraps hands it to inspect,
+    # whatever parameters the installed pydantic has.
+    if not TYPE_CHECKING:
+
+        @functools.wraps(BaseModel.model_dump, assigned=("__doc__",))
+        def model_dump(self, *args: Any, **kwargs: Any) -> dict[str, Any]:
+            build_deferred(self)
+            return super().model_dump(*args, **kwargs)
+
+        @functools.wraps(BaseModel.model_dump_json, assigned=("__doc__",))
+        def model_dump_json(self, *args: Any, **kwargs: Any) -> str:
+            build_deferred(self)
+            return super().model_dump_json(*args, **kwargs)
@@ -0,0 +1,42 @@
+"""Response bytes to Python objects, selected by the client's ``decoder``.
+
+The default does the least work available: when the response becomes a model,
+pydantic parses the JSON and validates it in a single pass, never building the
+intermediate dict. Everything else -- ``parse=False``, the lazy and trusted modes,
+endpoints without a model -- is decoded with orjson when it is installed
+(``pip install 'figmapy[fast]'``), and the standard library otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional: the `fast` extra
+    orjson = None
+
+#: Named decoders. A callable taking bytes, such as ``msgspec.json.decode``, also works.
+DECODERS = ("auto", "pydantic", "orjson", "json")
+
+Loads = Callable[[bytes], Any]
+
+
+def loads_for(decoder: str | Loads) -> Loads:
+    """The function that turns a body into plain Python objects for `decoder`."""
+    if callable(decoder):
+        return decoder
+    if decoder not in DECODERS:
+        raise ValueError(f"decoder must be one of {DECODERS} or a callable, not {decoder!r}")
+    if decoder == "orjson" and orjson is None:
+        raise ImportError("decoder='orjson' needs orjson installed: pip install 'figmapy[fast]'")
+    if decoder in ("auto", "orjson") and orjson is not None:
+        return orjson.loads
+    return json.loads
+
+
+def validates_json(decoder: str | Loads) -> bool:
+    """Whether `decoder` hands bytes straight to ``model_validate_json``."""
+    return decoder in ("auto", "pydantic")
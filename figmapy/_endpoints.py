@@ -2461,3 +2461,64 @@ class AsyncEndpoints:
             json_body={'event_type': event_type, 'endpoint': endpoint, 'passcode': passcode, 'status': status, 'description': description},
             model=models.WebhookV2,
         )
+
+
+
+
+#: (HTTP method, path template) -> method name, for every operation.
+OPERATIONS = {
+    ('GET', '/v1/activity_logs'): 'get_activity_logs',
+    ('GET', '/v1/ai_usage/daily'): 'get_ai_usage_daily',
+    ('GET', '/v1/analytics/libraries/{file_key}/component/actions'): 'get_library_analytics_component_actions',
+    ('GET', '/v1/analytics/libraries/{file_key}/component/usages'): 'get_library_analytics_component_usages',
+    ('GET', '/v1/analytics/libraries/{file_key}/style/actions'): 'get_library_analytics_style_actions',
+    ('GET', '/v1/analytics/libraries/{file_key}/style/usages'): 'get_library_analytics_style_usages',
+    ('GET', '/v1/analytics/libraries/{file_key}/variable/actions'): 'get_library_analytics_variable_actions',
+    ('GET', '/v1/analytics/libraries/{file_key}/variable/usages'): 'get_library_analytics_variable_usages',
+    ('GET', '/v1/component_sets/{key}'): 'get_component_set',
+    ('GET', '/v1/components/{key}'): 'get_component',
+    ('POST', '/v1/dev_resources'): 'post_dev_resources',
+    ('PUT', '/v1/dev_resources'): 'put_dev_resources',
+    ('POST', '/v1/developer_logs'): 'get_developer_logs',
+    ('GET', '/v1/files/{file_key}'): 'get_file',
+    ('GET', '/v1/files/{file_key}/comments'): 'get_comments',
+    ('POST', '/v1/files/{file_key}/comments'): 'post_comment',
+    ('DELETE', '/v1/files/{file_key}/comments/{comment_id}'): 'delete_comment',
+    ('DELETE', '/v1/files/{file_key}/comments/{comment_id}/reactions'): 'delete_comment_reaction',
+    ('GET', '/v1/files/{file_key}/comments/{comment_id}/reactions'): 'get_comment_reactions',
+    ('POST', '/v1/files/{file_key}/comments/{comment_id}/reactions'): 'post_comment_reaction',
+    ('GET', '/v1/files/{file_key}/component_sets'): 'get_file_component_sets',
+    ('GET', '/v1/files/{file_key}/components'): 'get_file_components',
+    ('GET', '/v1/files/{file_key}/dev_resources'): 'get_dev_resources',
+    ('DELETE', '/v1/files/{file_key}/dev_resources/{dev_resource_id}'): 'delete_dev_resource',
+    ('GET', '/v1/files/{file_key}/images'): 'get_image_fills',
+    ('GET', '/v1/files/{file_key}/meta'): 'get_file_meta',
+    ('GET', '/v1/files/{file_key}/nodes'): 'get_file_nodes',
+    ('GET', '/v1/files/{file_key}/styles'): 'get_file_styles',
+    ('POST', '/v1/files/{file_key}/variables'): 'post_variables',
+    ('GET', '/v1/files/{file_key}/variables/local'): 'get_local_variables',
+    ('GET', '/v1/files/{file_key}/variables/published'): 'get_published_variables',
+    ('GET', '/v1/files/{file_key}/versions'): 'get_file_versions',
+    ('GET', '/v1/images/{file_key}'): 'get_images',
+    ('GET', '/v1/me'): 'get_me',
+    ('GET', '/v1/oembed'): 'get_o_embed',
+    ('GET', '/v1/payments'): 'get_payments',
+    ('GET', '/v1/projects/{project_id}/files'): 'get_project_files',
+    ('GET', '/v1/projects/{project_id}/meta'): 'get_project_meta',
+    ('GET', '/v1/styles/{key}'): 'get_style',
+    ('GET', '/v1/teams/{team_id}/component_sets'): 'get_team_component_sets',
+    ('GET', '/v1/teams/{team_id}/components'): 'get_team_components',
+    ('GET', '/v1/teams/{team_id}/projects'): 'get_team_projects',
+    ('GET', '/v1/teams/{team_id}/styles'): 'get_team_styles',
+    ('GET', '/v2/folders/{folder_id}/files'): 'get_folder_files',
+    ('GET', '/v2/folders/{folder_id}/folders'): 'get_folder_folders',
+    ('GET', '/v2/folders/{folder_id}/meta'): 'get_folder_meta',
+    ('GET', '/v2/teams/{team_id}/folders'): 'get_team_folders',
+    ('GET', '/v2/teams/{team_id}/webhooks'): 'get_team_webhooks',
+    ('GET', '/v2/webhooks'): 'get_webhooks',
+    ('POST', '/v2/webhooks'): 'post_webhook',
+    ('DELETE', '/v2/webhooks/{webhook_id}'): 'delete_webhook',
+    ('GET', '/v2/webhooks/{webhook_id}'): 'get_webhook',
+    ('PUT', '/v2/webhooks/{webhook_id}'): 'put_webhook',
+    ('GET', '/v2/webhooks/{webhook_id}/requests'): 'get_webhook_requests',
+}
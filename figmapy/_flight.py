@@ -0,0 +1,89 @@
+"""Single-flight: concurrent identical requests share one trip to Figma.
+
+The first caller for a key does the work; everyone who asks for the same key while it
+is running waits for that result instead of starting their own. Nothing is remembered
+once the call finishes -- this is deduplication of work in progress, not a cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.waiters = 0
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Thread-safe single-flight for the sync client."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def _waiting(self) -> int:
+        """Callers currently waiting on another caller's request.
+
+        Test support only: with coalescing, just one request reaches the transport, so
+        a test cannot see the other callers join the flight from there.
+        """
+        with self._lock:
+            return sum(call.waiters for call in self._calls.values())
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+        assert call is not None
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """Single-flight for the async client.
+
+    The shared work runs as its own task and every caller awaits it through
+    ``asyncio.shield``, so one caller being cancelled does not cancel it for the rest.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._finished(key, t))
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Future) -> None:
+        self._calls.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # mark retrieved; callers that are still waiting re-raise it
@@ -0,0 +1,469 @@
+"""Alternative ways of turning response JSON into models, selected by the client's ``parse``.
+
+``parse=True`` is plain ``model_validate``. The modes here exist for documents big enough
+that validating all of them up front is the slow part of a call.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import functools
+import gc
+import threading
+import types
+import typing
+import warnings
+from datetime import datetime
+from enum import Enum
+from typing import Annotated, Any, Literal
+
+from pydantic import AwareDatetime, BaseModel, NaiveDatetime, RootModel, TypeAdapter, ValidationError
+
+from .errors import FigmaSpecWarning, FigmaValidationError, user_stacklevel
+
+#: How many levels below the document stay unvalidated until read: pages, then the
+#: top-level frames on each page. Everything below a frame is validated with the frame.
+DOCUMENT_DEPTH = 2
+
+
+@functools.cache
+def _children_adapter(cls: type) -> TypeAdapter | None:
+    field = cls.model_fields.get("children")
+    if field is None:
+        return None
+    args = typing.get_args(field.annotation)
+    return TypeAdapter(args[0]) if args else None
+
+
+class _Invalid(Exception):
+    """A deferred node failed validation and the client is not strict: keep its raw dict."""
+
+
+def _lazy(adapter: TypeAdapter, raw: Any, depth: int, strict: bool) -> Any:
+    children = raw.get("children") if isinstance(raw, dict) else None
+    try:
+        if depth <= 0 or not isinstance(children, list):
+            return adapter.validate_python(raw)
+        node = adapter.validate_python({**raw, "children": []})
+    except ValidationError as exc:
+        # The same choice the client makes for a whole response: raise when strict,
+        # otherwise warn and hand back the raw dict.
+        detail = (
+            f"Node {raw.get('id')!r} ({raw.get('type')}) does not match the bundled spec. "
+            f"With parse='lazy' this surfaces when the node is first read."
+        )
+        if strict:
+            raise FigmaValidationError(f"{detail}\n{exc}") from exc
+        warnings.warn(
+            f"{detail} Returning the raw dict instead.\n{exc}", FigmaSpecWarning, stacklevel=user_stacklevel()
+        )
+        raise _Invalid from exc
+    _defer(node, children, depth - 1, strict)
+    return node
+
+
+def _defer(node: Any, children: list, depth: int, strict: bool) -> None:
+    adapter = _children_adapter(type(node))
+    if adapter is not None:
+        node.children = LazyList(children, adapter, depth, strict)
+
+
+class LazyList(list):
+    """A list of node JSON that turns each item into a model the first time it is read.
+
+    It is a real ``list``, so ``isinstance`` checks, indexing, slicing, iteration and
+    ``len`` behave as they do on an eagerly parsed model. ``len()`` validates the shell
+    of every item; each one's own children stay deferred. pydantic serialises lists
+    from their storage, bypassing all of this, so ``model_dump`` calls
+    :func:`build_deferred` first.
+    """
+
+    __slots__ = ("_adapter", "_depth", "_strict", "_invalid")
+
+    def __init__(self, raw: list, adapter: TypeAdapter, depth: int, strict: bool = True):
+        super().__init__(raw)
+        self._adapter = adapter
+        self._depth = depth
+        self._strict = strict
+        self._invalid: set[int] = set()  # items that failed validation and stay raw dicts
+
+    def _item(self, index: int) -> Any:
+        item = list.__getitem__(self, index)
+        if isinstance(item, dict):
+            if index < 0:
+                index += list.__len__(self)
+            if index in self._invalid:
+                return item
+            try:
+                item = _lazy(self._adapter, item, self._depth, self._strict)
+            except _Invalid:
+                self._invalid.add(index)
+                return item
+            list.__setitem__(self, index, item)
+        return item
+
+    def _materialize(self) -> None:
+        for index in range(list.__len__(self)):
+            self._item(index)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self._item(i) for i in range(*index.indices(list.__len__(self)))]
+        return self._item(index)
+
+    def __iter__(self) -> typing.Iterator[Any]:
+        for index in range(list.__len__(self)):
+            yield self._item(index)
+
+    def __reversed__(self) -> typing.Iterator[Any]:
+        for index in reversed(range(list.__len__(self))):
+            yield self._item(index)
+
+    def __len__(self) -> int:
+        self._materialize()
+        return list.__len__(self)
+
+    def __contains__(self, value: object) -> bool:
+        return any(item == value for item in self)
+
+    def __eq__(self, other: object) -> bool:
+        self._materialize()
+        return list.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        self._materialize()
+        return list.__repr__(self)
+
+    def index(self, value: Any, *args: Any) -> int:
+        self._materialize()
+        return list.index(self, value, *args)
+
+    def count(self, value: Any) -> int:
+        self._materialize()
+        return list.count(self, value)
+
+    def copy(self) -> list:
+        return list(self)
+
+    def __reduce__(self) -> Any:
+        return (list, (list(self),))
+
+
+def build_deferred(model: Any) -> None:
+    """Build every node still deferred under `model`, part of a ``parse="lazy"`` result.
+
+    Deferred nodes only sit in the ``children`` of nodes near the top of a document, so
+    the search stops at the first level that is fully built. On a model from any other
+    parse mode it checks a few fields and returns.
+    """
+    fields = model.__dict__
+    stack = [fields.get("children"), fields.get("document")]
+    nodes = fields.get("nodes")
+    if isinstance(nodes, dict):
+        stack += [getattr(entry, "document", None) for entry in nodes.values()]
+    while stack:
+        value = stack.pop()
+        if type(value) is LazyList:
+            stack.extend(iter(value))  # iterating builds each item
+        elif isinstance(value, BaseModel):
+            children = value.__dict__.get("children")
+            if type(children) is LazyList:
+                stack.append(children)
+
+
+def validate_lazy(model: type, data: dict, strict: bool = True) -> Any:
+    """Validate a response, deferring the document tree beneath it until it is read.
+
+    Covers the responses that carry documents: ``get_file`` (``document``) and
+    ``get_file_nodes`` (``nodes[id].document``). Anything else is validated as usual.
+    A deferred node that does not validate raises :class:`FigmaValidationError` when
+    read with `strict`; otherwise it warns and is read as its raw dict.
+    """
+    fields = model.model_fields
+    if "document" in fields and isinstance(data.get("document"), dict):
+        document = data["document"]
+        children = document.get("children")
+        if not isinstance(children, list):
+            return model.model_validate(data)
+        result = model.model_validate({**data, "document": {**document, "children": []}})
+        _defer(result.document, children, DOCUMENT_DEPTH - 1, strict)
+        return result
+
+    if "nodes" in fields and isinstance(data.get("nodes"), dict):
+        deferred = {}
+        shells = {}
+        for node_id, entry in data["nodes"].items():
+            document = entry.get("document") if isinstance(entry, dict) else None
+            children = document.get("children") if isinstance(document, dict) else None
+            if isinstance(children, list):
+                deferred[node_id] = children
+                entry = {**entry, "document": {**document, "children": []}}
+            shells[node_id] = entry
+        result = model.model_validate({**data, "nodes": shells})
+        for node_id, children in deferred.items():
+            _defer(result.nodes[node_id].document, children, DOCUMENT_DEPTH - 1, strict)
+        return result
+
+    return model.model_validate(data)
+
+
+# -- parse="trusted" ----------------------------------------------------------
+#
+# Builds models the way model_construct does -- no validation -- but all the way down,
+# which model_construct does not: nested models, lists and dicts of them, enums and
+# timestamps come out as the same types model_validate would produce. Node unions are
+# resolved by their `type` literal. Each annotation is compiled to a builder once and
+# reused, so the per-node cost is a few dict and set operations plus the conversions of
+# the fields that need one.
+
+_Builder = typing.Callable[[Any], Any]
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _datetime(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return value
+    return value
+
+
+def _float(value: Any) -> Any:
+    return float(value) if type(value) is int else value
+
+
+def _enum(cls: type[Enum]) -> _Builder:
+    members = cls._value2member_map_
+
+    def build(value: Any) -> Any:
+        try:
+            return members.get(value, value)  # unknown values: ones Figma added after this spec
+        except TypeError:
+            return value
+
+    return build
+
+
+def _literal_tag(model: type[BaseModel]) -> Any:
+    field = model.model_fields.get("type")
+    if field is None:
+        return None
+    annotation = field.annotation
+    if typing.get_origin(annotation) is Literal:
+        return typing.get_args(annotation)
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return tuple(member.value for member in annotation)
+    return None
+
+
+def _flatten(members: tuple) -> typing.Iterator[Any]:
+    for member in members:
+        if typing.get_origin(member) is Annotated:
+            member = typing.get_args(member)[0]
+        if typing.get_origin(member) in (typing.Union, types.UnionType):
+            yield from _flatten(typing.get_args(member))
+        else:
+            yield member
+
+
+def _union(members: tuple) -> _Builder:
+    flat = list(dict.fromkeys(_flatten(members)))
+    models = [m for m in flat if isinstance(m, type) and issubclass(m, BaseModel)]
+    others = [m for m in flat if m not in models and m is not type(None)]
+    by_tag: dict[Any, _Builder] = {}
+    untagged = []
+    for model in models:
+        tags = _literal_tag(model)
+        if not tags:
+            untagged.append(model)
+        for tag in tags or ():
+            by_tag.setdefault(tag, _builder(model))
+    if len(untagged) == 1:
+        # One model without a `type` literal: Optional[Model], or the UnknownNode that
+        # catches node types the spec does not know.
+        fallback: _Builder = _builder(untagged[0])
+    elif untagged:
+        # Not told apart by `type`: let pydantic pick, as it would have anyway.
+        fallback = TypeAdapter(typing.Union[tuple(untagged)]).validate_python  # noqa: UP007
+    else:
+        fallback = _identity
+    scalar = _builder(others[0]) if len(others) == 1 else _identity
+    if not models:
+        return scalar  # Optional[str] and friends
+    if not by_tag and scalar is _identity and len(untagged) == 1:
+        return fallback  # Optional[Model]: model builders pass None and scalars through
+
+    def build(value: Any) -> Any:
+        if isinstance(value, dict):
+            built = by_tag.get(value.get("type"))
+            return built(value) if built is not None else fallback(value)
+        if value is None:
+            return None
+        return scalar(value)
+
+    return build
+
+
+def _model(cls: type[BaseModel]) -> _Builder:
+    plan: tuple | None = None
+
+    def compile_plan() -> tuple:
+        names = set()
+        aliases = {}
+        convert = {}
+        defaults = {}
+        factories = []
+        for name, field in cls.model_fields.items():
+            names.add(name)
+            if field.alias and field.alias != name:
+                aliases[field.alias] = name
+            builder = _builder(field.annotation)
+            if builder is not _identity:
+                convert[name] = builder
+            if field.default_factory is not None:
+                factories.append((name, field.default_factory))
+            elif isinstance(field.default, (list, dict, set)):
+                factories.append((name, functools.partial(copy.deepcopy, field.default)))
+            elif not field.is_required():
+                defaults[name] = field.default
+        keep_extra = cls.model_config.get("extra") == "allow"
+        return frozenset(names), aliases, convert, defaults, tuple(factories), keep_extra
+
+    def build(value: Any) -> Any:
+        nonlocal plan
+        if not isinstance(value, dict):
+            return value
+        if plan is None:
+            plan = compile_plan()
+        names, aliases, convert, defaults, factories, keep_extra = plan
+        if aliases:
+            value = {aliases.get(key, key): raw for key, raw in value.items()}
+        # The bulk of the work is done with dict and set operations rather than a Python
+        # loop per key: node models declare dozens of fields and most arrive as-is.
+        fields = defaults.copy()
+        for name, factory in factories:
+            fields[name] = factory()
+        fields.update(value)
+        keys = value.keys()
+        fields_set = names & keys
+        if len(fields_set) == len(value):
+            extra = {}
+        else:
+            extra = {key: fields.pop(key) for key in keys - names}
+        for name in fields_set & convert.keys():
+            fields[name] = convert[name](fields[name])
+        obj = cls.__new__(cls)
+        object.__setattr__(obj, "__dict__", fields)
+        object.__setattr__(obj, "__pydantic_fields_set__", set(fields_set))
+        object.__setattr__(obj, "__pydantic_extra__", extra if keep_extra else None)
+        object.__setattr__(obj, "__pydantic_private__", None)
+        return obj
+
+    return build
+
+
+_BUILDERS: dict[Any, _Builder] = {}
+
+
+def _builder(annotation: Any) -> _Builder:
+    try:
+        return _BUILDERS[annotation]
+    except (KeyError, TypeError):
+        pass
+    built = _compile(annotation)
+    try:
+        _BUILDERS[annotation] = built
+    except TypeError:
+        pass  # unhashable annotation; rare, and cheap to compile again
+    return built
+
+
+def _compile(annotation: Any) -> _Builder:
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is Annotated:
+        return _builder(args[0])
+    if origin is typing.Union or origin is types.UnionType:
+        return _union(args)
+    if origin is list:
+        item = _builder(args[0]) if args else _identity
+        if item is _identity:
+            return _identity
+        return lambda value: [item(v) for v in value] if isinstance(value, list) else value
+    if origin is dict:
+        item = _builder(args[1]) if len(args) == 2 else _identity
+        if item is _identity:
+            return _identity
+        return lambda value: {k: item(v) for k, v in value.items()} if isinstance(value, dict) else value
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            if issubclass(annotation, RootModel):  # rare in the spec; not worth a builder
+                return TypeAdapter(annotation).validate_python
+            return _model(annotation)
+        if issubclass(annotation, Enum):
+            return _enum(annotation)
+        if issubclass(annotation, datetime) or annotation in (AwareDatetime, NaiveDatetime):
+            return _datetime
+        if annotation is float:
+            return _float
+    return _identity
+
+
+#: Allocations between young-generation collections while a tree is built.
+_GC_BUILD_THRESHOLD = 50_000
+
+_gc_lock = threading.Lock()
+_gc_users = 0
+_gc_saved: tuple[int, ...] = ()
+_gc_raised: tuple[int, ...] = ()
+
+
+@contextlib.contextmanager
+def _gc_paused() -> typing.Iterator[None]:
+    """Make the cyclic collector run less often while a tree is built.
+
+    Allocating tens of thousands of models triggers collection after collection, each
+    one traversing everything built so far -- on a large file that is more time than the
+    construction itself. None of it is garbage yet, so the collections find nothing.
+
+    The collector is not switched off: its young-generation threshold is raised to
+    ``_GC_BUILD_THRESHOLD``, which is about as fast, and cycles made meanwhile, in any
+    thread, are still collected. The thresholds are process-wide, so the change is
+    counted: the old thresholds come back when the last overlapping build is done,
+    unless something else has set new ones in the meantime.
+    """
+    global _gc_users, _gc_saved, _gc_raised
+    with _gc_lock:
+        if _gc_users == 0:
+            _gc_saved = gc.get_threshold()
+            _gc_raised = (max(_gc_saved[0], _GC_BUILD_THRESHOLD), *_gc_saved[1:])
+            gc.set_threshold(*_gc_raised)
+        _gc_users += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_users -= 1
+            if _gc_users == 0 and gc.get_threshold() == _gc_raised:
+                gc.set_threshold(*_gc_saved)
+
+
+def construct_trusted(model: type, data: Any) -> Any:
+    """Build `model` from `data` without validating it.
+
+    For JSON that has been validated before -- read back from a cache, say. Fields are
+    converted to the types ``model_validate`` would give them, but nothing is checked:
+    malformed input produces malformed models instead of an error.
+    """
+    with _gc_paused():
+        return _builder(model)(data)
@@ -0,0 +1,175 @@
+"""Pulling pages out of a ``get_file`` body while it is still downloading.
+
+A scanner over the raw bytes, not a full JSON parser: it follows just enough structure
+-- object keys, brackets, strings -- to know when ``document.children[i]`` (a page) or
+``document.children[i].children[j]`` (a top-level node on a page) has been received in
+full. That slice is handed back as bytes for the regular decoder to turn into a model,
+and everything before it is dropped from the buffer, so memory holds about one page at
+a time instead of the whole file.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import re
+import typing
+from typing import Any
+
+from . import models
+from ._parsing import _flatten, _literal_tag
+from .errors import FigmaError
+
+# Outside a captured value: every structural token, since keys have to be tracked.
+# A lone `"` means a string that has not finished arriving.
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|"|[{}\[\]:,]', re.S)
+# Inside one, only nesting matters: skip everything up to the next bracket in one go,
+# stepping over whole strings so brackets inside them do not count. Stops at a `"`
+# when the string it opens has not finished arriving.
+_NESTING = re.compile(rb'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*([{}\[\]"])', re.S)
+
+_QUOTE, _OPEN_OBJECT, _OPEN_ARRAY, _CLOSE_OBJECT, _CLOSE_ARRAY, _COLON, _COMMA = b'"{[}]:,'
+
+_DOCUMENT = ("document",)
+_PAGE = ("document", "children", "*")
+_TOP_LEVEL_NODE = ("document", "children", "*", "children", "*")
+
+
+class _Container:
+    __slots__ = ("is_object", "path", "key", "expect_key")
+
+    def __init__(self, is_object: bool, path: tuple):
+        self.is_object = is_object
+        self.path = path
+        self.key: str | None = None
+        self.expect_key = is_object
+
+
+class PageScanner:
+    """Feed it ``get_file`` bytes in chunks; it returns each page's JSON once complete.
+
+    With ``frames=True`` it returns each top-level node of each page instead, paired
+    with the id of the page it is on.
+    """
+
+    def __init__(self, *, frames: bool = False):
+        self.frames = frames
+        self._target = _TOP_LEVEL_NODE if frames else _PAGE
+        self._buf = bytearray()
+        self._pos = 0
+        self._stack: list[_Container] = []
+        self._capture_start: int | None = None
+        self._depth = 0
+        self._page_id: str | None = None
+        self._seen_document = False
+        self._done = False
+
+    def feed(self, chunk: bytes) -> list[tuple[str | None, bytes]]:
+        """Scan another chunk. Returns ``(page id, raw JSON)`` for every value completed."""
+        self._buf += chunk
+        out: list[tuple[str | None, bytes]] = []
+        buf = self._buf
+        pos = self._pos
+        while True:
+            if self._capture_start is not None:
+                match = _NESTING.match(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                char = buf[match.end() - 1]
+                if char == _QUOTE:
+                    pos = match.end() - 1
+                    break
+                pos = match.end()
+                if char == _OPEN_OBJECT or char == _OPEN_ARRAY:
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        out.append((self._page_id, bytes(buf[self._capture_start:pos])))
+                        self._capture_start = None
+                continue
+
+            match = _TOKEN.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            start, end = match.span()
+            char = buf[start]
+            if char == _QUOTE and end - start == 1:
+                pos = start  # string cut off by the chunk boundary; wait for the rest
+                break
+            pos = end
+            self._token(char, buf, start, end)
+            if self._capture_start == -1:
+                self._capture_start = start
+                self._depth = 1
+
+        # Keep only what is still needed: the value being captured, or nothing.
+        keep = self._capture_start if self._capture_start is not None else pos
+        if keep:
+            del buf[:keep]
+            pos -= keep
+            if self._capture_start is not None:
+                self._capture_start = 0
+        self._pos = pos
+        return out
+
+    def _token(self, char: int, buf: bytearray, start: int, end: int) -> None:
+        top = self._stack[-1] if self._stack else None
+        if char == _OPEN_OBJECT or char == _OPEN_ARRAY:
+            if top is None:
+                path: tuple = ()
+            elif top.is_object:
+                path = (*top.path, top.key)
+            else:
+                path = (*top.path, "*")
+            if path == self._target:
+                self._capture_start = -1  # feed() fills in the position
+                return
+            if path == _DOCUMENT:
+                self._seen_document = True
+            elif path == _PAGE:
+                self._page_id = None
+            self._stack.append(_Container(char == _OPEN_OBJECT, path))
+        elif char == _CLOSE_OBJECT or char == _CLOSE_ARRAY:
+            self._stack.pop()
+            if not self._stack:
+                self._done = True
+        elif char == _COMMA:
+            if top is not None and top.is_object:
+                top.expect_key = True
+        elif char == _QUOTE and top is not None and top.is_object:
+            if top.expect_key:
+                top.key = _string(buf[start:end])
+                top.expect_key = False
+            elif top.path == _PAGE and top.key == "id":
+                self._page_id = _string(buf[start:end])
+
+    def close(self) -> None:
+        """Call at the end of the body: raises if it stopped partway through the document."""
+        if not self._seen_document:
+            raise FigmaError("The response has no document to stream.")
+        if not self._done or self._capture_start is not None:
+            raise FigmaError("The response ended before the document was complete.")
+
+
+def _string(raw: bytes | bytearray) -> str:
+    if b"\\" in raw:
+        return json.loads(bytes(raw))
+    return raw[1:-1].decode()
+
+
+@functools.cache
+def _node_models() -> dict[str, type]:
+    children = models.CanvasNode.model_fields["children"].annotation
+    found = {}
+    for member in _flatten(typing.get_args(children)):
+        for tag in _literal_tag(member) or ():
+            found.setdefault(tag, member)
+    return found
+
+
+def node_model(node_type: Any) -> type:
+    """The model for a node of `node_type`; :class:`~figmapy.models.UnknownNode` if none."""
+    return _node_models().get(node_type, models.UnknownNode)
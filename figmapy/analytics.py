@@ -0,0 +1,305 @@
+"""Library analytics as columns, for pulls too large to hold as one model per row.
+
+The six library analytics endpoints return pages of flat rows: a week, a few names and
+keys, and some counts. Parsed into models, every row is a pydantic object holding a
+dict of Python objects, and a million rows take gigabytes. :func:`library_analytics`
+reads the pages as plain JSON and appends each field to a column instead. Counts go
+into an ``array("d")`` of 8-byte doubles. Text goes into a list in which repeated
+values (weeks, team names, component names) share a single string object::
+
+    >>> table = library_analytics(figma, library_keys, "component", "actions",
+    ...                           group_by="team", start_date="2026-01-01")
+    >>> len(table), table.column_names
+    (1204331, ['file_key', 'week', 'team_name', 'workspace_name', 'detachments', 'insertions'])
+    >>> table.to_pandas().groupby("team_name").insertions.sum()
+
+``to_arrow`` and ``to_pandas`` need pyarrow or pandas installed. figmapy itself does
+not depend on either.
+
+On :class:`~figmapy.AsyncFigma`, :func:`alibrary_analytics` splits the work into one
+shard per file and, with `window_weeks`, per window of weeks. The shards are fetched
+`concurrency` at a time and their rows are merged in the same order a sequential pull
+would give.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import math
+from array import array
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+from . import models
+from .helpers import _field, aiter_pages, iter_pages
+
+__all__ = ["ANALYTICS_ASSETS", "ANALYTICS_METRICS", "AnalyticsTable", "alibrary_analytics", "library_analytics"]
+
+ANALYTICS_ASSETS = ("component", "style", "variable")
+ANALYTICS_METRICS = ("actions", "usages")
+
+
+class AnalyticsTable:
+    """Rows held as one column per field, in `schema` order.
+
+    `schema` maps each column name to ``"number"`` or ``"text"``. A number column is an
+    ``array("d")`` holding NaN where a row had no value. A text column is a list holding
+    None where a row had no value. Fields that have no column are dropped.
+    """
+
+    def __init__(self, schema: Mapping[str, str] | Iterable[tuple[str, str]]):
+        self.schema = dict(schema)
+        for name, kind in self.schema.items():
+            if kind not in ("number", "text"):
+                raise ValueError(f"column {name!r} must be 'number' or 'text', not {kind!r}")
+        self.columns: dict[str, Any] = {
+            name: array("d") if kind == "number" else [] for name, kind in self.schema.items()
+        }
+        # One string object per distinct value in each text column.
+        self._strings: dict[str, dict] = {name: {} for name, kind in self.schema.items() if kind == "text"}
+
+    @classmethod
+    def for_endpoint(cls, asset: str, metric: str, group_by: str) -> AnalyticsTable:
+        """An empty table with a ``file_key`` column and the fields of one endpoint's rows."""
+        model = _row_model(asset, metric, group_by)
+        schema = [("file_key", "text")]
+        schema += [(name, "number" if f.annotation is float else "text") for name, f in model.model_fields.items()]
+        return cls(schema)
+
+    @property
+    def column_names(self) -> list[str]:
+        return list(self.columns)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), ()))
+
+    def __repr__(self) -> str:
+        return f"<AnalyticsTable {len(self)} rows: {', '.join(self.columns)}>"
+
+    def extend(self, rows: Iterable[Mapping[str, Any]], **constants: Any) -> None:
+        """Append `rows`, which are plain dicts. `constants` sets a column to the same value in every row.
+
+        Raises BufferError while an Arrow table made by :meth:`to_arrow` is alive. That
+        table shares the number columns' memory, so they can not grow under it.
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        for name, column in self.columns.items():
+            if name in constants:
+                values: Iterable[Any] = [constants[name]] * len(rows)
+            else:
+                values = (row.get(name) for row in rows)
+            if self.schema[name] == "number":
+                column.extend(math.nan if value is None else value for value in values)
+            else:
+                seen = self._strings[name]
+                column.extend(seen.setdefault(value, value) for value in values)
+
+    def append(self, other: AnalyticsTable) -> None:
+        """Append the rows of `other`, a table with the same columns."""
+        if other.schema != self.schema:
+            raise ValueError("can only append a table with the same columns")
+        for name, column in self.columns.items():
+            if self.schema[name] == "number":
+                column.extend(other.columns[name])
+            else:
+                seen = self._strings[name]
+                column.extend(seen.setdefault(value, value) for value in other.columns[name])
+
+    def to_pydict(self) -> dict[str, list]:
+        """Each column as a list, NaN included."""
+        return {name: list(column) for name, column in self.columns.items()}
+
+    def to_arrow(self) -> Any:
+        """A ``pyarrow.Table``. The number columns share memory with this table instead of being copied."""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("AnalyticsTable.to_arrow needs pyarrow installed: pip install 'figmapy[arrow]'") from None
+        arrays = []
+        for name, column in self.columns.items():
+            if self.schema[name] == "number":
+                arrays.append(pa.Array.from_buffers(pa.float64(), len(column), [None, pa.py_buffer(column)]))
+            else:
+                arrays.append(pa.array(column, type=pa.string()))
+        return pa.table(arrays, names=self.column_names)
+
+    def to_pandas(self) -> Any:
+        """A ``pandas.DataFrame``: float64 columns for numbers, object columns for text."""
+        try:
+            import numpy as np
+            import pandas as pd
+        except ImportError:
+            raise ImportError("AnalyticsTable.to_pandas needs pandas installed: pip install 'figmapy[pandas]'") from None
+        return pd.DataFrame({
+            name: np.array(column, dtype=np.float64) if self.schema[name] == "number" else column
+            for name, column in self.columns.items()
+        })
+
+
+def library_analytics(
+    figma: Any,
+    file_keys: str | Iterable[str],
+    asset: str,
+    metric: str,
+    *,
+    group_by: str,
+    start_date: str | datetime.date | None = None,
+    end_date: str | datetime.date | None = None,
+) -> AnalyticsTable:
+    """Every page of one library analytics endpoint, for one or more library files, as one table.
+
+    asset:    ``"component"``, ``"style"`` or ``"variable"``.
+    metric:   ``"actions"`` (weekly insertions and detachments) or ``"usages"``.
+    group_by: `asset` itself, or ``"team"`` for actions and ``"file"`` for usages.
+    start_date, end_date: limit actions to these weeks.
+
+    Rows keep the order of the pages, and the files are read in the order given. The
+    ``file_key`` column says which library a row is about.
+    """
+    table, path, params = _prepare(asset, metric, group_by, start_date, end_date)
+    for key in [file_keys] if isinstance(file_keys, str) else file_keys:
+        for page in iter_pages(_fetcher(figma, path.format(file_key=key)), **params):
+            table.extend(_field(page, "rows") or (), file_key=key)
+    return table
+
+
+async def alibrary_analytics(
+    figma: Any,
+    file_keys: str | Iterable[str],
+    asset: str,
+    metric: str,
+    *,
+    group_by: str,
+    start_date: str | datetime.date | None = None,
+    end_date: str | datetime.date | None = None,
+    window_weeks: int | None = None,
+    concurrency: int = 4,
+    lookahead: int = 1,
+) -> AnalyticsTable:
+    """:func:`library_analytics` on :class:`~figmapy.AsyncFigma`, fetched as shards in parallel.
+
+    Each file is a shard. With `window_weeks`, which only applies to actions, each
+    file's `start_date` to `end_date` (today if not given) is also split into windows
+    of that many weeks, and each window is a shard. `concurrency` shards are fetched at
+    once, and each one follows its own cursor. Within a shard, the next pages are
+    requested while the current one is added, up to `lookahead` ahead (see
+    :func:`~figmapy.aiter_pages`). The client's ``rate_limiter`` and ``concurrency``
+    pace the requests as they do for any other call.
+
+    The table holds the rows in file order, then window order, then page order, which
+    is the order :func:`library_analytics` would give. A shard's rows are added as soon
+    as every shard before it is done. Figma rounds a window out to whole weeks, so a
+    week on the edge between two windows comes back from both. It is kept only from
+    the window its ``week`` falls in. If a shard fails, the others are cancelled and
+    the error is raised.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+    table, path, params = _prepare(asset, metric, group_by, start_date, end_date)
+    if window_weeks is None:
+        windows = [(params.get("start_date"), params.get("end_date"), None, None)]
+    elif metric != "actions":
+        raise ValueError("window_weeks only applies to actions")
+    else:
+        windows = _windows(start_date, end_date, window_weeks)
+    keys = [file_keys] if isinstance(file_keys, str) else list(file_keys)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def shard(key: str, start: Any, end: Any, after: str | None, before: str | None) -> AnalyticsTable:
+        part = AnalyticsTable(table.schema)
+        async with slots:
+            fetch = _fetcher(figma, path.format(file_key=key))
+            async for page in aiter_pages(fetch, lookahead=lookahead, **{**params, "start_date": start, "end_date": end}):
+                rows = _field(page, "rows") or ()
+                if after is not None or before is not None:
+                    rows = [row for row in rows if _in_window(row.get("week"), after, before)]
+                part.extend(rows, file_key=key)
+        return part
+
+    shards = [asyncio.ensure_future(shard(key, *window)) for key in keys for window in windows]
+    try:
+        for task in shards:
+            table.append(await task)
+    finally:
+        for task in shards:
+            task.cancel()
+        await asyncio.gather(*shards, return_exceptions=True)
+    return table
+
+
+def _row_model(asset: str, metric: str, group_by: str) -> type:
+    if asset not in ANALYTICS_ASSETS:
+        raise ValueError(f"asset must be one of {ANALYTICS_ASSETS}, not {asset!r}")
+    if metric not in ANALYTICS_METRICS:
+        raise ValueError(f"metric must be one of {ANALYTICS_METRICS}, not {metric!r}")
+    other = "team" if metric == "actions" else "file"
+    if group_by not in (asset, other):
+        raise ValueError(f"group_by for {asset} {metric} must be {asset!r} or {other!r}, not {group_by!r}")
+    by = "Asset" if group_by == asset else other.capitalize()
+    return getattr(models, f"LibraryAnalytics{asset.capitalize()}{metric.capitalize()}By{by}")
+
+
+def _prepare(
+    asset: str, metric: str, group_by: str, start_date: Any, end_date: Any
+) -> tuple[AnalyticsTable, str, dict[str, Any]]:
+    """The empty table, the path template and the query parameters for one endpoint."""
+    table = AnalyticsTable.for_endpoint(asset, metric, group_by)
+    params: dict[str, Any] = {"group_by": group_by}
+    if metric == "actions":
+        params.update(start_date=_isodate(start_date), end_date=_isodate(end_date))
+    elif start_date is not None or end_date is not None:
+        raise ValueError("start_date and end_date only apply to actions")
+    return table, f"/v1/analytics/libraries/{{file_key}}/{asset}/{metric}", params
+
+
+def _fetcher(figma: Any, path: str) -> Callable[..., Any]:
+    """A page-at-a-time endpoint for `iter_pages` that returns plain dicts, never models."""
+
+    def fetch(*, cursor: str | None = None, **params: Any) -> Any:
+        return figma.request("GET", path, params={**params, "cursor": cursor})
+
+    return fetch
+
+
+def _isodate(value: str | datetime.date | None) -> str | None:
+    return value.isoformat() if isinstance(value, datetime.date) else value
+
+
+def _windows(
+    start_date: str | datetime.date | None, end_date: str | datetime.date | None, weeks: int
+) -> list[tuple[str, str, str | None, str | None]]:
+    """(start, end) of each window, and the range of ``week`` values the window owns.
+
+    Windows are whole multiples of 7 days, so however Figma rounds them to its weeks,
+    two windows overlap by at most the one week on their edge. That week is owned by
+    the later window when it starts on or after the later window's start, and by the
+    earlier window otherwise. The first and last windows own everything before or after them.
+    """
+    if weeks < 1:
+        raise ValueError("window_weeks must be >= 1")
+    if start_date is None:
+        raise ValueError("window_weeks needs a start_date")
+    start = datetime.date.fromisoformat(str(_isodate(start_date)))
+    end = datetime.date.today() if end_date is None else datetime.date.fromisoformat(str(_isodate(end_date)))
+    if end < start:
+        raise ValueError(f"end_date {end} is before start_date {start}")
+    step = datetime.timedelta(weeks=weeks)
+    starts = []
+    while start <= end:
+        starts.append(start)
+        start += step
+    windows = []
+    for i, first in enumerate(starts):
+        last = min(first + step - datetime.timedelta(days=1), end)
+        after = first.isoformat() if i > 0 else None
+        before = starts[i + 1].isoformat() if i + 1 < len(starts) else None
+        windows.append((first.isoformat(), last.isoformat(), after, before))
+    return windows
+
+
+def _in_window(week: str | None, after: str | None, before: str | None) -> bool:
+    """Whether a row's ``week`` is owned by the window [after, before); ISO dates compare as text."""
+    if week is None:
+        return True
+    return (after is None or week >= after) and (before is None or week < before)
@@ -0,0 +1,256 @@
+"""A local store of downloaded images, so the same bitmap is only downloaded once.
+
+The URLs ``get_image_fills`` returns are signed and change on every call, but the
+``imageRef`` they belong to names the image's content: the same ref is the same bitmap,
+in any file and on any day. An :class:`AssetStore` keeps files by such keys, and
+:meth:`~AssetStore.download` skips every key it already holds::
+
+    >>> store = AssetStore("~/.cache/figma-assets", max_bytes=2 * 2**30)
+    >>> report = store.download(figma.get_image_fills(key))
+    >>> report.cached                     # image refs that were already on disk
+    >>> report.paths["7e3a..."]
+    PosixPath('/home/me/.cache/figma-assets/5b/5b0e....png')
+
+Renders are only stable for one version of a file and one set of render parameters,
+so they are keyed by all of them (:meth:`~AssetStore.render_key`). Knowing the keys
+before asking Figma lets you skip the render request too::
+
+    >>> keys = {i: store.render_key(key, i, file.version, format="svg") for i in ids}
+    >>> needed = [i for i in ids if keys[i] not in store]
+    >>> if needed:
+    ...     store.download(figma.get_images(key, ids=needed, format="svg"), keys=keys)
+
+An SQLite index next to the files answers "is it there?" without touching the files
+themselves, and tracks sizes and last use for eviction.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+from .download import DownloadReport, _url_map, adownload_images, download_images
+
+__all__ = ["AssetStore"]
+
+
+class AssetStore:
+    """Files by key in a directory, with an index, bounded by total size.
+
+    directory: where the files and the ``index.db`` live. Created if missing.
+    max_bytes: once the files add up to more than this, the least recently used are
+               deleted -- but not the ones the current download returns. None keeps
+               everything.
+
+    Files keep the suffix they were downloaded with, so a path from :meth:`path` can be
+    handed to anything that opens images. Safe to share between threads; the index is
+    SQLite, so processes on one machine can share a directory too.
+    """
+
+    def __init__(self, directory: str | os.PathLike, *, max_bytes: int | None = None):
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.directory / "index.db"), check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS assets "
+            "(key TEXT PRIMARY KEY, path TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+
+    @staticmethod
+    def render_key(file_key: str, node_id: str, version: str, **params: Any) -> str:
+        """The key for a render of `node_id` in one version of a file, with ``get_images`` `params`."""
+        query = "&".join(f"{k}={v}" for k, v in sorted(params.items()) if v is not None)
+        return f"render/{file_key}/{node_id}@{version}?{query}"
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM assets WHERE key = ?", (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+
+    @property
+    def size(self) -> int:
+        """Total bytes of the files held."""
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM assets").fetchone()[0]
+
+    def missing(self, keys: Iterable[str]) -> list[str]:
+        """The `keys` not in the store, in order, with one index query per 500 keys."""
+        keys = list(dict.fromkeys(keys))
+        present: set[str] = set()
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT key FROM assets WHERE key IN ({','.join('?' * len(batch))})", batch
+                )
+                present.update(key for (key,) in rows)
+        return [key for key in keys if key not in present]
+
+    def path(self, key: str) -> Path | None:
+        """Where the file for `key` is, or None. Counts as a use for eviction."""
+        with self._lock:
+            row = self._db.execute("SELECT path FROM assets WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE assets SET accessed = ? WHERE key = ?", (time.time(), key))
+        return self.directory / row[0]
+
+    def add(self, key: str, source: str | os.PathLike) -> Path:
+        """Move the file at `source` into the store under `key`, keeping its suffix."""
+        target = self._move(key, Path(source))
+        self.evict()
+        return target
+
+    def put(self, key: str, data: bytes, suffix: str = "") -> Path:
+        """Store `data` under `key` as a file ending in `suffix`, e.g. ``".png"``."""
+        relative = self._relative(key, suffix)
+        target = self.directory / relative
+        target.parent.mkdir(exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, target)  # readers never see a half-written file
+        self._index(key, relative, len(data))
+        self.evict()
+        return target
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            row = self._db.execute("SELECT path FROM assets WHERE key = ?", (key,)).fetchone()
+            self._db.execute("DELETE FROM assets WHERE key = ?", (key,))
+        if row is not None:
+            (self.directory / row[0]).unlink(missing_ok=True)
+
+    def download(
+        self, images: Any, *, keys: Mapping[str, str] | None = None, **kwargs: Any
+    ) -> DownloadReport:
+        """Download what the store does not hold yet from a ``{key: url}`` map or response.
+
+        Takes what :func:`~figmapy.download_images` takes, plus `keys`, which maps the
+        ids in `images` to store keys -- e.g. node ids to :meth:`render_key` -- where the
+        ids are not keys already, as image refs are. The report's `paths` holds every id,
+        downloaded now or earlier; `cached` lists the ids that were already present.
+        """
+        todo, report, staging = self._plan(images, keys)
+        try:
+            if todo:
+                fetched = download_images(todo, staging, names=_stems(todo), **kwargs)
+                self._settle(fetched, report, keys)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        report._sort(list(_url_map(images)))
+        return report
+
+    async def adownload(
+        self, images: Any, *, keys: Mapping[str, str] | None = None, **kwargs: Any
+    ) -> DownloadReport:
+        """:meth:`download` with :func:`~figmapy.adownload_images`."""
+        todo, report, staging = self._plan(images, keys)
+        try:
+            if todo:
+                fetched = await adownload_images(todo, staging, names=_stems(todo), **kwargs)
+                self._settle(fetched, report, keys)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        report._sort(list(_url_map(images)))
+        return report
+
+    def evict(self, *, keep: Iterable[str] = ()) -> None:
+        """Delete the least recently used files until the total is within `max_bytes`.
+
+        Keys in `keep` are never deleted, even if that leaves the total above the limit.
+        """
+        if self.max_bytes is None:
+            return
+        keep = set(keep)
+        with self._lock:
+            (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM assets").fetchone()
+            if total <= self.max_bytes:
+                return
+            doomed = []
+            for key, path, size in self._db.execute("SELECT key, path, size FROM assets ORDER BY accessed"):
+                if total <= self.max_bytes:
+                    break
+                if key in keep:
+                    continue
+                doomed.append((key, path))
+                total -= size
+            self._db.executemany("DELETE FROM assets WHERE key = ?", [(key,) for key, _ in doomed])
+        for _, path in doomed:
+            (self.directory / path).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _relative(self, key: str, suffix: str) -> str:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return f"{digest[:2]}/{digest}{suffix}"
+
+    def _move(self, key: str, source: Path) -> Path:
+        relative = self._relative(key, source.suffix)
+        target = self.directory / relative
+        target.parent.mkdir(exist_ok=True)
+        os.replace(source, target)
+        self._index(key, relative, target.stat().st_size)
+        return target
+
+    def _index(self, key: str, relative: str, size: int) -> None:
+        with self._lock:
+            old = self._db.execute("SELECT path FROM assets WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO assets (key, path, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, relative, size, time.time()),
+            )
+        if old is not None and old[0] != relative:
+            (self.directory / old[0]).unlink(missing_ok=True)  # same key, new suffix
+
+    def _plan(
+        self, images: Any, keys: Mapping[str, str] | None
+    ) -> tuple[dict[str, str], DownloadReport, Path]:
+        """The urls still to download, by id; a report holding the rest; a staging directory."""
+        urls = _url_map(images)
+        report = DownloadReport()
+        wanted = {}
+        for node_id, url in urls.items():
+            if url:
+                wanted[node_id] = keys.get(node_id, node_id) if keys else node_id
+            else:
+                report.missing.append(node_id)
+        absent = set(self.missing(wanted.values()))
+        todo = {}
+        for node_id, key in wanted.items():
+            path = None if key in absent else self.path(key)
+            if path is None:
+                todo[node_id] = urls[node_id]
+            else:
+                report.paths[node_id] = path
+                report.cached.append(node_id)
+        # On the same file system as the store, so finished downloads move in by renaming.
+        return todo, report, Path(tempfile.mkdtemp(prefix=".incoming-", dir=self.directory))
+
+    def _settle(self, fetched: DownloadReport, report: DownloadReport, keys: Mapping[str, str] | None) -> None:
+        """Move what `fetched` downloaded into the store and fold it into `report`."""
+        for node_id, path in fetched.paths.items():
+            report.paths[node_id] = self._move(keys.get(node_id, node_id) if keys else node_id, path)
+        report.failed.update(fetched.failed)
+        report.bytes += fetched.bytes
+        # Once per batch, since it sums the whole index. Whatever `report` hands back stays,
+        # so a batch larger than max_bytes overshoots until the next one evicts it.
+        self.evict(keep={keys.get(node_id, node_id) if keys else node_id for node_id in report.paths})
+
+
+def _stems(urls: Mapping[str, str]) -> dict[str, str]:
+    # Staged files only need distinct names; the store renames them anyway.
+    return {node_id: str(n) for n, node_id in enumerate(urls)}
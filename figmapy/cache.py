@@ -0,0 +1,370 @@
+"""Caching of responses: file JSON by version, and anything else by HTTP validators.
+
+``get_file`` on a large file is megabytes of JSON, and most of the time nothing in it has
+changed since the last call. A :class:`FileCache` keeps response bodies keyed by file key,
+version and parameters. Before each ``get_file`` / ``get_file_nodes`` the client asks
+``get_file_meta`` -- a cheap, tier 3 call -- which version is current, and only downloads
+when that version is not cached yet.
+
+    cache = figmapy.FileCache(max_bytes=512 * 2**20, store=figmapy.DirectoryStore("~/.cache/figma"))
+    figma = figmapy.Figma(file_cache=cache)
+    figma.get_file(key)          # downloads
+    figma.get_file(key)          # one get_file_meta call, then served from the cache
+
+Asking for an explicit ``version=`` skips the probe altogether: that version can not change.
+
+For everything else there is :class:`HTTPCache`. It serves a stored GET response
+without asking Figma for ``max_age`` seconds. Figma's spec documents no ``ETag`` or
+``Last-Modified`` headers, so that is how it saves requests. A response that does
+carry one of these validators is also revalidated once it is older, with
+``If-None-Match`` / ``If-Modified-Since``, so an unchanged resource costs a 304
+instead of a body:
+
+    cache = figmapy.HTTPCache(figmapy.SQLiteStore("figma-cache.db"), max_age=300)
+    figma = figmapy.Figma(http_cache=cache)
+    figma.get_team_components(team_id)
+
+Bodies are stored as received and parsed on the way out, so every caller gets its own
+model and the client's ``parse`` setting applies to cached responses too. That parse is
+not saved: a hit or a 304 saves the request or the body, not the pydantic validation,
+which runs again on every call. ``parse=False`` or ``parse="trusted"`` make it cheap. Any
+:class:`Store` works behind either cache: :class:`MemoryStore`, :class:`DirectoryStore`,
+:class:`SQLiteStore`, or your own.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import warnings
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, Protocol
+
+from .errors import user_stacklevel
+
+__all__ = ["CachedResponse", "DirectoryStore", "FileCache", "HTTPCache", "MemoryStore", "SQLiteStore", "Store"]
+
+
+class Store(Protocol):
+    """Somewhere to keep response bodies. Keys are short strings, values raw bytes."""
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class MemoryStore:
+    """An in-process LRU, bounded by the total size of what it holds."""
+
+    def __init__(self, max_bytes: int = 256 * 2**20):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return  # would evict everything else and still not fit
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._items[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class DirectoryStore:
+    """One gzip-compressed file per entry in a directory.
+
+    Survives restarts and can be shared by processes on one machine. With `max_bytes`
+    set, the least recently read entries are deleted once the directory grows past it.
+    """
+
+    def __init__(self, directory: str | os.PathLike, *, max_bytes: int | None = None, compresslevel: int = 6):
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.compresslevel = compresslevel
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / (hashlib.sha256(key.encode()).hexdigest() + ".gz")
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            value = gzip.decompress(path.read_bytes())
+        except (FileNotFoundError, OSError, EOFError):
+            return None
+        os.utime(path)  # mtime doubles as "last read" for eviction
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(gzip.compress(value, compresslevel=self.compresslevel))
+        os.replace(tmp, path)  # readers never see a half-written entry
+        if self.max_bytes is not None:
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for path in self.directory.glob("*.gz"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= (self.max_bytes or 0):
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+
+class SQLiteStore:
+    """Entries in one SQLite database, zlib-compressed.
+
+    A single file is easier to ship around and back up than a directory of blobs, and
+    SQLite handles several processes reading and writing it. With `max_bytes` set, the
+    least recently read entries are dropped once the stored total grows past it.
+    """
+
+    def __init__(self, path: str | os.PathLike, *, max_bytes: int | None = None):
+        self.path = Path(path).expanduser()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        return zlib.decompress(row[0])
+
+    def set(self, key: str, value: bytes) -> None:
+        blob = zlib.compress(value)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time()),
+            )
+            if self.max_bytes is not None:
+                self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def _evict(self) -> None:
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= (self.max_bytes or 0):
+            return
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            if total <= (self.max_bytes or 0):
+                break
+            doomed.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class FileCache:
+    """Version-keyed cache for ``get_file`` and ``get_file_nodes``.
+
+    max_bytes: size of the in-memory LRU in front of everything else.
+    store:     an optional second level, such as a :class:`DirectoryStore`, consulted on
+               a memory miss and filled on every download.
+    """
+
+    #: The operations whose bodies are immutable per file version.
+    OPERATIONS = frozenset({"get_file", "get_file_nodes"})
+
+    def __init__(self, max_bytes: int = 256 * 2**20, *, store: Store | None = None):
+        self.memory = MemoryStore(max_bytes)
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(identity: str, operation: str, file_key: str, version: str, params: dict | None) -> str:
+        """Entries are per token as well, so a shared store never serves one token another's file."""
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()) if k != "version")
+        return f"{identity} {operation}/{file_key}@{version}?{query}"
+
+    def get(self, key: str) -> bytes | None:
+        value = self.memory.get(key)
+        if value is None and self.store is not None:
+            value = self.store.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        self.memory.set(key, value)
+        if self.store is not None:
+            self.store.set(key, value)
+
+
+class CachedResponse:
+    """A stored GET response: body, the headers needed to revalidate it, and its age."""
+
+    #: Response headers kept with the body. Validators, plus enough to replay it.
+    KEPT_HEADERS = ("etag", "last-modified", "content-type")
+
+    def __init__(self, body: bytes, headers: dict[str, str], stored_at: float):
+        self.body = body
+        self.headers = headers
+        self.stored_at = stored_at
+
+    def validators(self) -> dict[str, str]:
+        """Request headers that ask Figma for a 304 if nothing changed."""
+        out = {}
+        if "etag" in self.headers:
+            out["If-None-Match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            out["If-Modified-Since"] = self.headers["last-modified"]
+        return out
+
+    def encode(self) -> bytes:
+        meta = json.dumps({"headers": self.headers, "stored_at": self.stored_at}).encode()
+        return meta + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, raw: bytes) -> CachedResponse:
+        meta, _, body = raw.partition(b"\n")
+        info = json.loads(meta)
+        return cls(body, info["headers"], info["stored_at"])
+
+
+class HTTPCache:
+    """Stores GET responses with their validators and replays them via conditional requests.
+
+    store:      where entries live. Defaults to a :class:`MemoryStore`.
+    max_age:    seconds a stored response is served without contacting Figma. This is
+                what the cache mostly runs on, since Figma's spec documents no
+                validators. With 0, every call goes to Figma, and only responses with an
+                ``ETag`` or ``Last-Modified`` are stored, to be revalidated. A warning
+                says so the first time a response has neither.
+                A hit saves the request, not the parse; see the module docstring.
+    operations: endpoint method names to cache, e.g. ``{"get_team_components"}``.
+                Defaults to every GET except :attr:`UNCACHED`.
+    """
+
+    #: Left out by default: file bodies and their version (``FileCache`` covers those
+    #: exactly, by version), and GETs whose answer changes from one minute to the next.
+    UNCACHED = frozenset({
+        "get_file", "get_file_nodes", "get_file_meta", "get_file_versions",
+        "get_comments", "get_comment_reactions", "get_activity_logs", "get_webhook_requests",
+    })
+
+    def __init__(
+        self,
+        store: Store | None = None,
+        *,
+        max_age: float = 60.0,
+        operations: Iterable[str] | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.store: Store = store if store is not None else MemoryStore()
+        self.max_age = max_age
+        self.operations = frozenset(operations) if operations is not None else None
+        self._clock = clock
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._warned = False
+
+    def applies_to(self, operation: str | None) -> bool:
+        if self.operations is None:
+            return operation not in self.UNCACHED
+        return operation in self.operations
+
+    @staticmethod
+    def key(identity: str, url: str, params: dict[str, Any] | None) -> str:
+        """Entries are per token as well as per URL: two tokens may see different data."""
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return f"{identity} {url}?{query}"
+
+    def lookup(self, key: str) -> CachedResponse | None:
+        raw = self.store.get(key)
+        if raw is None:
+            return None
+        try:
+            return CachedResponse.decode(raw)
+        except (ValueError, KeyError):
+            self.store.delete(key)  # written by something else, or truncated
+            return None
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return self.max_age > 0 and self._clock() - entry.stored_at < self.max_age
+
+    def storable(self, headers: Any) -> bool:
+        """Whether a 200 with these headers can be used again: it has a validator, or max_age allows it."""
+        if self.max_age > 0 or "etag" in headers or "last-modified" in headers:
+            return True
+        if not self._warned:
+            self._warned = True
+            warnings.warn(
+                "HTTPCache(max_age=0) only stores responses with an ETag or Last-Modified header, "
+                "and Figma sent neither, so this cache stores nothing for them. Set max_age to "
+                "serve stored responses for that many seconds.",
+                stacklevel=user_stacklevel(),
+            )
+        return False
+
+    def save(self, key: str, body: bytes, headers: Any) -> None:
+        kept = {name: headers[name] for name in CachedResponse.KEPT_HEADERS if name in headers}
+        self.store.set(key, CachedResponse(body, kept, self._clock()).encode())
+
+    def touch(self, key: str, entry: CachedResponse) -> None:
+        """A 304 confirmed the entry; restart its max_age."""
+        entry.stored_at = self._clock()
+        self.store.set(key, entry.encode())
@@ -9,30 +9,49 @@ error mapping and the escape hatches that keep you unblocked when the spec is be
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import os
 import random
 import time
 import warnings
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Iterator, Mapping
 from typing import Any
+from urllib.parse import quote
 
 import httpx
 from pydantic import ValidationError
 
+from . import models
 from ._compat import LegacyAliases
+from ._decode import Loads, loads_for, validates_json
 from ._endpoints import FIGMA_SPEC_VERSION, AsyncEndpoints, SyncEndpoints
+from ._flight import AsyncSingleFlight, SingleFlight
+from ._parsing import construct_trusted, validate_lazy
+from ._stream import PageScanner, node_model
+from .cache import CachedResponse, FileCache, HTTPCache
+from .concurrency import AIMDConcurrency
 from .errors import (
     FigmaError,
+    FigmaHTTPError,
+    FigmaPartialResultWarning,
     FigmaRateLimitError,
+    FigmaServerError,
     FigmaSpecWarning,
     FigmaValidationError,
     error_for_status,
+    user_stacklevel,
 )
+from .ratelimit import RateLimiter, operation_name
 
 DEFAULT_BASE_URL = "https://api.figma.com"
 TOKEN_ENV_VAR = "FIGMA_TOKEN"
 RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
 MAX_BACKOFF_SECONDS = 60.0
+PARSE_MODES = (True, False, "lazy", "trusted")
+#: Longest URL a request is allowed to have before its ``ids`` are split across several.
+MAX_URL_LENGTH = 6000
+# Operations whose ``ids`` can be split, and the map in the response that is merged back.
+CHUNKED_OPERATIONS = {"get_images": "images", "get_file_nodes": "nodes"}
 
 
 class _BaseClient:
@@ -45,8 +64,14 @@ class _BaseClient:
         timeout: float = 30.0,
         max_retries: int = 3,
         strict: bool = False,
-        parse: bool = True,
+        parse: bool | str = True,
         headers: Mapping[str, str] | None = None,
+        rate_limiter: RateLimiter | None = None,
+        coalesce: bool = False,
+        file_cache: FileCache | None = None,
+        http_cache: HTTPCache | None = None,
+        decoder: str | Loads = "auto",
+        id_chunk_size: int | None = 200,
     ):
         """
         token:       personal access token, or OAuth2 access token when ``oauth2=True``.
@@ -58,7 +83,38 @@ class _BaseClient:
         strict:      raise :class:`FigmaValidationError` when a response does not match
                      the bundled spec, instead of warning and returning the raw dict.
         parse:       set False to always get plain dicts back and skip model validation.
+                     ``"lazy"`` validates the top of ``get_file`` / ``get_file_nodes``
+                     responses straight away and each page, and each top-level frame,
+                     only when it is first read. Same models, same attributes.
+                     ``"trusted"`` builds the models without validating anything, for
+                     JSON you know is well formed, e.g. replayed from a cache. While
+                     a tree is built the cyclic GC's young-generation threshold is
+                     raised, process-wide, and put back when the build is done.
         headers:     extra headers merged into every request.
+        rate_limiter: a :class:`~figmapy.RateLimiter` to pace requests before they are
+                     sent, rather than only backing off once Figma answers 429. Share
+                     one between clients to give them a common budget.
+        coalesce:    when several callers make the same GET at the same time, send it
+                     once and hand the response to all of them. Each caller still gets
+                     its own parsed model.
+        file_cache:  a :class:`~figmapy.FileCache`. ``get_file`` and ``get_file_nodes``
+                     then check the current version with ``get_file_meta`` first, and
+                     only download versions the cache does not hold.
+        http_cache:  a :class:`~figmapy.HTTPCache`. GETs are then served from it for
+                     its ``max_age``, and those with an ``ETag`` / ``Last-Modified``
+                     revalidated after that, with a 304 replaying the stored body.
+        decoder:     how response bytes are decoded. ``"auto"`` has pydantic parse and
+                     validate the JSON in one pass wherever the result is a model, and
+                     uses orjson, if installed, for plain dicts. ``"pydantic"`` is the
+                     same without orjson; ``"orjson"`` and ``"json"`` decode first and
+                     validate the dict after. Any ``bytes -> object`` callable, such as
+                     ``msgspec.json.decode``, works too.
+        id_chunk_size: most ids sent in one ``get_images`` / ``get_file_nodes`` request.
+                     Longer lists, or ones that would not fit in a URL, are split into
+                     several requests (sent concurrently by :class:`AsyncFigma`) and the
+                     ``images`` / ``nodes`` maps merged. None sends every list whole.
+                     Ids that keep failing on their own come back as None, with a
+                     :class:`~figmapy.FigmaPartialResultWarning` listing their errors.
         """
         token = token or os.environ.get(TOKEN_ENV_VAR)
         if not token:
@@ -68,6 +124,10 @@ class _BaseClient:
             )
         if max_retries < 0:
             raise ValueError("max_retries must be >= 0")
+        if parse not in PARSE_MODES:
+            raise ValueError(f"parse must be one of {PARSE_MODES}, not {parse!r}")
+        if id_chunk_size is not None and id_chunk_size < 1:
+            raise ValueError("id_chunk_size must be >= 1, or None")
 
         self.base_url = base_url.rstrip("/")
         self.max_retries = max_retries
@@ -75,6 +135,16 @@ class _BaseClient:
         self.parse = parse
         self.spec_version = FIGMA_SPEC_VERSION
         self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        # Buckets are per token; key them by a digest so the limiter never holds a secret.
+        self._limiter_key = hashlib.sha256(token.encode()).hexdigest()[:16]
+        self.coalesce = coalesce
+        self.file_cache = file_cache
+        self.http_cache = http_cache
+        self.decoder = decoder
+        self._loads = loads_for(decoder)
+        self._validates_json = validates_json(decoder)
+        self.id_chunk_size = id_chunk_size
 
         auth = {"Authorization": f"Bearer {token}"} if oauth2 else {"X-Figma-Token": token}
         self.headers = {"User-Agent": f"figmapy/{FIGMA_SPEC_VERSION}", **auth, **(headers or {})}
@@ -109,6 +179,67 @@ class _BaseClient:
             for k, v in cleaned.items()
         }
 
+    def _id_chunks(
+        self, method: str, url: str, params: Mapping[str, Any] | None
+    ) -> tuple[str, list[list[str]]] | None:
+        """(map to merge, ids per request) if this request's ``ids`` need more than one.
+
+        A chunk ends at `id_chunk_size` ids, or sooner if the URL, with the other
+        parameters and every id percent-encoded, would grow past :data:`MAX_URL_LENGTH`.
+        """
+        if not self.id_chunk_size or method.upper() != "GET" or not params or not params.get("ids"):
+            return None
+        key = CHUNKED_OPERATIONS.get(operation_name("GET", self._path(url)) or "")
+        if key is None:
+            return None
+        ids = params["ids"]
+        ids = list(dict.fromkeys(ids.split(",") if isinstance(ids, str) else map(str, ids)))
+        others = {k: v for k, v in (self._clean_params(params) or {}).items() if k != "ids"}
+        budget = MAX_URL_LENGTH - len(str(httpx.URL(url, params=others))) - len("&ids=")
+        chunks: list[list[str]] = [[]]
+        size = 0
+        for node_id in ids:
+            cost = len(quote(node_id, safe="")) + 3  # and the %2C before the next one
+            if chunks[-1] and (len(chunks[-1]) == self.id_chunk_size or size + cost > budget):
+                chunks.append([])
+                size = 0
+            chunks[-1].append(node_id)
+            size += cost
+        return (key, chunks) if len(chunks) > 1 else None
+
+    @staticmethod
+    def _merge_chunks(key: str, results: list[Any], failed: list[tuple[str, FigmaHTTPError]]) -> Any:
+        """The first chunk's response, with every other chunk's map merged into it.
+
+        Ids that failed on their own are in the map as None -- what ``get_images`` returns
+        for a node that could not be rendered -- and a :class:`FigmaPartialResultWarning`
+        says which and why. If nothing succeeded, the first error is raised.
+        """
+        if not results:
+            raise failed[0][1]
+        merged = results[0]
+        mapping = merged[key] if isinstance(merged, dict) else getattr(merged, key)
+        if mapping is None:  # Figma sends ``"images": null`` when nothing could be rendered
+            mapping = {}
+            if isinstance(merged, dict):
+                merged[key] = mapping
+            else:
+                setattr(merged, key, mapping)
+        for result in results[1:]:
+            mapping.update((result[key] if isinstance(result, dict) else getattr(result, key)) or {})
+        for node_id, _ in failed:
+            mapping[node_id] = None
+        if failed:
+            shown = "; ".join(f"{node_id}: {exc}" for node_id, exc in failed[:3])
+            more = f" and {len(failed) - 3} more" if len(failed) > 3 else ""
+            warnings.warn(
+                FigmaPartialResultWarning(
+                    f"{len(failed)} ids failed on their own and are None in {key!r}: {shown}{more}", dict(failed)
+                ),
+                stacklevel=user_stacklevel(),
+            )
+        return merged
+
     def _raise_for_status(self, response: httpx.Response) -> None:
         if response.status_code < 400:
             return
@@ -131,6 +262,10 @@ class _BaseClient:
         if model is None or not self.parse or not isinstance(data, dict):
             return data
         try:
+            if self.parse == "lazy":
+                return validate_lazy(model, data, self.strict)
+            if self.parse == "trusted":
+                return construct_trusted(model, data)
             return model.model_validate(data)
         except ValidationError as exc:
             detail = (
@@ -140,20 +275,131 @@ class _BaseClient:
             )
             if self.strict:
                 raise FigmaValidationError(detail) from exc
-            warnings.warn(detail, FigmaSpecWarning, stacklevel=4)
+            warnings.warn(detail, FigmaSpecWarning, stacklevel=user_stacklevel())
             return data
 
-    def _backoff(self, response: httpx.Response | None, attempt: int) -> float:
-        if response is not None:
-            explicit = _retry_after(response)
-            if explicit is not None:
-                return min(explicit, MAX_BACKOFF_SECONDS)
-        # full jitter, so a fleet of workers does not retry in lockstep
-        return min(2.0**attempt, MAX_BACKOFF_SECONDS) * (0.5 + random.random() / 2)
-
     def _should_retry(self, status_code: int, attempt: int) -> bool:
         return status_code in RETRY_STATUSES and attempt < self.max_retries
 
+    def _flight_key(self, method: str, url: str, params: Mapping[str, Any] | None) -> tuple | None:
+        """What makes two requests the same, or None if this one must not be shared."""
+        if not self.coalesce or method.upper() != "GET":
+            return None
+        cleaned = self._clean_params(params) or {}
+        return (url, tuple(sorted((k, str(v)) for k, v in cleaned.items())))
+
+    def _file_cache_target(
+        self, method: str, url: str, params: Mapping[str, Any] | None
+    ) -> tuple[str, str, dict] | None:
+        """(operation, file key, params) if this request goes through the file cache."""
+        if self.file_cache is None or method.upper() != "GET":
+            return None
+        path = self._path(url)
+        operation = operation_name("GET", path)
+        if operation not in FileCache.OPERATIONS:
+            return None
+        return operation, path.split("/")[3], self._clean_params(params) or {}
+
+    @staticmethod
+    def _version_from_meta(response: httpx.Response) -> str | None:
+        """The current version from a get_file_meta response, or None to skip the cache.
+
+        A failed probe is not an error: the token may lack the metadata scope while still
+        being able to read the file, so the download goes ahead uncached.
+        """
+        if response.status_code >= 400 or not response.content:
+            return None
+        version = (response.json().get("file") or {}).get("version")
+        return str(version) if version else None
+
+    def _from_file_cache(self, target: tuple[str, str, dict], version: str | None, model: type | None) -> Any:
+        if version is None:
+            return None
+        operation, file_key, params = target
+        body = self.file_cache.get(FileCache.key(self._limiter_key, operation, file_key, version, params))  # type: ignore[union-attr]
+        return None if body is None else self._decode(body, model)
+
+    def _into_file_cache(self, target: tuple[str, str, dict], response: httpx.Response, model: type | None) -> Any:
+        self._raise_for_status(response)
+        result = self._decode(response.content, model)
+        version = result.get("version") if isinstance(result, dict) else getattr(result, "version", None)
+        if version:
+            operation, file_key, params = target
+            key = FileCache.key(self._limiter_key, operation, file_key, str(version), params)
+            self.file_cache.set(key, response.content)  # type: ignore[union-attr]
+        return result
+
+    def _http_cache_lookup(
+        self, method: str, url: str, params: Mapping[str, Any] | None
+    ) -> tuple[str | None, CachedResponse | None]:
+        """The cache key for this request and what is stored under it, if it is cacheable."""
+        cache = self.http_cache
+        if cache is None or method.upper() != "GET" or not cache.applies_to(operation_name("GET", self._path(url))):
+            return None, None
+        key = HTTPCache.key(self._limiter_key, url, self._clean_params(params))
+        return key, cache.lookup(key)
+
+    def _http_cache_result(
+        self, key: str, entry: CachedResponse | None, response: httpx.Response | None, url: str
+    ) -> httpx.Response:
+        """Fold a (possibly absent, possibly 304) response into the HTTP cache.
+
+        `response` is None when the entry was fresh enough that nothing was sent.
+        """
+        cache = self.http_cache
+        assert cache is not None
+        if entry is not None and (response is None or response.status_code == 304):
+            if response is None:
+                cache.hits += 1
+            else:
+                cache.revalidated += 1
+                cache.touch(key, entry)
+            return httpx.Response(200, headers=entry.headers, content=entry.body, request=httpx.Request("GET", url))
+        assert response is not None
+        cache.misses += 1
+        if response.status_code == 200 and cache.storable(response.headers):
+            cache.save(key, response.content, response.headers)
+        return response
+
+    def _finish(self, response: httpx.Response, model: type | None) -> Any:
+        self._raise_for_status(response)
+        if not response.content:
+            return None
+        return self._decode(response.content, model)
+
+    def _decode(self, body: bytes, model: type | None) -> Any:
+        """Response bytes to what the caller gets back, in one pass where the decoder allows."""
+        if self._validates_json and model is not None and self.parse is True:
+            try:
+                return model.model_validate_json(body)
+            except ValidationError:
+                pass  # decode on its own, so _parse can warn or raise with the raw dict
+        return self._parse(self._loads(body), model)
+
+    def _streamed(self, page_id: str | None, raw: bytes, frames: bool) -> Any:
+        """One value out of a :class:`PageScanner`, parsed the way the client parses."""
+        if not frames:
+            return self._decode(raw, models.CanvasNode)
+        data = self._loads(raw)
+        node_type = data.get("type") if isinstance(data, dict) else None
+        return page_id, self._parse(data, node_model(node_type))
+
+    def _path(self, url: str) -> str:
+        if url.startswith(self.base_url):
+            return url[len(self.base_url):].split("?", 1)[0]
+        return httpx.URL(url).path
+
+    def _throttle(self, method: str, url: str) -> float:
+        """Seconds to wait before sending, according to the rate limiter."""
+        if self.rate_limiter is None:
+            return 0.0
+        return self.rate_limiter.reserve(self._limiter_key, method, self._path(url))
+
+    def _observe(self, method: str, url: str, response: httpx.Response) -> None:
+        """Feed a response back into the pacing, so a 429 slows every sender down."""
+        if self.rate_limiter is not None and response.status_code == 429:
+            self.rate_limiter.penalize(self._limiter_key, method, self._path(url), _retry_after(response))
+
 
 class Figma(_BaseClient, LegacyAliases, SyncEndpoints):
     """Synchronous Figma REST API client.
@@ -170,6 +416,7 @@ class Figma(_BaseClient, LegacyAliases, SyncEndpoints):
         self._owns_client = http_client is None
         #: The underlying httpx client. Public, so you can reach past the wrapper.
         self.http = http_client or httpx.Client(timeout=self.timeout, follow_redirects=True)
+        self._flights = SingleFlight()
 
     def request(
         self,
@@ -198,24 +445,175 @@ class Figma(_BaseClient, LegacyAliases, SyncEndpoints):
         model: type | None = None,
     ) -> Any:
         url = self._url(path)
+        chunked = self._id_chunks(method, url, params)
+        if chunked is not None:
+            key, chunks = chunked
+            results: list[Any] = []
+            failed: list[tuple[str, FigmaHTTPError]] = []
+            versions: dict[str, str | None] = {}
+            for ids in chunks:
+                results += self._call_chunk(url, params, model, ids, failed, versions)  # type: ignore[arg-type]
+            return self._merge_chunks(key, results, failed)
+        return self._call_once(method, url, params, json_body, model)
+
+    def _call_once(
+        self,
+        method: str,
+        url: str,
+        params: Mapping[str, Any] | None,
+        json_body: Mapping[str, Any] | None,
+        model: type | None,
+        versions: dict[str, str | None] | None = None,
+    ) -> Any:
+        target = self._file_cache_target(method, url, params)
+        if target is not None:
+            return self._cached_file(target, url, params, model, {} if versions is None else versions)
+        return self._finish(self._fetch(method, url, params, json_body), model)
+
+    def _call_chunk(
+        self,
+        url: str,
+        params: Mapping[str, Any],
+        model: type | None,
+        ids: list[str],
+        failed: list[tuple[str, FigmaHTTPError]],
+        versions: dict[str, str | None],
+    ) -> list[Any]:
+        """Responses for one chunk of ids, halving it until the ids that fail are alone.
+
+        Ids that still fail on their own go into `failed`; errors that are not about the
+        ids -- auth, not found, rate limits -- are raised. `versions` carries the file
+        version between chunks, so the file cache probes it once per call.
+        """
+        try:
+            return [self._call_once("GET", url, {**params, "ids": ids}, None, model, versions)]
+        except FigmaHTTPError as exc:
+            if not _chunk_failure(exc):
+                raise
+            if len(ids) == 1:
+                failed.append((ids[0], exc))
+                return []
+        half = len(ids) // 2
+        return self._call_chunk(url, params, model, ids[:half], failed, versions) + self._call_chunk(
+            url, params, model, ids[half:], failed, versions
+        )
+
+    def _fetch(
+        self,
+        method: str,
+        url: str,
+        params: Mapping[str, Any] | None,
+        json_body: Mapping[str, Any] | None,
+    ) -> httpx.Response:
+        key = self._flight_key(method, url, params)
+        if key is None:
+            return self._revalidate(method, url, params, json_body)
+        return self._flights.do(key, lambda: self._revalidate(method, url, params, json_body))
+
+    def _revalidate(
+        self,
+        method: str,
+        url: str,
+        params: Mapping[str, Any] | None,
+        json_body: Mapping[str, Any] | None,
+    ) -> httpx.Response:
+        """Go through the HTTP cache when there is one, otherwise straight to :meth:`_request`."""
+        key, entry = self._http_cache_lookup(method, url, params)
+        if key is None:
+            return self._request(method, url, params, json_body)
+        if entry is not None and self.http_cache.is_fresh(entry):  # type: ignore[union-attr]
+            return self._http_cache_result(key, entry, None, url)
+        validators = entry.validators() if entry is not None else None
+        response = self._request(method, url, params, json_body, validators)
+        return self._http_cache_result(key, entry, response, url)
+
+    def _file_version(self, target: tuple[str, str, dict], versions: dict[str, str | None]) -> str | None:
+        """The version asked for, or the current one from ``get_file_meta``, remembered in `versions`."""
+        if target[1] not in versions:
+            version = target[2].get("version")
+            if version is None:
+                # Straight to Figma: an HTTPCache answer here would be the stale version.
+                probe = self._request("GET", self._url(f"/v1/files/{target[1]}/meta"), None, None)
+                version = self._version_from_meta(probe)
+            versions[target[1]] = version
+        return versions[target[1]]
+
+    def _cached_file(
+        self,
+        target: tuple[str, str, dict],
+        url: str,
+        params: Mapping[str, Any] | None,
+        model: type | None,
+        versions: dict[str, str | None],
+    ) -> Any:
+        cached = self._from_file_cache(target, self._file_version(target, versions), model)
+        if cached is not None:
+            return cached
+        return self._into_file_cache(target, self._fetch("GET", url, params, None), model)
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        params: Mapping[str, Any] | None,
+        json_body: Mapping[str, Any] | None,
+        headers: Mapping[str, str] | None = None,
+        *,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """Send, pacing and retrying as configured. Returns the last response, whatever it is.
+
+        With `stream`, the body is left unread and the caller must close the response.
+        """
         attempt = 0
         while True:
-            response = self.http.request(
+            delay = self._throttle(method, url)
+            if delay:
+                time.sleep(delay)
+            request = self.http.build_request(
                 method,
                 url,
-                headers=self.headers,
+                headers={**self.headers, **headers} if headers else self.headers,
                 params=self._clean_params(params),
                 json=self._clean_body(json_body),
             )
+            response = self.http.send(request, stream=stream)
+            self._observe(method, url, response)
             if not self._should_retry(response.status_code, attempt):
-                break
-            time.sleep(self._backoff(response, attempt))
+                return response
+            response.close()
+            time.sleep(backoff_delay(response, attempt))
             attempt += 1
 
-        self._raise_for_status(response)
-        if not response.content:
-            return None
-        return self._parse(response.json(), model)
+    def stream_file(self, file_key: str, *, frames: bool = False, **params: Any) -> Iterator[Any]:
+        """Get a file one page at a time, each parsed as soon as its JSON has arrived.
+
+        Yields :class:`~figmapy.models.CanvasNode` objects in document order. With
+        ``frames=True``, yields ``(page_id, node)`` for every top-level node on every
+        page instead. Only the page (or node) being received is held in memory, so a
+        large file can be processed while it downloads. `params` are the ones
+        :meth:`get_file` takes, e.g. ``depth``, ``geometry``, ``version``.
+
+        Streams bypass ``file_cache`` and ``http_cache``, and the parts of the response
+        outside ``document`` (``components``, ``styles``, ...) are not returned; get
+        those from :meth:`get_file` with ``depth=1``.
+
+        >>> for page in figma.stream_file("abc123"):
+        ...     index(page)
+        """
+        url = self._url(f"/v1/files/{file_key}")
+        response = self._request("GET", url, params, None, stream=True)
+        try:
+            if response.status_code >= 400:
+                response.read()
+                self._raise_for_status(response)
+            scanner = PageScanner(frames=frames)
+            for chunk in response.iter_bytes():
+                for page_id, raw in scanner.feed(chunk):
+                    yield self._streamed(page_id, raw, frames)
+            scanner.close()
+        finally:
+            response.close()
 
     def close(self) -> None:
         if self._owns_client:
@@ -236,13 +634,25 @@ class AsyncFigma(_BaseClient, LegacyAliases, AsyncEndpoints):
 
     >>> async with figmapy.AsyncFigma() as figma:
     ...     file = await figma.get_file("abc123")
+
+    Pass ``concurrency=figmapy.AIMDConcurrency()`` to cap how many requests are in flight
+    and let the cap adapt to how Figma responds; ``figma.concurrency.window`` is the
+    current cap.
     """
 
-    def __init__(self, *args: Any, http_client: httpx.AsyncClient | None = None, **kwargs: Any):
+    def __init__(
+        self,
+        *args: Any,
+        http_client: httpx.AsyncClient | None = None,
+        concurrency: AIMDConcurrency | None = None,
+        **kwargs: Any,
+    ):
         super().__init__(*args, **kwargs)
         self._owns_client = http_client is None
         #: The underlying httpx client. Public, so you can reach past the wrapper.
         self.http = http_client or httpx.AsyncClient(timeout=self.timeout, follow_redirects=True)
+        self.concurrency = concurrency
+        self._flights = AsyncSingleFlight()
 
     async def request(
         self,
@@ -265,24 +675,193 @@ class AsyncFigma(_BaseClient, LegacyAliases, AsyncEndpoints):
         model: type | None = None,
     ) -> Any:
         url = self._url(path)
+        chunked = self._id_chunks(method, url, params)
+        if chunked is not None:
+            key, chunks = chunked
+            failed: list[tuple[str, FigmaHTTPError]] = []
+            versions: dict[str, str | None] = {}
+            target = self._file_cache_target(method, url, params)
+            if target is not None:
+                await self._file_version(target, versions)  # once, before the chunks go out together
+            batches = await _gather_or_cancel(
+                *(self._call_chunk(url, params, model, ids, failed, versions) for ids in chunks)  # type: ignore[arg-type]
+            )
+            return self._merge_chunks(key, [result for batch in batches for result in batch], failed)
+        return await self._call_once(method, url, params, json_body, model)
+
+    async def _call_once(
+        self,
+        method: str,
+        url: str,
+        params: Mapping[str, Any] | None,
+        json_body: Mapping[str, Any] | None,
+        model: type | None,
+        versions: dict[str, str | None] | None = None,
+    ) -> Any:
+        target = self._file_cache_target(method, url, params)
+        if target is not None:
+            return await self._cached_file(target, url, params, model, {} if versions is None else versions)
+        return self._finish(await self._fetch(method, url, params, json_body), model)
+
+    async def _call_chunk(
+        self,
+        url: str,
+        params: Mapping[str, Any],
+        model: type | None,
+        ids: list[str],
+        failed: list[tuple[str, FigmaHTTPError]],
+        versions: dict[str, str | None],
+    ) -> list[Any]:
+        """Responses for one chunk of ids. See :meth:`Figma._call_chunk`; halves run concurrently."""
+        try:
+            return [await self._call_once("GET", url, {**params, "ids": ids}, None, model, versions)]
+        except FigmaHTTPError as exc:
+            if not _chunk_failure(exc):
+                raise
+            if len(ids) == 1:
+                failed.append((ids[0], exc))
+                return []
+        half = len(ids) // 2
+        first, second = await _gather_or_cancel(
+            self._call_chunk(url, params, model, ids[:half], failed, versions),
+            self._call_chunk(url, params, model, ids[half:], failed, versions),
+        )
+        return first + second
+
+    async def _fetch(
+        self,
+        method: str,
+        url: str,
+        params: Mapping[str, Any] | None,
+        json_body: Mapping[str, Any] | None,
+    ) -> httpx.Response:
+        key = self._flight_key(method, url, params)
+        if key is None:
+            return await self._revalidate(method, url, params, json_body)
+        return await self._flights.do(key, lambda: self._revalidate(method, url, params, json_body))
+
+    async def _revalidate(
+        self,
+        method: str,
+        url: str,
+        params: Mapping[str, Any] | None,
+        json_body: Mapping[str, Any] | None,
+    ) -> httpx.Response:
+        """Go through the HTTP cache when there is one. See :meth:`Figma._revalidate`."""
+        key, entry = self._http_cache_lookup(method, url, params)
+        if key is None:
+            return await self._request(method, url, params, json_body)
+        if entry is not None and self.http_cache.is_fresh(entry):  # type: ignore[union-attr]
+            return self._http_cache_result(key, entry, None, url)
+        validators = entry.validators() if entry is not None else None
+        response = await self._request(method, url, params, json_body, validators)
+        return self._http_cache_result(key, entry, response, url)
+
+    async def _file_version(self, target: tuple[str, str, dict], versions: dict[str, str | None]) -> str | None:
+        """See :meth:`Figma._file_version`."""
+        if target[1] not in versions:
+            version = target[2].get("version")
+            if version is None:
+                probe = await self._request("GET", self._url(f"/v1/files/{target[1]}/meta"), None, None)
+                version = self._version_from_meta(probe)
+            versions[target[1]] = version
+        return versions[target[1]]
+
+    async def _cached_file(
+        self,
+        target: tuple[str, str, dict],
+        url: str,
+        params: Mapping[str, Any] | None,
+        model: type | None,
+        versions: dict[str, str | None],
+    ) -> Any:
+        cached = self._from_file_cache(target, await self._file_version(target, versions), model)
+        if cached is not None:
+            return cached
+        return self._into_file_cache(target, await self._fetch("GET", url, params, None), model)
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        params: Mapping[str, Any] | None,
+        json_body: Mapping[str, Any] | None,
+        headers: Mapping[str, str] | None = None,
+        *,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """Send, pacing and retrying as configured. See :meth:`Figma._request`."""
         attempt = 0
         while True:
-            response = await self.http.request(
+            delay = self._throttle(method, url)
+            if delay:
+                await asyncio.sleep(delay)
+            response = await self._send(method, url, params, json_body, headers, stream=stream)
+            self._observe(method, url, response)
+            if not self._should_retry(response.status_code, attempt):
+                return response
+            await response.aclose()
+            await asyncio.sleep(backoff_delay(response, attempt))
+            attempt += 1
+
+    async def stream_file(self, file_key: str, *, frames: bool = False, **params: Any) -> AsyncIterator[Any]:
+        """Get a file one page at a time. See :meth:`Figma.stream_file`.
+
+        >>> async for page in figma.stream_file("abc123"):
+        ...     index(page)
+        """
+        url = self._url(f"/v1/files/{file_key}")
+        response = await self._request("GET", url, params, None, stream=True)
+        try:
+            if response.status_code >= 400:
+                await response.aread()
+                self._raise_for_status(response)
+            scanner = PageScanner(frames=frames)
+            async for chunk in response.aiter_bytes():
+                for page_id, raw in scanner.feed(chunk):
+                    yield self._streamed(page_id, raw, frames)
+            scanner.close()
+        finally:
+            await response.aclose()
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        params: Mapping[str, Any] | None,
+        json_body: Mapping[str, Any] | None,
+        headers: Mapping[str, str] | None = None,
+        *,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """One attempt, inside a slot of the concurrency window when there is one.
+
+        A streamed response gives its slot back once the headers are in.
+        """
+        if self.concurrency is not None:
+            await self.concurrency.acquire()
+        started = time.monotonic()
+        try:
+            request = self.http.build_request(
                 method,
                 url,
-                headers=self.headers,
+                headers={**self.headers, **headers} if headers else self.headers,
                 params=self._clean_params(params),
                 json=self._clean_body(json_body),
             )
-            if not self._should_retry(response.status_code, attempt):
-                break
-            await asyncio.sleep(self._backoff(response, attempt))
-            attempt += 1
-
-        self._raise_for_status(response)
-        if not response.content:
-            return None
-        return self._parse(response.json(), model)
+            response = await self.http.send(request, stream=stream)
+        except httpx.TransportError:
+            if self.concurrency is not None:
+                self.concurrency.release(None, time.monotonic() - started)
+            raise
+        except BaseException:
+            # Cancelled, or failed on our side: no signal about Figma's load either way.
+            if self.concurrency is not None:
+                self.concurrency.abandon()
+            raise
+        if self.concurrency is not None:
+            self.concurrency.release(response.status_code, time.monotonic() - started, _retry_after(response))
+        return response
 
     async def aclose(self) -> None:
         if self._owns_client:
@@ -295,6 +874,45 @@ class AsyncFigma(_BaseClient, LegacyAliases, AsyncEndpoints):
         await self.aclose()
 
 
+async def _gather_or_cancel(*aws: Any) -> list[Any]:
+    """``asyncio.gather``, except that the first error cancels the rest and waits for them.
+
+    Without that, the sibling requests of a chunk that raised would carry on in the
+    background after the call had already failed.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _chunk_failure(exc: FigmaHTTPError) -> bool:
+    """Whether an error may be down to the ids in the request, so fewer might succeed.
+
+    Server errors and too-long URLs, and the 400 Figma answers when a render times out.
+    """
+    if isinstance(exc, FigmaServerError) or exc.status_code in (413, 414):
+        return True
+    return exc.status_code == 400 and "timeout" in exc.message.lower()
+
+
+def backoff_delay(response: httpx.Response | None, attempt: int) -> float:
+    """Seconds to wait before retry number `attempt + 1` of a request.
+
+    Figma's ``Retry-After`` when the response has one, otherwise exponential backoff.
+    Shared by the clients and the image downloads.
+    """
+    if response is not None:
+        explicit = _retry_after(response)
+        if explicit is not None:
+            return min(explicit, MAX_BACKOFF_SECONDS)
+    # full jitter, so a fleet of workers does not retry in lockstep
+    return min(2.0**attempt, MAX_BACKOFF_SECONDS) * (0.5 + random.random() / 2)
+
+
 def _retry_after(response: httpx.Response) -> float | None:
     raw = response.headers.get("retry-after")
     if not raw:
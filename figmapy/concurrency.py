@@ -0,0 +1,146 @@
+"""Adaptive limits on how many requests :class:`~figmapy.AsyncFigma` has in flight.
+
+``asyncio.gather`` over a few hundred ``get_file`` calls sends them all at once. A
+concurrency policy sits in front of every request the client makes and decides how many
+may be outstanding, so the caller can gather freely and let the client find the level
+Figma is comfortable with.
+
+    policy = figmapy.AIMDConcurrency(initial=4, maximum=32)
+    async with figmapy.AsyncFigma(concurrency=policy) as figma:
+        files = await asyncio.gather(*(figma.get_file(k) for k in keys))
+        print(policy.window)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import time
+from collections.abc import Callable
+
+__all__ = ["AIMDConcurrency"]
+
+
+class AIMDConcurrency:
+    """Additive-increase / multiplicative-decrease window over in-flight requests.
+
+    initial:   window to start with.
+    minimum:   the window never shrinks below this.
+    maximum:   ...nor grows above this.
+    increase:  added to the window over one window's worth of fast successes, i.e.
+               roughly +`increase` per round trip, as in TCP congestion avoidance.
+    decrease:  factor the window is multiplied by on a 429 or 5xx.
+    tolerance: a success counts as "fast" while its latency stays within this multiple
+               of the best latency seen. Slower successes hold the window steady: Figma
+               is queueing, and more concurrency would only queue more.
+
+    A ``Retry-After`` on a 429 also pauses new requests for that long. Several failures
+    from the same window shrink it once, not once each.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        *,
+        minimum: int = 1,
+        maximum: int = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        tolerance: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("need 1 <= minimum <= initial <= maximum")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.tolerance = tolerance
+        self._clock = clock
+        self._window = float(initial)
+        self._in_flight = 0
+        self._best_latency: float | None = None
+        self._paused_until = 0.0
+        self._recovering_until = 0.0
+        self._waiters: collections.deque[asyncio.Future] = collections.deque()
+
+    @property
+    def window(self) -> int:
+        """How many requests may be in flight right now."""
+        return int(self._window)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Wait for a free slot in the window, and for any ``Retry-After`` pause to end."""
+        while True:
+            pause = self._paused_until - self._clock()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+            if self._in_flight < self.window and not self._waiters:
+                self._in_flight += 1
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.done() and not waiter.cancelled():
+                    # handed a slot in the same tick we were cancelled: give it back
+                    self._in_flight -= 1
+                    self._wake()
+                raise
+            return  # _wake handed this waiter its slot
+
+    def release(self, status: int | None, latency: float, retry_after: float | None = None) -> None:
+        """Return a slot and adjust the window from how the request went.
+
+        `status` is None when the request never got a response (timeout, reset). A
+        request that was cancelled goes to :meth:`abandon` instead.
+        """
+        self._in_flight -= 1
+        now = self._clock()
+        if status is None or status == 429 or status >= 500:
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+                asyncio.get_running_loop().call_later(retry_after, self._wake)
+            if now >= self._recovering_until:
+                self._window = max(float(self.minimum), self._window * self.decrease)
+                # Requests already in flight were sent under the old window; their
+                # failures are the same signal, not a new one.
+                self._recovering_until = now + max(latency, 0.001)
+        elif status < 300:
+            if self._best_latency is None or latency < self._best_latency:
+                self._best_latency = latency
+            if latency <= self._best_latency * self.tolerance:
+                self._window = min(float(self.maximum), self._window + self.increase / self._window)
+        self._wake()
+
+    def abandon(self) -> None:
+        """Return a slot without adjusting the window.
+
+        For a request that was cancelled, or failed before it reached Figma: it says
+        nothing about how Figma is coping.
+        """
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Hand free slots to queued requests, oldest first."""
+        if self._paused_until > self._clock():
+            return
+        while self._in_flight < self.window and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def __repr__(self) -> str:
+        return f"AIMDConcurrency(window={self.window}, in_flight={self._in_flight})"
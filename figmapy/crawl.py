@@ -0,0 +1,269 @@
+"""Crawl everything a team holds: folders, subfolders, files and each file's metadata.
+
+An inventory of a team is one ``get_team_folders`` call, then one or two calls per
+folder and one ``get_file_meta`` per file -- thousands of requests, each waiting on the
+last when made one after another. :class:`TeamCrawler` makes them on
+:class:`~figmapy.AsyncFigma`, `concurrency` at a time, and yields each file as soon as
+its metadata is in::
+
+    >>> async with figmapy.AsyncFigma() as figma:
+    ...     crawler = TeamCrawler(figma, team_id, checkpoint="inventory.json")
+    ...     async for file in crawler:
+    ...         print("/".join(file.folder_path), file.name, file.meta.version)
+
+With a `checkpoint`, progress is saved as the crawl goes: the folders listed so far and
+the files already handed out. After a crash, the same call picks up where it stopped,
+without listing those folders again or yielding those files twice. A file counts as
+handed out once the loop asks for the next one, so the one being processed when the
+crash came is yielded again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+from .errors import FigmaHTTPError
+from .helpers import _field
+
+__all__ = ["CrawledFile", "TeamCrawler"]
+
+# Bumped when the checkpoint layout changes; older checkpoints are then ignored.
+_FORMAT = 1
+
+
+class CrawledFile:
+    """One file found by a crawl.
+
+    `folder_path` holds the names of the folders it is in, outermost first. `meta` is
+    the ``file`` of its ``get_file_meta`` response, None with ``meta=False`` or when
+    that call failed -- then `error` says why.
+    """
+
+    __slots__ = ("key", "name", "folder_id", "folder_path", "last_modified", "meta", "error")
+
+    def __init__(self, key: str, name: str, folder_id: str, folder_path: tuple[str, ...],
+                 last_modified: str | None, meta: Any = None, error: Exception | None = None):
+        self.key = key
+        self.name = name
+        self.folder_id = folder_id
+        self.folder_path = folder_path
+        self.last_modified = last_modified
+        self.meta = meta
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f"<CrawledFile {self.key} {'/'.join((*self.folder_path, self.name))!r}>"
+
+
+class TeamCrawler:
+    """Every file in a team, found with `concurrency` requests in flight.
+
+    figma:       an :class:`~figmapy.AsyncFigma`.
+    meta:        also fetch ``get_file_meta`` for each file. False yields the files as
+                 listed, with one request per folder instead of one per file.
+    api:         ``"folders"`` walks the folder endpoints, subfolders included;
+                 ``"projects"`` uses the older, deprecated team projects endpoints.
+    concurrency: requests in flight at once.
+    checkpoint:  a JSON file to save progress to and resume from.
+    save_every:  seconds between checkpoint saves; it is also saved when the crawl ends
+                 or stops.
+
+    A folder that can not be listed, e.g. for lack of access, is skipped and its error
+    kept in `errors` by folder id; it is tried again on the next run. An error listing
+    the team itself is raised.
+    """
+
+    def __init__(
+        self,
+        figma: Any,
+        team_id: str,
+        *,
+        meta: bool = True,
+        api: str = "folders",
+        concurrency: int = 8,
+        checkpoint: str | os.PathLike | None = None,
+        save_every: float = 5.0,
+    ):
+        if api not in ("folders", "projects"):
+            raise ValueError(f"api must be 'folders' or 'projects', not {api!r}")
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self.figma = figma
+        self.team_id = team_id
+        self.meta = meta
+        self.api = api
+        self.concurrency = concurrency
+        self.checkpoint = Path(checkpoint) if checkpoint is not None else None
+        self.save_every = save_every
+        self.errors: dict[str, Exception] = {}
+        self._state = self._load()
+        self._done = set(self._state["done"])
+        self._saved_at = time.monotonic()
+
+    def __aiter__(self) -> AsyncIterator[CrawledFile]:
+        return self._crawl()
+
+    # -- the crawl ---------------------------------------------------------------
+
+    async def _crawl(self) -> AsyncIterator[CrawledFile]:
+        self.errors = {}
+        jobs: asyncio.Queue = asyncio.Queue()
+        # Bounded, so the crawl stays a few files ahead of the loop rather than racing off.
+        found: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        self._resume(jobs)
+        tasks = [asyncio.ensure_future(self._work(jobs, found)) for _ in range(self.concurrency)]
+        tasks.append(asyncio.ensure_future(self._finish(jobs, found)))
+        try:
+            while True:
+                item = await found.get()
+                if item is _FINISHED:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+                self._done.add(item.key)
+                self._maybe_save()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.save()
+
+    def _resume(self, jobs: asyncio.Queue) -> None:
+        """Start from the team's folders, listed now or read from the checkpoint."""
+        if self._state["roots"] is None:
+            jobs.put_nowait(("roots", None))
+        else:
+            for folder_id in self._state["roots"]:
+                jobs.put_nowait(("folder", folder_id))
+
+    async def _finish(self, jobs: asyncio.Queue, found: asyncio.Queue) -> None:
+        await jobs.join()
+        await found.put(_FINISHED)
+
+    async def _work(self, jobs: asyncio.Queue, found: asyncio.Queue) -> None:
+        while True:
+            kind, arg = await jobs.get()
+            try:
+                if kind == "roots":
+                    await self._list_roots(jobs)
+                elif kind == "folder":
+                    await self._list_folder(arg, jobs, found)
+                else:
+                    await found.put(await self._with_meta(arg))
+            except Exception as exc:  # the team could not be listed, or a bug: stop the crawl
+                await found.put(exc)
+            finally:
+                jobs.task_done()
+
+    async def _list_roots(self, jobs: asyncio.Queue) -> None:
+        if self.api == "folders":
+            folders = _field(await self.figma.get_team_folders(self.team_id), "folders")
+        else:
+            folders = _field(await self.figma.get_team_projects(self.team_id), "projects")
+        roots = []
+        for folder in folders or ():
+            folder_id = str(_field(folder, "id"))
+            self._state["names"][folder_id] = [_field(folder, "name")]
+            roots.append(folder_id)
+            jobs.put_nowait(("folder", folder_id))
+        self._state["roots"] = roots
+        self._maybe_save()
+
+    async def _list_folder(self, folder_id: str, jobs: asyncio.Queue, found: asyncio.Queue) -> None:
+        """Files (and, with the folders API, subfolders) of one folder, from the checkpoint if listed."""
+        folder = self._state["folders"].get(folder_id)
+        if folder is None:
+            try:
+                folder = await self._fetch_folder(folder_id)
+            except FigmaHTTPError as exc:
+                self.errors[folder_id] = exc
+                return
+            self._state["folders"][folder_id] = folder
+            self._maybe_save()
+        for child in folder["subfolders"]:
+            jobs.put_nowait(("folder", child))
+        path = tuple(self._state["names"].get(folder_id, ()))
+        for entry in folder["files"]:
+            if entry["key"] in self._done:
+                continue
+            file = CrawledFile(entry["key"], entry["name"], folder_id, path, entry["last_modified"])
+            if self.meta:
+                jobs.put_nowait(("meta", file))
+            else:
+                await found.put(file)
+
+    async def _fetch_folder(self, folder_id: str) -> dict[str, Any]:
+        subfolders: list[str] = []
+        if self.api == "folders":
+            children = await self.figma.get_folder_folders(folder_id)
+            parent = self._state["names"].get(folder_id, [])
+            for child in _field(children, "folders") or ():
+                child_id = str(_field(child, "id"))
+                self._state["names"][child_id] = [*parent, _field(child, "name")]
+                subfolders.append(child_id)
+            listing = await self.figma.get_folder_files(folder_id)
+        else:
+            listing = await self.figma.get_project_files(folder_id)
+        files = [
+            {"key": _field(f, "key"), "name": _field(f, "name"), "last_modified": _text(_field(f, "last_modified"))}
+            for f in _field(listing, "files") or ()
+        ]
+        return {"files": files, "subfolders": subfolders}
+
+    async def _with_meta(self, file: CrawledFile) -> CrawledFile:
+        try:
+            file.meta = _field(await self.figma.get_file_meta(file.key), "file")
+        except FigmaHTTPError as exc:
+            file.error = exc
+        return file
+
+    # -- checkpoints -------------------------------------------------------------
+
+    def _fresh(self) -> dict[str, Any]:
+        return {
+            "format": _FORMAT, "team_id": self.team_id, "api": self.api,
+            "roots": None, "names": {}, "folders": {}, "done": [],
+        }
+
+    def _load(self) -> dict[str, Any]:
+        if self.checkpoint is None or not self.checkpoint.exists():
+            return self._fresh()
+        state = json.loads(self.checkpoint.read_text())
+        if state.get("format") != _FORMAT:
+            return self._fresh()
+        if (state["team_id"], state["api"]) != (self.team_id, self.api):
+            raise ValueError(
+                f"{self.checkpoint} is a checkpoint for team {state['team_id']} ({state['api']}), "
+                f"not {self.team_id} ({self.api})"
+            )
+        return state
+
+    def save(self) -> None:
+        """Write the checkpoint now. A no-op without one."""
+        if self.checkpoint is None:
+            return
+        self._state["done"] = sorted(self._done)
+        tmp = self.checkpoint.with_name(self.checkpoint.name + ".tmp")
+        tmp.write_text(json.dumps(self._state, separators=(",", ":")))
+        os.replace(tmp, self.checkpoint)  # a crash mid-write leaves the last checkpoint whole
+        self._saved_at = time.monotonic()
+
+    def _maybe_save(self) -> None:
+        if self.checkpoint is not None and time.monotonic() - self._saved_at >= self.save_every:
+            self.save()
+
+
+_FINISHED = object()
+
+
+def _text(value: Any) -> str | None:
+    if value is None or isinstance(value, str):
+        return value
+    return value.isoformat()
@@ -0,0 +1,171 @@
+"""What changed in a file between two versions, node by node.
+
+    >>> old = figma.get_file(key, version="4129485417")
+    >>> new = figma.get_file(key)
+    >>> changes = diff_files(old, new)
+    >>> for change in changes:
+    ...     print(change.kind, change.id, list(change.fields))
+    changed 12:3 ['characters']
+    moved 40:1 []
+    added 51:7 []
+
+Nodes are matched by id. Both versions are hashed as in :mod:`figmapy.hashing` -- a
+digest of each node's own fields and a subtree digest over that and its children's
+(a Merkle tree) -- and the comparison runs top down: wherever two subtrees hash the
+same, everything below them is identical and is skipped without being looked at. Only
+the changed branches are compared field by field.
+
+Only the document tree is compared; ``components``, ``styles`` and the other top-level
+maps are not.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from .hashing import _document, _encode, _hash_tree, _id, _kids, _own_fields
+
+__all__ = ["FileDiff", "NodeChange", "diff_files"]
+
+
+class NodeChange:
+    """One node that is new, gone, moved to another parent, or has different fields.
+
+    `old` and `new` are the node in each version (None when added or removed),
+    `fields` maps each changed field to ``(old value, new value)``, and `old_parent` /
+    `new_parent` are parent ids. A moved node can have changed fields as well. A
+    parent whose children were only reordered reports ``children`` as a changed
+    field, with the ids in each order.
+    """
+
+    __slots__ = ("id", "old", "new", "fields", "old_parent", "new_parent")
+
+    def __init__(self, id: str, old: Any, new: Any, fields: dict[str, tuple[Any, Any]],
+                 old_parent: str | None, new_parent: str | None):
+        self.id = id
+        self.old = old
+        self.new = new
+        self.fields = fields
+        self.old_parent = old_parent
+        self.new_parent = new_parent
+
+    @property
+    def moved(self) -> bool:
+        return self.old is not None and self.new is not None and self.old_parent != self.new_parent
+
+    @property
+    def kind(self) -> str:
+        """``"added"``, ``"removed"``, ``"moved"`` or ``"changed"``."""
+        if self.old is None:
+            return "added"
+        if self.new is None:
+            return "removed"
+        return "moved" if self.moved else "changed"
+
+    def __repr__(self) -> str:
+        fields = f" {sorted(self.fields)}" if self.fields else ""
+        return f"<NodeChange {self.kind} {self.id}{fields}>"
+
+
+class FileDiff:
+    """The changes between two versions of a document, parents before children."""
+
+    def __init__(self, changes: list[NodeChange]):
+        self.changes = changes
+
+    def __iter__(self) -> Iterator[NodeChange]:
+        return iter(self.changes)
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def __repr__(self) -> str:
+        counts = ", ".join(f"{len(getattr(self, kind))} {kind}" for kind in ("added", "removed", "moved", "changed"))
+        return f"<FileDiff {counts}>"
+
+    @property
+    def added(self) -> list[NodeChange]:
+        return [change for change in self.changes if change.old is None]
+
+    @property
+    def removed(self) -> list[NodeChange]:
+        return [change for change in self.changes if change.new is None]
+
+    @property
+    def moved(self) -> list[NodeChange]:
+        return [change for change in self.changes if change.moved]
+
+    @property
+    def changed(self) -> list[NodeChange]:
+        """Nodes in both versions whose own fields differ, moved or not."""
+        return [change for change in self.changes if change.fields]
+
+
+def diff_files(old: Any, new: Any, *, ignore: Iterable[str] = ()) -> FileDiff:
+    """Compare two versions of a file (or document, or any node) by node id.
+
+    Accepts ``get_file`` results parsed as models or as plain dicts (``parse=False``),
+    as long as both sides are the same kind. Fields named in `ignore` -- e.g.
+    ``"absoluteRenderBounds"`` -- are left out of the comparison everywhere.
+
+    >>> diff = diff_files(old, new, ignore={"exportSettings"})
+    >>> [change.id for change in diff.removed]
+    """
+    ignore = frozenset(ignore) | {"children"}
+    old_root, new_root = _document(old), _document(new)
+    old_tree = _hash_tree(old_root, ignore)
+    new_tree = _hash_tree(new_root, ignore)
+    changes: list[NodeChange] = []
+    paired: set[str] = set()
+
+    # Top down with a work stack of (what, node id). "pair" is a node in both versions,
+    # "added" / "removed" one in just the new / old one.
+    root_id = _id(new_root)
+    if root_id in old_tree:
+        work = [("pair", root_id)]
+    else:
+        work = [("removed", _id(old_root)), ("added", root_id)]
+    while work:
+        what, node_id = work.pop()
+        below: list[tuple[str, str]] = []
+        if what == "added":
+            entry = new_tree[node_id]
+            changes.append(NodeChange(node_id, None, entry.node, {}, None, entry.parent))
+            below = [("pair" if i in old_tree else "added", i) for i in map(_id, _kids(entry.node))]
+        elif what == "removed":
+            entry = old_tree[node_id]
+            changes.append(NodeChange(node_id, entry.node, None, {}, entry.parent, None))
+            below = [("pair" if i in new_tree else "removed", i) for i in map(_id, _kids(entry.node))]
+        elif node_id not in paired:
+            paired.add(node_id)
+            before, after = old_tree[node_id], new_tree[node_id]
+            if before.subtree == after.subtree and before.parent == after.parent:
+                continue  # nothing below here changed either
+            fields = {} if before.own == after.own else _changed_fields(before.node, after.node, ignore)
+            old_ids = [_id(child) for child in _kids(before.node)]
+            new_ids = [_id(child) for child in _kids(after.node)]
+            kept_old = [i for i in old_ids if i in new_tree and new_tree[i].parent == node_id]
+            kept_new = [i for i in new_ids if i in old_tree and old_tree[i].parent == node_id]
+            if kept_old != kept_new:
+                fields["children"] = (old_ids, new_ids)
+            if fields or before.parent != after.parent:
+                changes.append(NodeChange(node_id, before.node, after.node, fields, before.parent, after.parent))
+            if before.subtree != after.subtree:
+                below = [("pair" if i in old_tree else "added", i) for i in new_ids]
+                below += [("removed", i) for i in old_ids if i not in new_tree]
+                below += [("pair", i) for i in old_ids if i in new_tree and new_tree[i].parent != node_id]
+        work.extend(reversed(below))
+    return FileDiff(changes)
+
+
+def _changed_fields(old: Any, new: Any, ignore: frozenset[str]) -> dict[str, tuple[Any, Any]]:
+    before, after = _own_fields(old, ignore), _own_fields(new, ignore)
+    return {
+        key: (before.get(key), after.get(key))
+        for key in before.keys() | after.keys()
+        if _encode(before.get(key)) != _encode(after.get(key))
+    }
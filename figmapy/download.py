@@ -0,0 +1,329 @@
+"""Download rendered images and image fills to disk, many at a time.
+
+``get_images`` and ``get_image_fills`` return URLs, not images, and the URLs expire.
+:func:`download_images` fetches them over a bounded pool of connections, writes each
+body to disk as it arrives -- never holding a whole image in memory -- and retries the
+failures that are worth retrying::
+
+    >>> renders = figma.get_images(key, ids=ids, format="svg")
+    >>> report = download_images(renders, "out/", progress=lambda done, total: print(done, total))
+    >>> report.paths["1:2"]
+    PosixPath('out/1-2.svg')
+
+:func:`adownload_images` is the same for asyncio code. No Figma token is sent: the
+URLs are pre-signed, and point somewhere other than the API.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from .client import RETRY_STATUSES, backoff_delay
+
+__all__ = ["DownloadReport", "adownload_images", "download_images"]
+
+#: File suffixes for the content types Figma renders and stores.
+SUFFIXES = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+    "image/svg+xml": ".svg",
+    "application/pdf": ".pdf",
+}
+
+_CHUNK_SIZE = 64 * 1024
+_UNSAFE = re.compile(r"[^\w.-]+")
+
+
+class DownloadReport:
+    """What :func:`download_images` did with each key of the `images` map.
+
+    `paths` maps every key that was downloaded to its file, in the order of `images`.
+    `failed` maps keys whose download kept failing to the last error, and `missing`
+    lists keys whose URL was None -- nodes Figma could not render. `cached` lists keys
+    an :class:`~figmapy.AssetStore` already held, which were not downloaded again.
+    """
+
+    def __init__(self) -> None:
+        self.paths: dict[str, Path] = {}
+        self.failed: dict[str, Exception] = {}
+        self.missing: list[str] = []
+        self.cached: list[str] = []
+        self.bytes = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"<DownloadReport {len(self.paths)} downloaded, {len(self.failed)} failed, "
+            f"{len(self.missing)} missing, {self.bytes} bytes>"
+        )
+
+    def _sort(self, order: list[str]) -> None:
+        # Downloads finish in any order; report them in the order they were asked for.
+        self.paths = {key: self.paths[key] for key in order if key in self.paths}
+        self.failed = {key: self.failed[key] for key in order if key in self.failed}
+
+
+def download_images(
+    images: Any,
+    out_dir: str | os.PathLike,
+    *,
+    names: Mapping[str, str] | None = None,
+    concurrency: int = 8,
+    max_retries: int = 3,
+    timeout: float = 60.0,
+    progress: Callable[[int, int], None] | None = None,
+    http_client: httpx.Client | None = None,
+) -> DownloadReport:
+    """Download every URL in `images` into `out_dir`, `concurrency` at a time.
+
+    images:      a ``get_images`` or ``get_image_fills`` response (model or dict), or a
+                 plain ``{key: url}`` map. Keys are node ids or image refs.
+    names:       file names by key, without suffix. Defaults to the key, with ``:``
+                 and anything else unsafe in a file name replaced. Keys that would share
+                 a file get ``-2``, ``-3``, ... added, in the order of `images`.
+    concurrency: downloads, and connections, open at once.
+    max_retries: retries for connection errors, 429 and 5xx. An expired URL (403) is
+                 not retried.
+    progress:    called as ``progress(done, total)`` each time a download finishes,
+                 from the calling thread.
+    http_client: an ``httpx.Client`` to download with, instead of one sized to
+                 `concurrency`.
+
+    The suffix comes from the response's content type. Bodies are written to a
+    ``.part`` file and renamed once complete, so a file that exists is whole.
+    """
+    urls, report, out = _prepare(images, out_dir, concurrency)
+    if not urls:
+        return report
+    client = http_client or httpx.Client(
+        timeout=timeout, follow_redirects=True, limits=_limits(concurrency)
+    )
+    lock = threading.Lock()
+    targets = _targets(out, urls, names)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [
+                pool.submit(_download, client, key, url, targets[key], max_retries, report, lock)
+                for key, url in urls.items()
+            ]
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()  # only errors beyond one download's, e.g. a full disk
+                if progress is not None:
+                    progress(done, len(futures))
+    finally:
+        if http_client is None:
+            client.close()
+    report._sort(list(urls))
+    return report
+
+
+async def adownload_images(
+    images: Any,
+    out_dir: str | os.PathLike,
+    *,
+    names: Mapping[str, str] | None = None,
+    concurrency: int = 8,
+    max_retries: int = 3,
+    timeout: float = 60.0,
+    progress: Callable[[int, int], None] | None = None,
+    http_client: httpx.AsyncClient | None = None,
+) -> DownloadReport:
+    """:func:`download_images` for asyncio code, with an ``httpx.AsyncClient``."""
+    urls, report, out = _prepare(images, out_dir, concurrency)
+    if not urls:
+        return report
+    client = http_client or httpx.AsyncClient(
+        timeout=timeout, follow_redirects=True, limits=_limits(concurrency)
+    )
+    slots = asyncio.Semaphore(concurrency)
+    targets = _targets(out, urls, names)
+    done = 0
+
+    async def one(key: str, url: str) -> None:
+        nonlocal done
+        async with slots:
+            await _adownload(client, key, url, targets[key], max_retries, report)
+        done += 1
+        if progress is not None:
+            progress(done, len(urls))
+
+    try:
+        await asyncio.gather(*(one(key, url) for key, url in urls.items()))
+    finally:
+        if http_client is None:
+            await client.aclose()
+    report._sort(list(urls))
+    return report
+
+
+def _prepare(
+    images: Any, out_dir: str | os.PathLike, concurrency: int
+) -> tuple[dict[str, str], DownloadReport, Path]:
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+    report = DownloadReport()
+    urls: dict[str, str] = {}
+    for key, url in _url_map(images).items():
+        if url:
+            urls[key] = url
+        else:
+            report.missing.append(key)
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    return urls, report, out
+
+
+def _url_map(images: Any) -> Mapping[str, str | None]:
+    """The ``{key: url}`` map in a get_images / get_image_fills response, or `images` itself."""
+    if isinstance(images, Mapping):
+        if isinstance(images.get("meta"), Mapping):
+            return images["meta"].get("images") or {}
+        if isinstance(images.get("images"), Mapping):
+            return images["images"]
+        return images
+    meta = getattr(images, "meta", None)
+    if meta is not None:
+        return meta.images
+    return images.images
+
+
+def _limits(concurrency: int) -> httpx.Limits:
+    return httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+
+def _targets(out: Path, keys: Iterable[str], names: Mapping[str, str] | None) -> dict[str, Path]:
+    """A file stem per key, none shared, so no two downloads write the same file at once.
+
+    Names are compared case-insensitively, for file systems that do.
+    """
+    targets: dict[str, Path] = {}
+    taken: set[str] = set()
+    for key in keys:
+        name = names.get(key) if names else None
+        stem = _UNSAFE.sub("_", name if name else key.replace(":", "-")).strip("_") or "unnamed"
+        unique, n = stem, 1
+        while unique.casefold() in taken:
+            n += 1
+            unique = f"{stem}-{n}"
+        taken.add(unique.casefold())
+        targets[key] = out / unique
+    return targets
+
+
+def _suffix(response: httpx.Response) -> str:
+    return SUFFIXES.get(response.headers.get("content-type", "").split(";")[0].strip().lower(), "")
+
+
+def _retryable(error: Exception | None, response: httpx.Response | None, attempt: int, max_retries: int) -> bool:
+    if attempt >= max_retries:
+        return False
+    if response is not None:
+        return response.status_code in RETRY_STATUSES
+    return isinstance(error, httpx.TransportError)
+
+
+def _download(
+    client: httpx.Client, key: str, url: str, stem: Path, max_retries: int,
+    report: DownloadReport, lock: threading.Lock,
+) -> None:
+    attempt = 0
+    while True:
+        response = error = None
+        try:
+            with client.stream("GET", url) as response:
+                if response.status_code == 200:
+                    path = stem.with_name(stem.name + _suffix(response))
+                    size = _write(path, response.iter_bytes(_CHUNK_SIZE))
+                    with lock:
+                        report.paths[key] = path
+                        report.bytes += size
+                    return
+        except httpx.TransportError as exc:
+            response, error = None, exc
+        if not _retryable(error, response, attempt, max_retries):
+            with lock:
+                report.failed[key] = error or _status_error(response)
+            return
+        time.sleep(backoff_delay(response, attempt))
+        attempt += 1
+
+
+async def _adownload(
+    client: httpx.AsyncClient, key: str, url: str, stem: Path, max_retries: int, report: DownloadReport
+) -> None:
+    attempt = 0
+    while True:
+        response = error = None
+        try:
+            async with client.stream("GET", url) as response:
+                if response.status_code == 200:
+                    path = stem.with_name(stem.name + _suffix(response))
+                    size = await _awrite(path, response.aiter_bytes(_CHUNK_SIZE))
+                    report.paths[key] = path
+                    report.bytes += size
+                    return
+        except httpx.TransportError as exc:
+            response, error = None, exc
+        if not _retryable(error, response, attempt, max_retries):
+            report.failed[key] = error or _status_error(response)
+            return
+        await asyncio.sleep(backoff_delay(response, attempt))
+        attempt += 1
+
+
+def _write(path: Path, chunks: Any) -> int:
+    """Stream `chunks` into `path` by way of a ``.part`` file; the number of bytes written."""
+    part = path.with_name(path.name + ".part")
+    size = 0
+    try:
+        with open(part, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+        os.replace(part, path)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    return size
+
+
+async def _awrite(path: Path, chunks: Any) -> int:
+    """:func:`_write` for an async iterator of chunks.
+
+    The file system calls run in a worker thread, so a slow disk does not hold up the
+    event loop and the other downloads on it.
+    """
+    part = path.with_name(path.name + ".part")
+    size = 0
+    try:
+        f = await asyncio.to_thread(open, part, "wb")
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(f.write, chunk)
+                size += len(chunk)
+        finally:
+            await asyncio.to_thread(f.close)
+        await asyncio.to_thread(os.replace, part, path)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    return size
+
+
+def _status_error(response: httpx.Response | None) -> Exception:
+    assert response is not None
+    return httpx.HTTPStatusError(
+        f"{response.status_code} {response.reason_phrase} ({response.url})",
+        request=response.request, response=response,
+    )
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import sys
 from typing import Any
 
 
@@ -49,6 +50,20 @@ class FigmaSpecWarning(UserWarning):
     """
 
 
+class FigmaPartialResultWarning(UserWarning):
+    """Some ids of a ``get_images`` / ``get_file_nodes`` call split into chunks failed.
+
+    Those ids are in the result as None, which Figma also sends for a node it could not
+    find or render. `failed` maps each one to the :class:`FigmaHTTPError` its own request
+    got, to tell the two apart. To fail the call instead, turn the warning into an
+    exception: ``warnings.simplefilter("error", FigmaPartialResultWarning)``.
+    """
+
+    def __init__(self, message: str, failed: dict[str, FigmaHTTPError]):
+        super().__init__(message)
+        self.failed = failed
+
+
 class FigmaValidationError(FigmaError):
     """A response did not match the bundled spec, and the client is in strict mode."""
 
@@ -67,3 +82,17 @@ def error_for_status(status_code: int) -> type:
     if status_code >= 500:
         return FigmaServerError
     return FigmaHTTPError
+
+
+def user_stacklevel() -> int:
+    """The ``stacklevel`` for a warning issued by the caller: the first frame outside figmapy.
+
+    A fixed number is wrong for some of the ways into the same warning (file cache, id
+    chunks, lazy reads), so the stack is walked instead.
+    """
+    frame = sys._getframe(1)
+    level = 1
+    while frame is not None and frame.f_globals.get("__name__", "").partition(".")[0] == "figmapy":
+        frame = frame.f_back
+        level += 1
+    return level
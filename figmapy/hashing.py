@@ -0,0 +1,262 @@
+"""Content hashes for every node, to tell which subtrees changed between two syncs.
+
+A file's ``version`` says that something changed, not what. :func:`hash_nodes` gives
+each node a digest of its own fields and a subtree digest over that and its children's
+subtree digests -- a Merkle tree -- so a frame's digest changes exactly when something
+inside it does. Saved after one sync and loaded at the next, they say what to redo::
+
+    >>> hashes = hash_nodes(file)
+    >>> previous = NodeHashes.load("hashes.json.gz")       # from the last run
+    >>> for page in pages(file):
+    ...     for frame in page.children:
+    ...         if hashes.changed_since(previous, frame.id):
+    ...             export(frame)
+    >>> hashes.save("hashes.json.gz")
+
+Digests are stable across processes and machines: fields are encoded as sorted,
+compact JSON (with orjson when installed, and byte for byte the same without), hashed
+with BLAKE2b. Fields that change without the design changing -- plugin data, dev
+status -- are left out by default (:data:`VOLATILE_FIELDS`).
+"""
+
+from __future__ import annotations
+
+import datetime
+import enum
+import gzip
+import hashlib
+import json
+import os
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+from pydantic import BaseModel
+
+from ._decode import orjson
+from .helpers import _children
+
+__all__ = ["VOLATILE_FIELDS", "NodeHashes", "hash_nodes"]
+
+#: Left out of hashes unless `ignore` says otherwise: fields that change without the
+#: design changing. ``children`` is never part of a node's own digest.
+VOLATILE_FIELDS = frozenset({"pluginData", "sharedPluginData", "devStatus"})
+
+# Bumped whenever the digests would come out different for the same tree, so stale
+# saved hashes compare as changed rather than as wrong.
+_FORMAT = 1
+
+
+class _Entry:
+    __slots__ = ("node", "parent", "own", "subtree")
+
+    def __init__(self, node: Any, parent: str | None, own: bytes, subtree: bytes):
+        self.node = node
+        self.parent = parent
+        self.own = own
+        self.subtree = subtree
+
+
+class NodeHashes(Mapping):
+    """Subtree digests by node id, in document order; ``hashes[id]`` is a hex string.
+
+    Built by :func:`hash_nodes`, or read back with :meth:`load`. Comparing against a
+    `previous` set computed with different `ignore` fields, or by an older figmapy
+    whose digests differ, treats every node as changed: at worst, everything is redone.
+    """
+
+    def __init__(self, entries: dict[str, _Entry], ignore: frozenset[str], format: int = _FORMAT):
+        self._entries = entries
+        self.ignore = ignore
+        self._format = format
+
+    def __getitem__(self, node_id: str) -> str:
+        return self._entries[node_id].subtree.hex()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"<NodeHashes {len(self)} nodes>"
+
+    def own(self, node_id: str) -> str:
+        """The digest of the node's own fields, without its children."""
+        return self._entries[node_id].own.hex()
+
+    def parent(self, node_id: str) -> str | None:
+        return self._entries[node_id].parent
+
+    def compatible(self, other: NodeHashes) -> bool:
+        """Whether digests in `other` can be compared with these."""
+        return self._format == other._format and self.ignore == other.ignore
+
+    def changed_since(self, previous: NodeHashes, node_id: str) -> bool:
+        """Whether the node, or anything below it, is new or different since `previous`."""
+        if not self.compatible(previous):
+            return True
+        before = previous._entries.get(node_id)
+        return before is None or before.subtree != self._entries[node_id].subtree
+
+    def changed(self, previous: NodeHashes) -> list[str]:
+        """Ids of every node that is new or has a different subtree digest than in `previous`.
+
+        Includes the ancestors of each change, whose subtrees changed with it. Nodes
+        only in `previous` are in ``previous.keys() - hashes.keys()``.
+        """
+        if not self.compatible(previous):
+            return list(self._entries)
+        before = previous._entries
+        return [
+            node_id for node_id, entry in self._entries.items()
+            if node_id not in before or before[node_id].subtree != entry.subtree
+        ]
+
+    def to_bytes(self) -> bytes:
+        return json.dumps({
+            "format": self._format,
+            "ignore": sorted(self.ignore),
+            "nodes": {
+                node_id: [entry.parent, entry.own.hex(), entry.subtree.hex()]
+                for node_id, entry in self._entries.items()
+            },
+        }, separators=(",", ":")).encode()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> NodeHashes:
+        raw = json.loads(data)
+        entries = {
+            node_id: _Entry(None, parent, bytes.fromhex(own), bytes.fromhex(subtree))
+            for node_id, (parent, own, subtree) in raw["nodes"].items()
+        }
+        return cls(entries, frozenset(raw["ignore"]), raw["format"])
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Write to `path` as JSON, gzip-compressed if it ends in ``.gz``."""
+        path = os.fspath(path)
+        data = self.to_bytes()
+        with (gzip.open(path, "wb") if path.endswith(".gz") else open(path, "wb")) as f:
+            f.write(data)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> NodeHashes:
+        """Read what :meth:`save` wrote."""
+        path = os.fspath(path)
+        with (gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")) as f:
+            return cls.from_bytes(f.read())
+
+
+def hash_nodes(root: Any, *, ignore: Iterable[str] = VOLATILE_FIELDS) -> NodeHashes:
+    """Digest every node under and including `root` (a file, document or any node).
+
+    Works on models and on ``parse=False`` dicts, though the two give different
+    digests for the same file (models include unset fields as None). Pass `ignore`
+    to leave out other fields; ``ignore=()`` hashes everything.
+
+    >>> hashes = hash_nodes(file)
+    >>> hashes["1:2"]
+    '5f0c3e...'
+    """
+    ignore = frozenset(ignore)
+    return NodeHashes(_hash_tree(_document(root), ignore | {"children"}), ignore)
+
+
+def _hash_tree(root: Any, ignore: frozenset[str]) -> dict[str, _Entry]:
+    tree: dict[str, _Entry] = {}
+    # Post-order without recursion: a node is finished once all its children are.
+    # Entries are inserted children first, so the result is re-ordered at the end.
+    order: list[str] = []
+    stack: list[tuple[Any, str | None, bool]] = [(root, None, False)]
+    while stack:
+        node, parent, expanded = stack.pop()
+        node_id = _id(node)
+        children = _kids(node)
+        if not expanded:
+            order.append(node_id)
+            stack.append((node, parent, True))
+            stack.extend((child, node_id, False) for child in reversed(children))
+            continue
+        own = _digest(_encode(_own_fields(node, ignore)))
+        subtree = hashlib.blake2b(own, digest_size=16)
+        for child in children:
+            subtree.update(tree[_id(child)].subtree)
+        tree[node_id] = _Entry(node, parent, own, subtree.digest())
+    return {node_id: tree[node_id] for node_id in order}
+
+
+def _own_fields(node: Any, ignore: frozenset[str]) -> dict[str, Any]:
+    if isinstance(node, BaseModel):
+        fields = node.__dict__
+        if node.__pydantic_extra__:
+            fields = {**fields, **node.__pydantic_extra__}
+    else:
+        fields = node
+    # Copying and dropping a few keys beats filtering ~80 of them; leaves (no
+    # `children`, nothing ignored) need no copy at all.
+    if ignore.isdisjoint(fields):
+        return fields
+    fields = dict(fields)
+    for key in ignore:
+        fields.pop(key, None)
+    return fields
+
+
+def _kids(node: Any) -> Any:
+    if isinstance(node, dict):
+        return node.get("children") or ()
+    return _children(node)
+
+
+def _id(node: Any) -> str:
+    return node["id"] if isinstance(node, dict) else node.id
+
+
+def _document(value: Any) -> Any:
+    if isinstance(value, dict):
+        return value.get("document", value)
+    return getattr(value, "document", value)
+
+
+def _default(value: Any) -> Any:
+    # Nested models as their fields, as they are stored; the rest as in JSON.
+    if isinstance(value, BaseModel):
+        if value.__pydantic_extra__:
+            return {**value.__dict__, **value.__pydantic_extra__}
+        return value.__dict__
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise TypeError(f"Can not hash {type(value).__name__}")
+
+
+def _encode_json(value: Any) -> bytes:
+    text = json.dumps(value, default=_default, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    if "e" in text:
+        text = _EXPONENT.sub(_orjson_exponent, text)
+    return text.encode()
+
+
+def _encode_orjson(value: Any) -> bytes:
+    return orjson.dumps(value, default=_default, option=orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+# Outside strings, json writes 1e-07 and 1e+16 where orjson writes 1e-7 and 1e16.
+_EXPONENT = re.compile(r'"(?:[^"\\]|\\.)*"|(?<=\d)e(\+|-)?0*(?=\d)')
+
+
+def _orjson_exponent(match: re.Match) -> str:
+    if match.group(0).startswith('"'):
+        return match.group(0)
+    return "e-" if match.group(1) == "-" else "e"
+
+
+# orjson when available. The two produce the same bytes, so digests do not depend on
+# which one is installed.
+_encode = _encode_orjson if orjson is not None else _encode_json
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
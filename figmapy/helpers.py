@@ -6,8 +6,12 @@ spec sync, so anything attached to them would be overwritten. Functions survive.
 
 from __future__ import annotations
 
+import asyncio
+import inspect
 import re
-from collections.abc import Callable, Iterable, Iterator
+import string
+import typing
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
 from typing import Any
 
 __all__ = [
@@ -16,10 +20,12 @@ __all__ = [
     "walk",
     "find",
     "find_all",
+    "NodeIndex",
     "pages",
     "page",
     "image_urls",
     "iter_pages",
+    "aiter_pages",
 ]
 
 _FILE_KEY = re.compile(r"figma\.com/(?:file|design|board|proto|slides)/([0-9A-Za-z]+)")
@@ -52,25 +58,207 @@ def node_id_from_url(url: str) -> str | None:
     return match.group(1).replace("-", ":", 1)
 
 
-def _children(node: Any) -> Iterable[Any]:
-    return getattr(node, "children", None) or ()
+# Per class: whether ``children`` is a declared field, or the class is not a model at all.
+_DECLARES_CHILDREN: dict[type, bool] = {}
 
 
-def walk(node: Any, *, include_self: bool = False) -> Iterator[Any]:
+def _children(node: Any) -> Iterable[Any]:
+    cls = type(node)
+    declared = _DECLARES_CHILDREN.get(cls)
+    if declared is None:
+        fields = getattr(cls, "model_fields", None)
+        declared = _DECLARES_CHILDREN[cls] = fields is None or "children" in fields
+    if declared:
+        return getattr(node, "children", None) or ()
+    # A leaf model: asking it for `children` goes through pydantic's __getattr__ and
+    # raises AttributeError, which is most of the cost of a walk. Extras are the only
+    # place it could be.
+    extra = node.__pydantic_extra__
+    return (extra.get("children") if extra else None) or ()
+
+
+def walk(
+    node: Any,
+    *,
+    include_self: bool = False,
+    max_depth: int | None = None,
+    prune: Callable[[Any], bool] | None = None,
+    order: str = "depth",
+) -> Iterator[Any]:
     """Yield every descendant of a node, depth first.
 
     Works on a document, a page, or any container node. Also accepts the object
     returned by ``get_file`` (walks its ``document``).
 
+    `max_depth` stops the walk that many levels down: 1 is the node's children only.
+    `prune` skips a node together with everything below it when it returns True.
+    ``order="breadth"`` yields a level at a time instead of depth first.
+
     >>> for node in walk(file.document):
     ...     print(node.name)
+    >>> walk(file, max_depth=1)                                  # the pages
+    >>> walk(file, prune=lambda n: n.visible is False)           # skip hidden layers
+    >>> walk(file, prune=lambda n: n.type == "INSTANCE")         # and instances
+
+    The walk keeps its own stack rather than recursing, so any depth of nesting works.
     """
+    if order not in ("depth", "breadth"):
+        raise ValueError(f'order must be "depth" or "breadth", not {order!r}')
+    if max_depth is not None and max_depth < 0:
+        raise ValueError(f"max_depth must be 0 or more, not {max_depth}")
     node = getattr(node, "document", node)
+    walker = _breadth_first if order == "breadth" else _depth_first
+    return walker(node, include_self, max_depth, prune)
+
+
+def _depth_first(
+    root: Any, include_self: bool, max_depth: int | None, prune: Callable[[Any], bool] | None
+) -> Iterator[Any]:
     if include_self:
-        yield node
-    for child in _children(node):
-        yield child
-        yield from walk(child)
+        if prune is not None and prune(root):
+            return
+        yield root
+    if max_depth == 0:
+        return
+    # One iterator per open level: the stack's length is the depth of its children.
+    stack = [iter(_children(root))]
+    while stack:
+        for child in stack[-1]:
+            if prune is not None and prune(child):
+                continue
+            yield child
+            children = _children(child)
+            if children and (max_depth is None or len(stack) < max_depth):
+                stack.append(iter(children))
+                break
+        else:
+            stack.pop()
+
+
+def _breadth_first(
+    root: Any, include_self: bool, max_depth: int | None, prune: Callable[[Any], bool] | None
+) -> Iterator[Any]:
+    if include_self:
+        if prune is not None and prune(root):
+            return
+        yield root
+    level = [root]
+    depth = 0
+    while level and (max_depth is None or depth < max_depth):
+        depth += 1
+        below = []
+        for parent in level:
+            for child in _children(parent):
+                if prune is not None and prune(child):
+                    continue
+                yield child
+                below.append(child)
+        level = below
+
+
+class NodeIndex:
+    """Every node under a root, indexed by id, name and type in a single walk.
+
+    ``find`` and ``find_all`` walk the whole tree on every call, which is fine once and
+    slow in a loop. Build an index once instead and look things up in it, or pass it
+    to ``find`` / ``find_all`` in place of the root:
+
+    >>> index = NodeIndex(file)
+    >>> index.by_id["1:2"]
+    >>> index.by_type["COMPONENT"]                 # lists, in document order
+    >>> index.parent(index.by_id["1:2"])
+    >>> find_all(index, type="TEXT", where=lambda n: not n.visible)
+
+    Like :func:`walk`, it covers the descendants of the root, not the root itself. It
+    is a snapshot: build a new one after changing the tree.
+    """
+
+    def __init__(self, root: Any):
+        self.root = getattr(root, "document", root)
+        #: Every node, in document order (the order :func:`walk` yields them).
+        self.nodes: list[Any] = []
+        self.by_id: dict[str, Any] = {}
+        self.by_name: dict[str, list[Any]] = {}
+        self.by_type: dict[str, list[Any]] = {}
+        self._parents: dict[str, Any] = {}
+
+        stack = [(self.root, child) for child in reversed(list(_children(self.root)))]
+        while stack:
+            parent, node = stack.pop()
+            self.nodes.append(node)
+            node_id = getattr(node, "id", None)
+            if node_id is not None:
+                self.by_id[node_id] = node
+                self._parents[node_id] = parent
+            self.by_name.setdefault(getattr(node, "name", None), []).append(node)
+            self.by_type.setdefault(getattr(node, "type", None), []).append(node)
+            stack.extend((node, child) for child in reversed(list(_children(node))))
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.nodes)
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self.by_id
+
+    def get(self, node_id: str) -> Any | None:
+        return self.by_id.get(node_id)
+
+    def parent(self, node: Any) -> Any | None:
+        """The node's parent, or None for the root and for nodes not in the index.
+
+        Takes a node or a node id.
+        """
+        return self._parents.get(node if isinstance(node, str) else getattr(node, "id", None))
+
+    def ancestors(self, node: Any) -> Iterator[Any]:
+        """The node's parent, its parent, and so on up to the root."""
+        parent = self.parent(node)
+        while parent is not None:
+            yield parent
+            parent = self.parent(parent)
+
+    def find_all(
+        self,
+        *,
+        name: str | None = None,
+        type: str | None = None,
+        where: Callable[[Any], bool] | None = None,
+    ) -> list:
+        """Same as :func:`find_all`, answered from the index."""
+        return list(self._matching(name, type, where))
+
+    def find(
+        self,
+        *,
+        name: str | None = None,
+        type: str | None = None,
+        where: Callable[[Any], bool] | None = None,
+    ) -> Any | None:
+        """Same as :func:`find`, answered from the index."""
+        return next(self._matching(name, type, where), None)
+
+    def _matching(
+        self, name: str | None, type: str | None, where: Callable[[Any], bool] | None
+    ) -> Iterator[Any]:
+        # Start from the narrowest list the filters allow, then check the rest.
+        candidates = self.nodes
+        if name is not None:
+            candidates = self.by_name.get(name, [])
+        if type is not None:
+            by_type = self.by_type.get(type, [])
+            if len(by_type) < len(candidates):
+                candidates = by_type
+        for node in candidates:
+            if name is not None and getattr(node, "name", None) != name:
+                continue
+            if type is not None and getattr(node, "type", None) != type:
+                continue
+            if where is not None and not where(node):
+                continue
+            yield node
 
 
 def _matching(
@@ -79,6 +267,9 @@ def _matching(
     type: str | None,
     where: Callable[[Any], bool] | None,
 ) -> Iterator[Any]:
+    if isinstance(root, NodeIndex):
+        yield from root._matching(name, type, where)
+        return
     for node in walk(root):
         if name is not None and getattr(node, "name", None) != name:
             continue
@@ -98,6 +289,8 @@ def find_all(
 ) -> list:
     """Every descendant of `root` matching all the given filters.
 
+    `root` may be a :class:`NodeIndex`, which answers without walking the tree again.
+
     >>> find_all(file.document, type="TEXT")
     >>> find_all(file.document, name="Icon/Close")
     >>> find_all(file.document, where=lambda n: n.name.startswith("btn_"))
@@ -132,8 +325,9 @@ def page(file: Any, name: str) -> Any | None:
 def image_urls(client: Any, file_key: str, nodes: Iterable[Any], **kwargs: Any) -> Any:
     """Render a batch of nodes and get back {node_id: url}.
 
-    One request for the whole batch, which is what you want -- rendering nodes one at a
-    time is the fastest way to get rate limited.
+    One call for the whole batch, which is what you want -- rendering nodes one at a
+    time is the fastest way to get rate limited. The client splits batches too large
+    for one request (see `id_chunk_size`).
 
     >>> image_urls(figma, key, find_all(file.document, type="COMPONENT"), format="svg")
     """
@@ -145,18 +339,150 @@ def image_urls(client: Any, file_key: str, nodes: Iterable[Any], **kwargs: Any)
 
 
 def iter_pages(method: Callable[..., Any], **kwargs: Any) -> Iterator[Any]:
-    """Follow the `cursor` / `next_page` pagination used by the analytics and
-    activity-log endpoints, yielding one response per page.
+    """Follow the `cursor` pagination used by the analytics, AI usage and log endpoints,
+    yielding one response per page. Where the spec lists no `cursor` parameter for a
+    paginated endpoint, as for ``get_activity_logs``, the next pages are requested on
+    the same path with the cursor added.
 
     >>> for page in iter_pages(figma.get_library_analytics_component_actions,
     ...                        file_key=key, group_by="component"):
     ...     print(len(page.rows))
     """
+    fetch = method
     while True:
-        response = method(**kwargs)
+        response = fetch(**kwargs)
         yield response
-        as_dict = response if isinstance(response, dict) else response.model_dump()
-        cursor = as_dict.get("cursor")
-        if not as_dict.get("next_page") or not cursor:
+        cursor = _next_cursor(response, method)
+        if cursor is None:
             return
         kwargs["cursor"] = cursor
+        fetch = _cursor_fetcher(method)
+
+
+async def aiter_pages(method: Callable[..., Any], *, lookahead: int = 1, **kwargs: Any) -> AsyncIterator[Any]:
+    """:func:`iter_pages` for :class:`~figmapy.AsyncFigma` methods, fetching ahead.
+
+    Each page's cursor is only known once it has arrived, so pages are still requested
+    one after another -- but in the background, up to `lookahead` pages ahead of the
+    one being processed. ``lookahead=0`` requests the next page only when asked for it.
+
+    >>> async for page in aiter_pages(figma.get_ai_usage_daily, lookahead=2,
+    ...                               start_date="2026-01-01", end_date="2026-01-31"):
+    ...     store(page.rows)
+    """
+    if lookahead < 0:
+        raise ValueError("lookahead must be >= 0")
+    # One slot per page fetched and not yet done with: the page being processed, and
+    # the ones ahead of it. The consumer gives a slot back when it asks for the next.
+    slots = asyncio.Semaphore(lookahead + 1)
+    queue: asyncio.Queue = asyncio.Queue()
+    producer = asyncio.ensure_future(_fetch_pages(method, kwargs, slots, queue))
+    try:
+        while True:
+            item = await queue.get()
+            if item is _LAST_PAGE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+            slots.release()
+    finally:
+        producer.cancel()
+        try:
+            await producer
+        except asyncio.CancelledError:
+            pass
+
+
+_LAST_PAGE = object()
+
+
+async def _fetch_pages(method: Callable[..., Any], kwargs: dict, slots: asyncio.Semaphore, queue: asyncio.Queue) -> None:
+    """Put every page, then `_LAST_PAGE` or the error that stopped it, on `queue`."""
+    try:
+        fetch = method
+        while True:
+            await slots.acquire()
+            response = await fetch(**kwargs)
+            queue.put_nowait(response)
+            cursor = _next_cursor(response, method)
+            if cursor is None:
+                break
+            kwargs = {**kwargs, "cursor": cursor}
+            fetch = _cursor_fetcher(method)
+    except Exception as exc:
+        queue.put_nowait(exc)
+    else:
+        queue.put_nowait(_LAST_PAGE)
+
+
+# (more pages?, cursor) field pairs, as the paginated endpoints name them: analytics and
+# activity logs, AI usage, developer logs. Either at the top level or under `meta`.
+_PAGINATION = (("next_page", "cursor"), ("has_next_page", "next_cursor"), ("has_more", "cursor"))
+
+
+def _next_cursor(response: Any, method: Callable[..., Any]) -> str | None:
+    """The cursor for the page after `response`, or None if it is the last one."""
+    for holder in (response, _field(response, "meta")):
+        for more, cursor in _PAGINATION:
+            if _field(holder, more):
+                value = _field(holder, cursor)
+                if not isinstance(value, str) or not value:
+                    return None
+                if not _takes_cursor(method) and _route(method) is None:
+                    raise TypeError(
+                        f"{getattr(method, '__name__', method)} has more pages but no `cursor` parameter "
+                        "in this spec version; request them with client.request(...)"
+                    )
+                return value
+    return None
+
+
+def _field(value: Any, name: str) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return value.get(name)
+    return getattr(value, name, None)
+
+
+def _route(method: Callable[..., Any]) -> tuple[Any, str, str] | None:
+    """(client, HTTP method, path template) of a client's generated endpoint method, else None."""
+    from ._endpoints import OPERATIONS
+
+    client = getattr(method, "__self__", None)
+    name = getattr(method, "__name__", None)
+    if client is None or not hasattr(client, "_call"):
+        return None
+    for (verb, template), operation in OPERATIONS.items():
+        if operation == name:
+            return client, verb, template
+    return None
+
+
+def _cursor_fetcher(method: Callable[..., Any]) -> Callable[..., Any]:
+    """`method`, or when it has no `cursor` parameter, the same request with one.
+
+    Some paginated endpoints return a cursor that the spec does not list as a parameter
+    (``get_activity_logs`` in this version). The next pages are requested on the same
+    path through the client, and parsed into the same model as the first.
+    """
+    if _takes_cursor(method):
+        return method
+    client, verb, template = _route(method)  # type: ignore[misc]
+    model = typing.get_args(typing.get_type_hints(method).get("return"))[:1]
+    placeholders = [field for _, field, _, _ in string.Formatter().parse(template) if field]
+
+    def fetch(**kwargs: Any) -> Any:
+        path = template.format(**{name: kwargs.pop(name) for name in placeholders})
+        return client._call(verb, path, params=kwargs, model=model[0] if model else None)
+
+    return fetch
+
+
+def _takes_cursor(method: Callable[..., Any]) -> bool:
+    try:
+        parameters = inspect.signature(method).parameters
+    except (TypeError, ValueError):
+        return True
+    return "cursor" in parameters or any(p.kind is p.VAR_KEYWORD for p in parameters.values())
@@ -0,0 +1,320 @@
+"""Mirror many files, re-fetching only the ones that changed since the last run.
+
+Folder and project listings carry each file's ``last_modified``, so whether a file
+changed is known without a single request about the file itself. :class:`IncrementalSync`
+keeps that watermark per file in a :class:`WatermarkStore`, and on each run calls
+``get_file``, ``get_file_components``, ``get_file_styles`` and ``get_local_variables``
+only for files whose watermark moved::
+
+    >>> store = WatermarkStore("mirror-state.db")
+    >>> sync = IncrementalSync(figma, store)
+    >>> async for synced in sync.team(team_id):
+    ...     save(synced.key, synced.results["get_file"])
+    >>> sync.report
+    <SyncReport 31 fetched, 2408 skipped, 0 failed, 1 gone>
+
+A file's watermark is only stored once the loop asks for the next file, so one that was
+being saved when the process died is fetched again on the next run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+from .crawl import TeamCrawler
+from .errors import FigmaHTTPError
+from .helpers import _field
+
+__all__ = ["DEFAULT_OPERATIONS", "IncrementalSync", "SyncReport", "SyncedFile", "Watermark", "WatermarkStore"]
+
+#: What is fetched for each changed file, unless `operations` says otherwise.
+DEFAULT_OPERATIONS = ("get_file", "get_file_components", "get_file_styles", "get_local_variables")
+
+
+class Watermark:
+    """How far a file had got when it was last synced.
+
+    `last_modified` is the time a folder or project listing gave, `touched` the
+    ``last_touched_at`` of ``get_file_meta``, and `version` the file version if known.
+    The two times come from different places and are kept apart, so a file listed one
+    run and synced by bare key the next is compared by what both runs learned.
+    """
+
+    __slots__ = ("last_modified", "version", "touched")
+
+    def __init__(self, last_modified: str | None, version: str | None = None, touched: str | None = None):
+        self.last_modified = last_modified
+        self.version = version
+        self.touched = touched
+
+    def moved_since(self, previous: Watermark | None) -> bool:
+        """Whether the file changed since `previous`, comparing what both of them know."""
+        if previous is None:
+            return True
+        compared = False
+        for field in self.__slots__:
+            mine, theirs = getattr(self, field), getattr(previous, field)
+            if mine is not None and theirs is not None:
+                if mine != theirs:
+                    return True
+                compared = True
+        return not compared
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Watermark):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __repr__(self) -> str:
+        touched = f" touched {self.touched}" if self.touched is not None else ""
+        return f"<Watermark {self.last_modified} v{self.version}{touched}>"
+
+
+class WatermarkStore:
+    """Watermarks by file key in one SQLite database, kept between runs."""
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks "
+            "(key TEXT PRIMARY KEY, last_modified TEXT, version TEXT, synced_at REAL NOT NULL, touched TEXT)"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(watermarks)")}
+        if "touched" not in columns:  # a store written before touched was kept
+            self._db.execute("ALTER TABLE watermarks ADD COLUMN touched TEXT")
+
+    def get(self, key: str) -> Watermark | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT last_modified, version, touched FROM watermarks WHERE key = ?", (key,)
+            ).fetchone()
+        return None if row is None else Watermark(*row)
+
+    def set(self, key: str, watermark: Watermark) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO watermarks (key, last_modified, version, synced_at, touched) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, watermark.last_modified, watermark.version, time.time(), watermark.touched),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM watermarks WHERE key = ?", (key,))
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return [key for (key,) in self._db.execute("SELECT key FROM watermarks ORDER BY key")]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM watermarks").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class SyncedFile:
+    """A changed file and what was fetched for it.
+
+    `results` maps each operation name to its response; `previous` is the watermark
+    from the last sync, None for a file seen for the first time.
+    """
+
+    __slots__ = ("key", "name", "results", "watermark", "previous")
+
+    def __init__(self, key: str, name: str | None, results: dict[str, Any], watermark: Watermark,
+                 previous: Watermark | None):
+        self.key = key
+        self.name = name
+        self.results = results
+        self.watermark = watermark
+        self.previous = previous
+
+    def __repr__(self) -> str:
+        return f"<SyncedFile {self.key} {self.name!r}>"
+
+
+class SyncReport:
+    """What one run did, by file key.
+
+    `fetched` and `skipped` are the files that changed and those that did not; `failed`
+    maps a file to the error that stopped its fetch, and its watermark is left where it
+    was so the next run tries again. `gone` lists files with a watermark that the run
+    did not come across -- deleted, moved out, or no longer visible. It is only filled
+    in once the whole listing has been seen, and left empty when a crawl had folders
+    it could not list.
+    """
+
+    def __init__(self) -> None:
+        self.fetched: list[str] = []
+        self.skipped: list[str] = []
+        self.failed: dict[str, Exception] = {}
+        self.gone: list[str] = []
+
+    def __repr__(self) -> str:
+        return (
+            f"<SyncReport {len(self.fetched)} fetched, {len(self.skipped)} skipped, "
+            f"{len(self.failed)} failed, {len(self.gone)} gone>"
+        )
+
+
+class IncrementalSync:
+    """Fetch what changed in a set of files on :class:`~figmapy.AsyncFigma`.
+
+    store:       a :class:`WatermarkStore`, or a path to open one at.
+    operations:  client methods to call with each changed file's key; a mapping gives
+                 each one keyword arguments, e.g. ``{"get_file": {"depth": 2}}``.
+    concurrency: changed files fetched at once. A file's operations run together.
+
+    ``sync.report`` describes the last run.
+    """
+
+    def __init__(
+        self,
+        figma: Any,
+        store: WatermarkStore | str | os.PathLike,
+        *,
+        operations: Iterable[str] | Mapping[str, Mapping[str, Any]] = DEFAULT_OPERATIONS,
+        concurrency: int = 4,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self.figma = figma
+        self.store = store if isinstance(store, WatermarkStore) else WatermarkStore(store)
+        if isinstance(operations, Mapping):
+            self.operations = {name: dict(kwargs) for name, kwargs in operations.items()}
+        else:
+            self.operations = {name: {} for name in operations}
+        self.concurrency = concurrency
+        self.report = SyncReport()
+
+    def team(self, team_id: str, **crawl: Any) -> AsyncIterator[SyncedFile]:
+        """Sync every file in a team, listed by a :class:`~figmapy.TeamCrawler` (`crawl` are its options)."""
+        return self.files(TeamCrawler(self.figma, team_id, meta=False, **crawl))
+
+    async def project(self, project_id: str) -> AsyncIterator[SyncedFile]:
+        """Sync the files ``get_project_files`` lists for one project."""
+        listing = await self.figma.get_project_files(project_id)
+        async for synced in self.files(_field(listing, "files") or ()):
+            yield synced
+
+    async def files(self, files: Iterable[Any] | AsyncIterable[Any]) -> AsyncIterator[SyncedFile]:
+        """Sync `files`: keys, or listing entries with a ``key`` and ``last_modified``.
+
+        Entries with a ``last_modified`` -- from ``get_project_files``,
+        ``get_folder_files`` or a :class:`~figmapy.TeamCrawler` -- are compared without a
+        request. A bare key costs a ``get_file_meta`` call to learn its version.
+        """
+        self.report = report = SyncReport()
+        seen: set[str] = set()
+        jobs: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        found: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        tasks = [asyncio.ensure_future(self._work(jobs, found)) for _ in range(self.concurrency)]
+        tasks.append(asyncio.ensure_future(self._feed(files, seen, jobs, found)))
+        try:
+            while True:
+                item = await found.get()
+                if item is _LISTED:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+                self.store.set(item.key, item.watermark)
+                report.fetched.append(item.key)
+            # A listing with holes -- a crawl that could not list some folders -- would
+            # report everything in them as gone.
+            if not getattr(files, "errors", None):
+                report.gone = [key for key in self.store.keys() if key not in seen]
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _feed(self, files: Any, seen: set[str], jobs: asyncio.Queue, found: asyncio.Queue) -> None:
+        """Compare each listed file with its watermark; queue the ones that moved."""
+        try:
+            async for entry in _aiter(files):
+                key = entry if isinstance(entry, str) else _field(entry, "key")
+                seen.add(key)
+                previous = self.store.get(key)
+                last_modified = None if isinstance(entry, str) else _timestamp(_field(entry, "last_modified"))
+                if last_modified is not None and not Watermark(last_modified).moved_since(previous):
+                    self.report.skipped.append(key)
+                    continue
+                name = None if isinstance(entry, str) else _field(entry, "name")
+                await jobs.put((key, name, last_modified, previous))
+            await jobs.join()
+        except Exception as exc:  # the listing failed: stop the run
+            await found.put(exc)
+        else:
+            await found.put(_LISTED)
+
+    async def _work(self, jobs: asyncio.Queue, found: asyncio.Queue) -> None:
+        while True:
+            key, name, last_modified, previous = await jobs.get()
+            try:
+                synced = await self._fetch(key, name, last_modified, previous)
+            except FigmaHTTPError as exc:
+                self.report.failed[key] = exc
+            except Exception as exc:  # a bug rather than Figma saying no: stop the run
+                await found.put(exc)
+            else:
+                if synced is None:
+                    self.report.skipped.append(key)
+                else:
+                    await found.put(synced)
+            finally:
+                jobs.task_done()
+
+    async def _fetch(
+        self, key: str, name: str | None, last_modified: str | None, previous: Watermark | None
+    ) -> SyncedFile | None:
+        version = touched = None
+        if last_modified is None:
+            meta = _field(await self.figma.get_file_meta(key), "file")
+            version = _field(meta, "version")
+            touched = _timestamp(_field(meta, "last_touched_at"))
+            name = name or _field(meta, "name")
+            if not Watermark(None, version, touched).moved_since(previous):
+                return None
+        names = list(self.operations)
+        responses = await asyncio.gather(
+            *(getattr(self.figma, op)(key, **self.operations[op]) for op in names)
+        )
+        results = dict(zip(names, responses, strict=True))
+        if "get_file" in results:
+            version = _field(results["get_file"], "version") or version
+            name = name or _field(results["get_file"], "name")
+        return SyncedFile(key, name, results, Watermark(last_modified, version, touched), previous)
+
+
+_LISTED = object()
+
+
+async def _aiter(files: Any) -> AsyncIterator[Any]:
+    if hasattr(files, "__aiter__"):
+        async for entry in files:
+            yield entry
+    else:
+        for entry in files:
+            yield entry
+
+
+def _timestamp(value: Any) -> str | None:
+    """`value` -- a datetime, or its ISO text from a ``parse=False`` response -- in one form."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return value.astimezone(datetime.timezone.utc).isoformat()
@@ -9,7 +9,7 @@ from __future__ import annotations
 from enum import Enum
 from figmapy._base import FigmaModel
 from typing import Annotated, Any, Literal, Optional, Union
-from pydantic import AwareDatetime, Field, RootModel
+from pydantic import AwareDatetime, Field, RootModel, field_validator
 
 
 class ScrollBehavior(Enum):
@@ -8590,34 +8590,40 @@ class HasChildrenTrait(FigmaModel):
         list[
             Annotated[
                 Union[
-                    BooleanOperationNode,
-                    ComponentNode,
-                    ComponentSetNode,
-                    ConnectorNode,
-                    EllipseNode,
-                    EmbedNode,
-                    FrameNode,
-                    GroupNode,
-                    InstanceNode,
-                    LineNode,
-                    LinkUnfurlNode,
-                    RectangleNode,
-                    RegularPolygonNode,
-                    SectionNode,
-                    ShapeWithTextNode,
-                    SliceNode,
-                    StarNode,
-                    StickyNode,
-                    TableNode,
-                    TableCellNode,
-                    TextNode,
-                    TextPathNode,
-                    TransformGroupNode,
-                    VectorNode,
-                    WashiTapeNode,
-                    WidgetNode,
+                    Annotated[
+                        Union[
+                            BooleanOperationNode,
+                            ComponentNode,
+                            ComponentSetNode,
+                            ConnectorNode,
+                            EllipseNode,
+                            EmbedNode,
+                            FrameNode,
+                            GroupNode,
+                            InstanceNode,
+                            LineNode,
+                            LinkUnfurlNode,
+                            RectangleNode,
+                            RegularPolygonNode,
+                            SectionNode,
+                            ShapeWithTextNode,
+                            SliceNode,
+                            StarNode,
+                            StickyNode,
+                            TableNode,
+                            TableCellNode,
+                            TextNode,
+                            TextPathNode,
+                            TransformGroupNode,
+                            VectorNode,
+                            WashiTapeNode,
+                            WidgetNode,
+                        ],
+                        Field(discriminator='type'),
+                    ],
+                    UnknownNode,
                 ],
-                Field(discriminator='type'),
+                Field(union_mode='left_to_right'),
             ]
         ],
         Field(description='An array of nodes that are direct children of this node'),
@@ -8654,34 +8660,40 @@ class CanvasNode(FigmaModel):
     children: list[
         Annotated[
             Union[
-                BooleanOperationNode,
-                ComponentNode,
-                ComponentSetNode,
-                ConnectorNode,
-                EllipseNode,
-                EmbedNode,
-                FrameNode,
-                GroupNode,
-                InstanceNode,
-                LineNode,
-                LinkUnfurlNode,
-                RectangleNode,
-                RegularPolygonNode,
-                SectionNode,
-                ShapeWithTextNode,
-                SliceNode,
-                StarNode,
-                StickyNode,
-                TableNode,
-                TableCellNode,
-                TextNode,
-                TextPathNode,
-                TransformGroupNode,
-                VectorNode,
-                WashiTapeNode,
-                WidgetNode,
+                Annotated[
+                    Union[
+                        BooleanOperationNode,
+                        ComponentNode,
+                        ComponentSetNode,
+                        ConnectorNode,
+                        EllipseNode,
+                        EmbedNode,
+                        FrameNode,
+                        GroupNode,
+                        InstanceNode,
+                        LineNode,
+                        LinkUnfurlNode,
+                        RectangleNode,
+                        RegularPolygonNode,
+                        SectionNode,
+                        ShapeWithTextNode,
+                        SliceNode,
+                        StarNode,
+                        StickyNode,
+                        TableNode,
+                        TableCellNode,
+                        TextNode,
+                        TextPathNode,
+                        TransformGroupNode,
+                        VectorNode,
+                        WashiTapeNode,
+                        WidgetNode,
+                    ],
+                    Field(discriminator='type'),
+                ],
+                UnknownNode,
             ],
-            Field(discriminator='type'),
+            Field(union_mode='left_to_right'),
         ]
     ]
     backgroundColor: Annotated[
@@ -8863,34 +8875,40 @@ class BooleanOperationNode(FigmaModel):
         list[
             Annotated[
                 Union[
-                    BooleanOperationNode,
-                    ComponentNode,
-                    ComponentSetNode,
-                    ConnectorNode,
-                    EllipseNode,
-                    EmbedNode,
-                    FrameNode,
-                    GroupNode,
-                    InstanceNode,
-                    LineNode,
-                    LinkUnfurlNode,
-                    RectangleNode,
-                    RegularPolygonNode,
-                    SectionNode,
-                    ShapeWithTextNode,
-                    SliceNode,
-                    StarNode,
-                    StickyNode,
-                    TableNode,
-                    TableCellNode,
-                    TextNode,
-                    TextPathNode,
-                    TransformGroupNode,
-                    VectorNode,
-                    WashiTapeNode,
-                    WidgetNode,
+                    Annotated[
+                        Union[
+                            BooleanOperationNode,
+                            ComponentNode,
+                            ComponentSetNode,
+                            ConnectorNode,
+                            EllipseNode,
+                            EmbedNode,
+                            FrameNode,
+                            GroupNode,
+                            InstanceNode,
+                            LineNode,
+                            LinkUnfurlNode,
+                            RectangleNode,
+                            RegularPolygonNode,
+                            SectionNode,
+                            ShapeWithTextNode,
+                            SliceNode,
+                            StarNode,
+                            StickyNode,
+                            TableNode,
+                            TableCellNode,
+                            TextNode,
+                            TextPathNode,
+                            TransformGroupNode,
+                            VectorNode,
+                            WashiTapeNode,
+                            WidgetNode,
+                        ],
+                        Field(discriminator='type'),
+                    ],
+                    UnknownNode,
                 ],
-                Field(discriminator='type'),
+                Field(union_mode='left_to_right'),
             ]
         ],
         Field(description='An array of nodes that are direct children of this node'),
@@ -9179,34 +9197,40 @@ class SectionNode(FigmaModel):
         list[
             Annotated[
                 Union[
-                    BooleanOperationNode,
-                    ComponentNode,
-                    ComponentSetNode,
-                    ConnectorNode,
-                    EllipseNode,
-                    EmbedNode,
-                    FrameNode,
-                    GroupNode,
-                    InstanceNode,
-                    LineNode,
-                    LinkUnfurlNode,
-                    RectangleNode,
-                    RegularPolygonNode,
-                    SectionNode,
-                    ShapeWithTextNode,
-                    SliceNode,
-                    StarNode,
-                    StickyNode,
-                    TableNode,
-                    TableCellNode,
-                    TextNode,
-                    TextPathNode,
-                    TransformGroupNode,
-                    VectorNode,
-                    WashiTapeNode,
-                    WidgetNode,
+                    Annotated[
+                        Union[
+                            BooleanOperationNode,
+                            ComponentNode,
+                            ComponentSetNode,
+                            ConnectorNode,
+                            EllipseNode,
+                            EmbedNode,
+                            FrameNode,
+                            GroupNode,
+                            InstanceNode,
+                            LineNode,
+                            LinkUnfurlNode,
+                            RectangleNode,
+                            RegularPolygonNode,
+                            SectionNode,
+                            ShapeWithTextNode,
+                            SliceNode,
+                            StarNode,
+                            StickyNode,
+                            TableNode,
+                            TableCellNode,
+                            TextNode,
+                            TextPathNode,
+                            TransformGroupNode,
+                            VectorNode,
+                            WashiTapeNode,
+                            WidgetNode,
+                        ],
+                        Field(discriminator='type'),
+                    ],
+                    UnknownNode,
                 ],
-                Field(discriminator='type'),
+                Field(union_mode='left_to_right'),
             ]
         ],
         Field(description='An array of nodes that are direct children of this node'),
@@ -9444,34 +9468,40 @@ class TableNode(FigmaModel):
         list[
             Annotated[
                 Union[
-                    BooleanOperationNode,
-                    ComponentNode,
-                    ComponentSetNode,
-                    ConnectorNode,
-                    EllipseNode,
-                    EmbedNode,
-                    FrameNode,
-                    GroupNode,
-                    InstanceNode,
-                    LineNode,
-                    LinkUnfurlNode,
-                    RectangleNode,
-                    RegularPolygonNode,
-                    SectionNode,
-                    ShapeWithTextNode,
-                    SliceNode,
-                    StarNode,
-                    StickyNode,
-                    TableNode,
-                    TableCellNode,
-                    TextNode,
-                    TextPathNode,
-                    TransformGroupNode,
-                    VectorNode,
-                    WashiTapeNode,
-                    WidgetNode,
+                    Annotated[
+                        Union[
+                            BooleanOperationNode,
+                            ComponentNode,
+                            ComponentSetNode,
+                            ConnectorNode,
+                            EllipseNode,
+                            EmbedNode,
+                            FrameNode,
+                            GroupNode,
+                            InstanceNode,
+                            LineNode,
+                            LinkUnfurlNode,
+                            RectangleNode,
+                            RegularPolygonNode,
+                            SectionNode,
+                            ShapeWithTextNode,
+                            SliceNode,
+                            StarNode,
+                            StickyNode,
+                            TableNode,
+                            TableCellNode,
+                            TextNode,
+                            TextPathNode,
+                            TransformGroupNode,
+                            VectorNode,
+                            WashiTapeNode,
+                            WidgetNode,
+                        ],
+                        Field(discriminator='type'),
+                    ],
+                    UnknownNode,
                 ],
-                Field(discriminator='type'),
+                Field(union_mode='left_to_right'),
             ]
         ],
         Field(description='An array of nodes that are direct children of this node'),
@@ -9763,34 +9793,40 @@ class WidgetNode(FigmaModel):
         list[
             Annotated[
                 Union[
-                    BooleanOperationNode,
-                    ComponentNode,
-                    ComponentSetNode,
-                    ConnectorNode,
-                    EllipseNode,
-                    EmbedNode,
-                    FrameNode,
-                    GroupNode,
-                    InstanceNode,
-                    LineNode,
-                    LinkUnfurlNode,
-                    RectangleNode,
-                    RegularPolygonNode,
-                    SectionNode,
-                    ShapeWithTextNode,
-                    SliceNode,
-                    StarNode,
-                    StickyNode,
-                    TableNode,
-                    TableCellNode,
-                    TextNode,
-                    TextPathNode,
-                    TransformGroupNode,
-                    VectorNode,
-                    WashiTapeNode,
-                    WidgetNode,
+                    Annotated[
+                        Union[
+                            BooleanOperationNode,
+                            ComponentNode,
+                            ComponentSetNode,
+                            ConnectorNode,
+                            EllipseNode,
+                            EmbedNode,
+                            FrameNode,
+                            GroupNode,
+                            InstanceNode,
+                            LineNode,
+                            LinkUnfurlNode,
+                            RectangleNode,
+                            RegularPolygonNode,
+                            SectionNode,
+                            ShapeWithTextNode,
+                            SliceNode,
+                            StarNode,
+                            StickyNode,
+                            TableNode,
+                            TableCellNode,
+                            TextNode,
+                            TextPathNode,
+                            TransformGroupNode,
+                            VectorNode,
+                            WashiTapeNode,
+                            WidgetNode,
+                        ],
+                        Field(discriminator='type'),
+                    ],
+                    UnknownNode,
                 ],
-                Field(discriminator='type'),
+                Field(union_mode='left_to_right'),
             ]
         ],
         Field(description='An array of nodes that are direct children of this node'),
@@ -9957,36 +9993,42 @@ class GetFileResponse(FigmaModel):
 class Nodes(FigmaModel):
     document: Annotated[
         Union[
-            BooleanOperationNode,
-            ComponentNode,
-            ComponentSetNode,
-            ConnectorNode,
-            EllipseNode,
-            EmbedNode,
-            FrameNode,
-            GroupNode,
-            InstanceNode,
-            LineNode,
-            LinkUnfurlNode,
-            RectangleNode,
-            RegularPolygonNode,
-            SectionNode,
-            ShapeWithTextNode,
-            SliceNode,
-            StarNode,
-            StickyNode,
-            TableNode,
-            TableCellNode,
-            TextNode,
-            TextPathNode,
-            TransformGroupNode,
-            VectorNode,
-            WashiTapeNode,
-            WidgetNode,
-            DocumentNode,
-            CanvasNode,
+            Annotated[
+                Union[
+                    BooleanOperationNode,
+                    ComponentNode,
+                    ComponentSetNode,
+                    ConnectorNode,
+                    EllipseNode,
+                    EmbedNode,
+                    FrameNode,
+                    GroupNode,
+                    InstanceNode,
+                    LineNode,
+                    LinkUnfurlNode,
+                    RectangleNode,
+                    RegularPolygonNode,
+                    SectionNode,
+                    ShapeWithTextNode,
+                    SliceNode,
+                    StarNode,
+                    StickyNode,
+                    TableNode,
+                    TableCellNode,
+                    TextNode,
+                    TextPathNode,
+                    TransformGroupNode,
+                    VectorNode,
+                    WashiTapeNode,
+                    WidgetNode,
+                    DocumentNode,
+                    CanvasNode,
+                ],
+                Field(discriminator='type'),
+            ],
+            UnknownNode,
         ],
-        Field(discriminator='type'),
+        Field(union_mode='left_to_right'),
     ]
     components: Annotated[
         dict[str, Component],
@@ -10251,6 +10293,104 @@ class RectangleNode(RectangularShapeTraits):
     ]
 
 
+#: Every node `type` this spec knows. Nodes of any other type parse as UnknownNode.
+NODE_TYPES = frozenset(
+    {
+        'BOOLEAN_OPERATION',
+        'CANVAS',
+        'COMPONENT',
+        'COMPONENT_SET',
+        'CONNECTOR',
+        'DOCUMENT',
+        'ELLIPSE',
+        'EMBED',
+        'FRAME',
+        'GROUP',
+        'INSTANCE',
+        'LINE',
+        'LINK_UNFURL',
+        'RECTANGLE',
+        'REGULAR_POLYGON',
+        'SECTION',
+        'SHAPE_WITH_TEXT',
+        'SLICE',
+        'STAR',
+        'STICKY',
+        'TABLE',
+        'TABLE_CELL',
+        'TEXT',
+        'TEXT_PATH',
+        'TRANSFORM_GROUP',
+        'VECTOR',
+        'WASHI_TAPE',
+        'WIDGET',
+    }
+)
+
+
+class UnknownNode(FigmaModel):
+    """
+    A node whose `type` is newer than the spec this release was generated from.
+
+    Node unions dispatch on `type`, and a type none of their members declare falls
+    through to this instead of failing the whole response. Everything Figma sent is
+    kept as an attribute, and children are parsed like any other node's.
+    """
+
+    id: str
+    name: str
+    type: str
+    children: Optional[
+        list[
+            Annotated[
+                Union[
+                    Annotated[
+                        Union[
+                            BooleanOperationNode,
+                            ComponentNode,
+                            ComponentSetNode,
+                            ConnectorNode,
+                            EllipseNode,
+                            EmbedNode,
+                            FrameNode,
+                            GroupNode,
+                            InstanceNode,
+                            LineNode,
+                            LinkUnfurlNode,
+                            RectangleNode,
+                            RegularPolygonNode,
+                            SectionNode,
+                            ShapeWithTextNode,
+                            SliceNode,
+                            StarNode,
+                            StickyNode,
+                            TableNode,
+                            TableCellNode,
+                            TextNode,
+                            TextPathNode,
+                            TransformGroupNode,
+                            VectorNode,
+                            WashiTapeNode,
+                            WidgetNode,
+                        ],
+                        Field(discriminator='type'),
+                    ],
+                    UnknownNode,
+                ],
+                Field(union_mode='left_to_right'),
+            ]
+        ]
+    ] = None
+
+    @field_validator('type')
+    @classmethod
+    def _not_a_known_type(cls, value: str) -> str:
+        if value in NODE_TYPES:
+            # A known type that failed its own model: report that, do not swallow it.
+            raise ValueError(f'{value!r} nodes are not parsed as UnknownNode')
+        return value
+
+
 HasChildrenTrait.model_rebuild()
 TransitionSourceTrait.model_rebuild()
 DocumentNode.model_rebuild()
@@ -10283,3 +10423,4 @@ VectorNode.model_rebuild()
 StarNode.model_rebuild()
 RegularPolygonNode.model_rebuild()
 RectangleNode.model_rebuild()
+UnknownNode.model_rebuild()
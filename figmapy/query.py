@@ -0,0 +1,353 @@
+"""Selectors for finding nodes: a small CSS-like language over the document tree.
+
+Each ``find_all(..., where=...)`` is a full walk of the file. A lint pass with twenty
+rules is twenty walks. A :class:`Selector` is compiled once, and :func:`select_many`
+answers any number of them in a single walk::
+
+    >>> select(file, "FRAME > TEXT[visible=false]")
+    >>> select_many(file, {
+    ...     "hidden": "[visible=false]",
+    ...     "unnamed_frames": 'FRAME[name="Frame *"]',
+    ...     "icons_with_text": 'COMPONENT[name=/^Icon\\//] TEXT',
+    ... })
+
+The syntax:
+
+``TEXT``, ``*``
+    A node of that ``type``, or of any type.
+``[name="Button/*"]``
+    A quoted value matches strings as a glob (``*``, ``?``, ``[abc]``).
+``[name=/^btn_\\d+$/]``
+    A ``/regex/`` is searched for in the value.
+``[visible=false]``, ``[opacity=0.5]``, ``[layoutMode=HORIZONTAL]``, ``[fills=null]``
+    ``true``, ``false``, ``null``, numbers and bare words compare for equality. Enum
+    values compare by their value.
+``[style.fontSize=12]``, ``[componentId]``, ``[locked!=true]``
+    Dotted paths reach into nested objects. No operator means "present and not null";
+    ``!=`` negates.
+``A B``, ``A > B``
+    B anywhere below A, or B directly inside A.
+``A, B``
+    Either.
+
+Like :func:`~figmapy.helpers.walk`, the root itself is never a result, but it does take
+part in combinators (``DOCUMENT > CANVAS`` selects the pages).
+"""
+
+from __future__ import annotations
+
+import enum
+import fnmatch
+import re
+from collections.abc import Callable, Iterator, Mapping
+from typing import Any
+
+from .helpers import _children
+
+__all__ = ["Selector", "select", "select_many"]
+
+_TOKEN = re.compile(
+    r"""
+    (?P<space>\s+)
+  | (?P<punct>[>,\[\]*])
+  | (?P<op>!=|=)
+  | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<regex>/(?:[^/\\]|\\.)*/)
+  | (?P<word>[A-Za-z0-9_.+-]+)
+    """,
+    re.X,
+)
+_NUMBER = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+_KEYWORDS = {"true": True, "false": False, "null": None}
+
+
+def _attribute(path: str, negate: bool, test: Callable[[Any], bool]) -> Callable[[Any], bool]:
+    """One ``[path op value]`` test, as a function of the node."""
+    parts = path.split(".")
+    if len(parts) == 1:
+        (name,) = parts
+
+        def check(node: Any) -> bool:
+            value = getattr(node, name, None)
+            if isinstance(value, enum.Enum):
+                value = value.value
+            return test(value) != negate
+
+        return check
+
+    def check_path(node: Any) -> bool:
+        value = node
+        for part in parts:
+            value = value.get(part) if isinstance(value, dict) else getattr(value, part, None)
+            if value is None:
+                break
+        if isinstance(value, enum.Enum):
+            value = value.value
+        return test(value) != negate
+
+    return check_path
+
+
+class _Compound:
+    """A type and any number of attribute tests, all of which must hold."""
+
+    __slots__ = ("type", "attributes", "predicate")
+
+    def __init__(self, type: str | None, attributes: list[Callable[[Any], bool]]):
+        self.type = type
+        self.attributes = attributes
+        #: The attribute tests alone, for callers that already know the type matches.
+        self.predicate: Callable[[Any], bool] | None = None
+        if len(attributes) == 1:
+            self.predicate = attributes[0]
+        elif attributes:
+            self.predicate = lambda node: all(attribute(node) for attribute in attributes)
+
+    def __call__(self, node: Any) -> bool:
+        if self.type is not None and getattr(node, "type", None) != self.type:
+            return False
+        return self.predicate is None or self.predicate(node)
+
+
+class _Complex:
+    """Compounds joined by combinators, matched right to left against the ancestors."""
+
+    __slots__ = ("compounds", "combinators")
+
+    def __init__(self, compounds: list[_Compound], combinators: list[str]):
+        self.compounds = compounds
+        self.combinators = combinators  # combinators[i] joins compounds[i] and [i + 1]
+
+    @property
+    def type(self) -> str | None:
+        return self.compounds[-1].type
+
+    def matches(self, node: Any, ancestors: list[Any]) -> bool:
+        if not self.combinators:
+            return self.compounds[0](node)
+        return self._matches(len(self.compounds) - 1, node, ancestors, len(ancestors))
+
+    def _matches(self, i: int, node: Any, ancestors: list[Any], above: int) -> bool:
+        # `above` is how many entries of `ancestors` are above `node`.
+        if not self.compounds[i](node):
+            return False
+        if i == 0:
+            return True
+        if self.combinators[i - 1] == ">":
+            return above > 0 and self._matches(i - 1, ancestors[above - 1], ancestors, above - 1)
+        return any(self._matches(i - 1, ancestors[j], ancestors, j) for j in range(above - 1, -1, -1))
+
+
+class Selector:
+    """A compiled selector. See the module docstring for the syntax.
+
+    Raises ValueError, pointing at the position, if `source` does not parse.
+
+    >>> hidden_text = Selector("TEXT[visible=false]")
+    >>> hidden_text.select(file)
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self._alternatives = _Parser(source).parse()
+
+    def __repr__(self) -> str:
+        return f"Selector({self.source!r})"
+
+    def matches(self, node: Any, ancestors: list[Any] | None = None) -> bool:
+        """Whether `node` matches, given its `ancestors` from the root down to its parent."""
+        ancestors = ancestors or []
+        return any(alternative.matches(node, ancestors) for alternative in self._alternatives)
+
+    def select(self, root: Any, *, prune: Callable[[Any], bool] | None = None) -> list:
+        """Every node under `root` that matches, in document order."""
+        return select_many(root, {None: self}, prune=prune)[None]
+
+
+def select(root: Any, selector: str | Selector, *, prune: Callable[[Any], bool] | None = None) -> list:
+    """Every node under `root` matching `selector`, in document order.
+
+    `root` may be a file, a document or any node, as with :func:`~figmapy.helpers.walk`,
+    and `prune` skips a node with its subtree in the same way.
+
+    >>> select(file, 'INSTANCE[componentId] TEXT[name="Label"]')
+    """
+    return select_many(root, {None: selector}, prune=prune)[None]
+
+
+def select_many(
+    root: Any,
+    selectors: Mapping[Any, str | Selector],
+    *,
+    prune: Callable[[Any], bool] | None = None,
+) -> dict[Any, list]:
+    """Evaluate many selectors in one walk: ``{key: selector}`` in, ``{key: nodes}`` out.
+
+    Each node is only tested against the selectors that could match its type, so adding
+    rules costs far less than adding walks.
+
+    >>> results = select_many(file, {"hidden": "[visible=false]", "frames": "FRAME"})
+    >>> results["frames"]
+    """
+    compiled = {key: s if isinstance(s, Selector) else Selector(s) for key, s in selectors.items()}
+    results: dict[Any, list] = {key: [] for key in compiled}
+    # Bucket alternatives by the type their last compound requires; None is any type.
+    # A lone compound in a typed bucket only needs its attribute tests run.
+    by_type: dict[str | None, list[tuple[Any, Callable[[Any], bool] | None, _Complex | None]]] = {}
+    for key, selector in compiled.items():
+        for alternative in selector._alternatives:
+            if alternative.combinators or alternative.type is None:
+                entry = (key, None, alternative)
+            else:
+                entry = (key, alternative.compounds[0].predicate, None)
+            by_type.setdefault(alternative.type, []).append(entry)
+    untyped = by_type.pop(None, [])
+    by_type = {type: entries + untyped for type, entries in by_type.items()}
+
+    for node, ancestors in _walk_with_ancestors(getattr(root, "document", root), prune):
+        matched = None
+        for key, predicate, alternative in by_type.get(getattr(node, "type", None), untyped):
+            if alternative is None:
+                if predicate is not None and not predicate(node):
+                    continue
+            elif not alternative.matches(node, ancestors):
+                continue
+            if matched is None:
+                matched = {key}
+            elif key in matched:
+                continue
+            else:
+                matched.add(key)
+            results[key].append(node)
+    return results
+
+
+def _walk_with_ancestors(root: Any, prune: Callable[[Any], bool] | None) -> Iterator[tuple[Any, list[Any]]]:
+    # Depth first, like walk(); `ancestors` is shared and mutated, so it is only valid
+    # until the next step.
+    ancestors = [root]
+    stack = [iter(_children(root))]
+    while stack:
+        for child in stack[-1]:
+            if prune is not None and prune(child):
+                continue
+            yield child, ancestors
+            children = _children(child)
+            if children:
+                ancestors.append(child)
+                stack.append(iter(children))
+                break
+        else:
+            stack.pop()
+            ancestors.pop()
+
+
+class _Parser:
+    def __init__(self, source: str):
+        self.source = source
+        self.tokens: list[tuple[str, str, int]] = []
+        pos = 0
+        while pos < len(source):
+            match = _TOKEN.match(source, pos)
+            if match is None:
+                self._fail("unexpected character", pos)
+            kind = match.lastgroup
+            self.tokens.append((kind, match.group(), pos))
+            pos = match.end()
+        self.tokens.append(("end", "", len(source)))
+        self.i = 0
+
+    def _fail(self, message: str, pos: int) -> None:
+        raise ValueError(f"Bad selector {self.source!r}: {message} at position {pos}")
+
+    def _peek(self, skip_space: bool = True) -> tuple[str, str, int]:
+        if skip_space:
+            while self.tokens[self.i][0] == "space":
+                self.i += 1
+        return self.tokens[self.i]
+
+    def _next(self) -> tuple[str, str, int]:
+        token = self._peek()
+        if token[0] != "end":
+            self.i += 1
+        return token
+
+    def parse(self) -> list[_Complex]:
+        alternatives = [self._complex()]
+        while self._peek()[1] == ",":
+            self.i += 1
+            alternatives.append(self._complex())
+        kind, text, pos = self._peek()
+        if kind != "end":
+            self._fail(f"unexpected {text!r}", pos)
+        return alternatives
+
+    def _complex(self) -> _Complex:
+        compounds = [self._compound()]
+        combinators = []
+        while True:
+            had_space = self._peek(skip_space=False)[0] == "space"
+            kind, text, _ = self._peek()
+            if text == ">":
+                self.i += 1
+                combinators.append(">")
+            elif had_space and (kind == "word" or text in ("*", "[")):
+                combinators.append(" ")
+            else:
+                break
+            compounds.append(self._compound())
+        return _Complex(compounds, combinators)
+
+    def _compound(self) -> _Compound:
+        kind, text, pos = self._peek()
+        type = None
+        if kind == "word":
+            type = text
+            self.i += 1
+        elif text == "*":
+            self.i += 1
+        elif text != "[":
+            self._fail("expected a node type, '*' or '['", pos)
+        attributes = []
+        while self._peek(skip_space=False)[1] == "[":
+            self.i += 1
+            attributes.append(self._attribute())
+        return _Compound(type, attributes)
+
+    def _attribute(self) -> Callable[[Any], bool]:
+        kind, path, pos = self._next()
+        if kind != "word":
+            self._fail("expected an attribute name", pos)
+        kind, op, pos = self._next()
+        if op == "]":
+            return _attribute(path, True, lambda value: value is None)
+        if kind != "op":
+            self._fail("expected '=', '!=' or ']'", pos)
+        test = self._value()
+        _, text, pos = self._next()
+        if text != "]":
+            self._fail("expected ']'", pos)
+        return _attribute(path, op == "!=", test)
+
+    def _value(self) -> Callable[[Any], bool]:
+        kind, text, pos = self._next()
+        if kind == "string":
+            glob = re.compile(fnmatch.translate(re.sub(r"\\(.)", r"\1", text[1:-1]))).match
+            return lambda value: isinstance(value, str) and glob(value) is not None
+        if kind == "regex":
+            try:
+                regex = re.compile(text[1:-1].replace("\\/", "/"))
+            except re.error as exc:
+                self._fail(f"invalid regex ({exc})", pos)
+            return lambda value: isinstance(value, str) and regex.search(value) is not None
+        if kind != "word":
+            self._fail("expected a value", pos)
+        if text in _KEYWORDS:
+            expected = _KEYWORDS[text]
+            return lambda value: value is expected
+        if _NUMBER.fullmatch(text):
+            number = float(text)
+            return lambda value: (
+                isinstance(value, (int, float)) and not isinstance(value, bool) and value == number
+            )
+        return lambda value: value == text
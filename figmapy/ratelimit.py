@@ -0,0 +1,188 @@
+"""Client-side rate limiting, so requests are paced before Figma has to refuse them.
+
+Retrying on 429 is the fallback, not the plan: every rejected call still counts against
+the quota. A :class:`RateLimiter` keeps one token bucket per (token, tier) and tells the
+client how long to wait before sending, so a fleet of workers settles at the rate Figma
+allows instead of bouncing off it.
+
+    limiter = figmapy.RateLimiter()                     # Figma's published paid-seat limits
+    figma = figmapy.Figma(rate_limiter=limiter)
+    async_figma = figmapy.AsyncFigma(rate_limiter=limiter)   # shares the same buckets
+
+One limiter only paces the clients it is given. Processes sharing a token have to split
+the budget between them, e.g. ``RateLimiter(rates={1: 15 / workers, ...})``.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+
+from ._endpoints import OPERATIONS
+
+__all__ = ["DEFAULT_RATES", "DEFAULT_TIERS", "RateLimiter", "TokenBucket", "operation_name"]
+
+#: Requests per minute for each tier, as Figma documents them for a paid full seat.
+DEFAULT_RATES: Mapping[int, float] = {1: 15, 2: 50, 3: 100}
+
+#: Operations Figma puts outside the default tier 2. Anything not listed is tier 2.
+DEFAULT_TIERS: Mapping[str, int] = {
+    # Tier 1: the expensive ones, which render or serialise a whole document.
+    "get_file": 1,
+    "get_file_nodes": 1,
+    "get_images": 1,
+    "get_image_fills": 1,
+    # Tier 3: cheap metadata lookups.
+    "get_me": 3,
+    "get_file_meta": 3,
+    "get_component": 3,
+    "get_component_set": 3,
+    "get_style": 3,
+    "get_file_components": 3,
+    "get_file_component_sets": 3,
+    "get_file_styles": 3,
+    "get_team_components": 3,
+    "get_team_component_sets": 3,
+    "get_team_styles": 3,
+    "get_local_variables": 3,
+    "get_published_variables": 3,
+    "post_variables": 3,
+}
+
+
+def _template_regex(template: str) -> re.Pattern:
+    parts = re.split(r"(\{[^}]+\})", template)
+    return re.compile("".join("[^/]+" if p.startswith("{") else re.escape(p) for p in parts) + "$")
+
+
+_ROUTES = [(method, _template_regex(path), name) for (method, path), name in OPERATIONS.items()]
+
+
+@lru_cache(maxsize=4096)
+def operation_name(method: str, path: str) -> str | None:
+    """The endpoint method a request belongs to, or None for paths the spec lacks.
+
+    >>> operation_name("GET", "/v1/files/aBc123/nodes")
+    'get_file_nodes'
+    """
+    method = method.upper()
+    for route_method, pattern, name in _ROUTES:
+        if route_method == method and pattern.match(path):
+            return name
+    return None
+
+
+class TokenBucket:
+    """A token bucket that lets callers go into debt instead of blocking.
+
+    :meth:`reserve` takes the tokens straight away and returns how long the caller has to
+    wait for them to have existed. That keeps the bucket usable from threads and from
+    coroutines alike: the caller decides whether to ``time.sleep`` or ``asyncio.sleep``.
+    """
+
+    def __init__(self, rate: float, capacity: float, *, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, cost: float = 1.0) -> float:
+        """Take `cost` tokens and return the seconds to wait before using them."""
+        with self._lock:
+            self._refill()
+            self._tokens -= cost
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def drain(self, seconds: float) -> None:
+        """Empty the bucket so nothing is let through for `seconds`.
+
+        Called when Figma answers 429 anyway -- its view of the quota wins over ours.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class RateLimiter:
+    """Paces requests per token and per Figma rate-limit tier.
+
+    rates:  requests per `per` seconds for each tier. Defaults to :data:`DEFAULT_RATES`.
+    tiers:  operation name -> tier, merged over :data:`DEFAULT_TIERS`. Unlisted
+            operations, and paths figmapy has no method for, are tier 2.
+    costs:  operation name -> tokens one call takes. Defaults to 1.
+    burst:  bucket size as a fraction of one period's budget. 1.0 lets a cold client
+            spend a full minute's worth at once; lower it to smooth the start.
+    per:    the period `rates` are expressed over, in seconds.
+
+    A limiter can be handed to any number of :class:`~figmapy.Figma` and
+    :class:`~figmapy.AsyncFigma` instances; clients using the same token share buckets.
+    """
+
+    def __init__(
+        self,
+        rates: Mapping[int, float] | None = None,
+        *,
+        tiers: Mapping[str, int] | None = None,
+        costs: Mapping[str, float] | None = None,
+        burst: float = 1.0,
+        per: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if burst <= 0:
+            raise ValueError("burst must be positive")
+        self.rates = dict(rates or DEFAULT_RATES)
+        self.tiers = {**DEFAULT_TIERS, **(tiers or {})}
+        self.costs = dict(costs or {})
+        self.burst = burst
+        self.per = per
+        self._clock = clock
+        self._buckets: dict[tuple[str, int], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def tier(self, method: str, path: str) -> int:
+        return self.tiers.get(operation_name(method, path) or "", 2)
+
+    def bucket(self, key: str, tier: int) -> TokenBucket:
+        """The bucket for one token and tier, created on first use."""
+        with self._lock:
+            bucket = self._buckets.get((key, tier))
+            if bucket is None:
+                budget = self.rates.get(tier, self.rates.get(2, DEFAULT_RATES[2]))
+                bucket = TokenBucket(budget / self.per, budget * self.burst, clock=self._clock)
+                self._buckets[(key, tier)] = bucket
+            return bucket
+
+    def reserve(self, key: str, method: str, path: str) -> float:
+        """Account for one request and return how many seconds to wait before sending it.
+
+        `key` identifies the token; the clients pass a digest of it, never the token.
+        """
+        cost = self.costs.get(operation_name(method, path) or "", 1.0)
+        return self.bucket(key, self.tier(method, path)).reserve(cost)
+
+    def penalize(self, key: str, method: str, path: str, retry_after: float | None) -> None:
+        """Figma said 429: hold the request's tier back for `retry_after` seconds.
+
+        Without a ``Retry-After`` (or with 0), for the time the bucket takes to refill one
+        token: Figma's view of the quota is tighter than ours, so do not carry on at full rate.
+        """
+        bucket = self.bucket(key, self.tier(method, path))
+        bucket.drain(retry_after if retry_after else 1 / bucket.rate)
@@ -0,0 +1,199 @@
+"""Geometric queries over node bounds: what overlaps this frame, what is under this point.
+
+Scanning every node's ``absoluteBoundingBox`` is linear per question. :class:`SpatialIndex`
+packs the bounds of a page into an R-tree once (Sort-Tile-Recursive bulk loading: nodes
+sorted into vertical slices, then rows, then grouped bottom up), after which each query
+only opens the boxes that can contain an answer::
+
+    >>> indexes = SpatialIndex.for_pages(file)             # {page id: SpatialIndex}
+    >>> index = indexes["0:1"]
+    >>> index.intersecting(frame)                          # overlapping `frame`'s box
+    >>> index.within(frame)                                # entirely inside it
+    >>> index.at(120, 48)                                  # under a point
+    >>> index.nearest(120, 48, k=3)
+
+Every page has its own coordinate space, so an index covers one page (or any subtree of
+one), never a whole document.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+from collections.abc import Iterator
+from typing import Any
+
+from .helpers import walk
+
+__all__ = ["SpatialIndex"]
+
+# Entries and tree nodes share a layout: (x0, y0, x1, y1, payload). A leaf entry's
+# payload is (document position, node); an inner node's is a list of children.
+_Box = tuple
+
+
+class SpatialIndex:
+    """An R-tree over the bounds of every node below `root` (not `root` itself).
+
+    `bounds` picks the box: ``"absoluteBoundingBox"`` (default) or
+    ``"absoluteRenderBounds"``, which includes shadows and strokes. Nodes without one
+    (e.g. invisible nodes have no render bounds) are left out.
+
+    Query shapes -- `box` arguments -- can be a node (its `bounds`), a
+    :class:`~figmapy.models.Rectangle`, or an ``(x, y, width, height)`` tuple. Edges
+    count: boxes that only touch do intersect. Results are in document order.
+
+    It is a snapshot: build a new one after changing the tree.
+    """
+
+    def __init__(self, root: Any, *, bounds: str = "absoluteBoundingBox", leaf_size: int = 16):
+        if getattr(root, "document", None) is not None or getattr(root, "type", None) == "DOCUMENT":
+            raise ValueError(
+                "Pages have separate coordinate spaces; index one page, or use SpatialIndex.for_pages(file)"
+            )
+        if leaf_size < 2:
+            raise ValueError(f"leaf_size must be at least 2, not {leaf_size}")
+        self.root = root
+        self.bounds = bounds
+        entries = []
+        for position, node in enumerate(walk(root)):
+            box = _box(getattr(node, bounds, None))
+            if box is not None:
+                entries.append((*box, (position, node)))
+        self._size = len(entries)
+        self._tree = _pack(entries, leaf_size)
+
+    @classmethod
+    def for_pages(cls, file: Any, **kwargs: Any) -> dict[str, SpatialIndex]:
+        """One index per page of a file (or document), keyed by page id."""
+        document = getattr(file, "document", file)
+        return {page.id: cls(page, **kwargs) for page in getattr(document, "children", None) or ()}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"<SpatialIndex {getattr(self.root, 'name', '?')!r}: {self._size} nodes>"
+
+    def intersecting(self, box: Any) -> list:
+        """Nodes whose box overlaps `box`."""
+        x0, y0, x1, y1 = self._query_box(box)
+        return _in_order(self._search(lambda a, b, c, d: a <= x1 and c >= x0 and b <= y1 and d >= y0, None))
+
+    def within(self, box: Any) -> list:
+        """Nodes whose box lies entirely inside `box`."""
+        x0, y0, x1, y1 = self._query_box(box)
+        return _in_order(self._search(
+            lambda a, b, c, d: a <= x1 and c >= x0 and b <= y1 and d >= y0,
+            lambda a, b, c, d: a >= x0 and c <= x1 and b >= y0 and d <= y1,
+        ))
+
+    def containing(self, box: Any) -> list:
+        """Nodes whose box entirely covers `box`: its ancestors, and anything on top."""
+        x0, y0, x1, y1 = self._query_box(box)
+        return _in_order(self._search(lambda a, b, c, d: a <= x0 and c >= x1 and b <= y0 and d >= y1, None))
+
+    def at(self, x: float, y: float) -> list:
+        """Nodes under the point, outermost first (document order)."""
+        return _in_order(self._search(lambda a, b, c, d: a <= x <= c and b <= y <= d, None))
+
+    def nearest(self, x: float, y: float, k: int = 1) -> list:
+        """The `k` nodes closest to the point, nearest first. Inside a box is distance 0.
+
+        Ties are broken by document order.
+        """
+        if self._tree is None or k <= 0:
+            return []
+        found = []
+        # (distance², leaf?, position or tie-breaker, box): at equal distances inner
+        # boxes are opened before leaves are taken, so ties come out in document order.
+        tiebreak = itertools.count()
+        heap: list = [(0.0, 0, next(tiebreak), self._tree)]
+        while heap and len(found) < k:
+            _, is_leaf, _, item = heapq.heappop(heap)
+            if is_leaf == 1:
+                found.append(item[4][1])
+                continue
+            for child in item[4]:
+                distance = _distance2(child, x, y)
+                payload = child[4]
+                if isinstance(payload, tuple):
+                    heapq.heappush(heap, (distance, 1, payload[0], child))
+                else:
+                    heapq.heappush(heap, (distance, 0, next(tiebreak), child))
+        return found
+
+    def _query_box(self, box: Any) -> tuple[float, float, float, float]:
+        found = _box(box) if not hasattr(box, self.bounds) else _box(getattr(box, self.bounds))
+        if found is None:
+            raise ValueError(f"{box!r} has no {self.bounds}")
+        return found
+
+    def _search(self, overlaps, accept) -> Iterator[tuple[int, Any]]:
+        # `overlaps` prunes inner boxes and, without `accept`, also selects entries.
+        if self._tree is None or not overlaps(*self._tree[:4]):
+            return
+        stack = [self._tree]
+        while stack:
+            for child in stack.pop()[4]:
+                x0, y0, x1, y1, payload = child
+                if not overlaps(x0, y0, x1, y1):
+                    continue
+                if isinstance(payload, list):
+                    stack.append(child)
+                elif accept is None or accept(x0, y0, x1, y1):
+                    yield payload
+
+
+def _box(value: Any) -> tuple[float, float, float, float] | None:
+    if value is None:
+        return None
+    if isinstance(value, (tuple, list)):
+        x, y, width, height = value
+    elif isinstance(value, dict):
+        x, y, width, height = value["x"], value["y"], value["width"], value["height"]
+    else:
+        x, y, width, height = value.x, value.y, value.width, value.height
+    return (x, y, x + width, y + height)
+
+
+def _pack(entries: list[_Box], leaf_size: int) -> _Box | None:
+    if not entries:
+        return None
+    level = entries
+    while True:
+        level = _str_level(level, leaf_size)
+        if len(level) == 1:
+            return level[0]
+
+
+def _str_level(items: list[_Box], size: int) -> list[_Box]:
+    """One level of Sort-Tile-Recursive: group `items` into boxes of up to `size`."""
+    groups = math.ceil(len(items) / size)
+    slices = math.ceil(math.sqrt(groups))
+    per_slice = slices * size
+    items = sorted(items, key=lambda item: item[0] + item[2])
+    parents = []
+    for start in range(0, len(items), per_slice):
+        column = sorted(items[start:start + per_slice], key=lambda item: item[1] + item[3])
+        for group_start in range(0, len(column), size):
+            group = column[group_start:group_start + size]
+            parents.append((
+                min(item[0] for item in group),
+                min(item[1] for item in group),
+                max(item[2] for item in group),
+                max(item[3] for item in group),
+                group,
+            ))
+    return parents
+
+
+def _distance2(box: _Box, x: float, y: float) -> float:
+    dx = max(box[0] - x, 0.0, x - box[2])
+    dy = max(box[1] - y, 0.0, y - box[3])
+    return dx * dx + dy * dy
+
+
+def _in_order(found: Iterator[tuple[int, Any]]) -> list:
+    return [node for _, node in sorted(found, key=lambda entry: entry[0])]
@@ -0,0 +1,386 @@
+"""Write many variables with ``post_variables``, split into requests Figma accepts.
+
+One ``post_variables`` request takes four lists (collections, modes, variables,
+values) and applies them in that order, all or nothing. Figma rejects a request body
+over 4 MB. A token sync that writes tens of thousands of values has to be split up.
+Once it is split, a temporary id created in one request has to be replaced by its real
+id, from that request's ``tempIdToRealId``, wherever a later request refers to it.
+:class:`VariableBatch` collects the changes and does both::
+
+    >>> batch = VariableBatch(file_key)
+    >>> colors = batch.create_collection("Colors", initial_mode_id="light")
+    >>> dark = batch.create_mode(colors, "Dark")
+    >>> for name, (light_value, dark_value) in tokens.items():
+    ...     var = batch.create_variable(colors, name, "COLOR")
+    ...     batch.set_value(var, "light", light_value)
+    ...     batch.set_value(var, dark, dark_value)
+    >>> report = batch.submit(figma, progress=lambda done, total: print(done, total))
+    >>> report
+    <VariableBatchReport 60003 applied in 4 requests>
+
+The requests together apply the changes in the order one request would, and each
+request takes the longest run of changes that fits. A request Figma rejects as
+invalid is split in half and retried, down to the single change it objects to. The
+submit stops there, and the report says which change failed and why. Everything
+before that change has been applied, and everything from it on is still in the batch.
+A later ``submit`` carries on from there, with the temporary ids learned so far, and
+:meth:`VariableBatch.discard_failed` drops the failed change first if it should not
+be retried.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+from collections import Counter, deque
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from .errors import FigmaHTTPError
+from .helpers import _field
+
+__all__ = ["VARIABLE_CHANGE_KINDS", "VariableBatch", "VariableBatchReport"]
+
+#: The four lists of a ``post_variables`` body, in the order Figma applies them.
+VARIABLE_CHANGE_KINDS = ("variableCollections", "variableModes", "variables", "variableModeValues")
+
+# Figma's limit is 4 MB per request body; leave room for headers and what the estimate misses.
+MAX_REQUEST_BYTES = 3_500_000
+# Limits Figma documents per collection.
+MAX_MODES_PER_COLLECTION = 40
+MAX_MODE_NAME_LENGTH = 40
+
+# Fields that hold the id of something else, and may be a temporary id from an earlier request.
+_REFERENCES = ("variableCollectionId", "variableId", "modeId", "parentVariableCollectionId")
+# A body's fixed part: braces, the four list names, brackets and commas.
+_BODY_BYTES = 2 + sum(len(kind) + 6 for kind in VARIABLE_CHANGE_KINDS)
+
+
+class VariableBatchReport:
+    """What one :meth:`VariableBatch.submit` did.
+
+    `applied` counts the changes applied, over `requests` successful requests.
+    `temp_ids` maps every temporary id the batch has learned so far to its real id.
+    When Figma refused a request, `error` says why and `failed` holds the
+    ``(kind, change)`` pairs that request was made of. After an invalid request has
+    been split, that is the one change Figma objects to. `remaining` counts the
+    changes left in the batch, failed ones included.
+    """
+
+    def __init__(self) -> None:
+        self.applied = 0
+        self.requests = 0
+        self.temp_ids: dict[str, str] = {}
+        self.error: FigmaHTTPError | None = None
+        self.failed: list[tuple[str, dict[str, Any]]] = []
+        self.remaining = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        text = f"<VariableBatchReport {self.applied} applied in {self.requests} requests"
+        if self.error is not None:
+            text += f", stopped by {self.error!r} with {self.remaining} remaining"
+        return text + ">"
+
+
+class VariableBatch:
+    """Changes to one file's variables, submitted as few ``post_variables`` requests as fit.
+
+    max_bytes:   the largest request body to send, as encoded JSON.
+    max_changes: the most changes to send in one request. None means no limit.
+
+    The ``create_*`` methods return the new object's temporary id, which is either the
+    `id` passed in or a generated one. Anywhere a change takes an id, it can be a
+    temporary id from this batch or a real one. `fields` are further properties of a
+    change, by their API names, e.g. ``hiddenFromPublishing=True``.
+    """
+
+    def __init__(self, file_key: str, *, max_bytes: int = MAX_REQUEST_BYTES, max_changes: int | None = None):
+        if max_bytes <= _BODY_BYTES:
+            raise ValueError(f"max_bytes must be more than {_BODY_BYTES}")
+        if max_changes is not None and max_changes < 1:
+            raise ValueError("max_changes must be >= 1 or None")
+        self.file_key = file_key
+        self.max_bytes = max_bytes
+        self.max_changes = max_changes
+        #: Temporary id -> real id, for every object created by a submitted request.
+        self.temp_ids: dict[str, str] = {}
+        self._pending: dict[str, deque[dict[str, Any]]] = {kind: deque() for kind in VARIABLE_CHANGE_KINDS}
+        self._created: set[str] = set()
+        self._modes: Counter[str] = Counter()
+        self._rejected: list[tuple[str, dict[str, Any]]] = []
+        self._counter = itertools.count(1)
+
+    def __len__(self) -> int:
+        return sum(len(changes) for changes in self._pending.values())
+
+    def __repr__(self) -> str:
+        counts = ", ".join(f"{len(changes)} {kind}" for kind, changes in self._pending.items() if changes)
+        return f"<VariableBatch {self.file_key} {counts or 'empty'}>"
+
+    # -- building --------------------------------------------------------------
+
+    def create_collection(self, name: str, *, id: str | None = None, initial_mode_id: str | None = None,
+                          **fields: Any) -> str:
+        """Create a collection. Pass `initial_mode_id` to set values in the mode it starts with."""
+        change = {"action": "CREATE", "id": self._new_id(id), "name": name, **fields}
+        if initial_mode_id is not None:
+            change["initialModeId"] = initial_mode_id
+        self.add("variableCollections", change)
+        return change["id"]
+
+    def update_collection(self, id: str, **fields: Any) -> None:
+        self.add("variableCollections", {"action": "UPDATE", "id": id, **fields})
+
+    def delete_collection(self, id: str) -> None:
+        self.add("variableCollections", {"action": "DELETE", "id": id})
+
+    def create_mode(self, collection_id: str, name: str, *, id: str | None = None) -> str:
+        change = {"action": "CREATE", "id": self._new_id(id), "name": name, "variableCollectionId": collection_id}
+        self.add("variableModes", change)
+        return change["id"]
+
+    def update_mode(self, id: str, collection_id: str, **fields: Any) -> None:
+        self.add("variableModes", {"action": "UPDATE", "id": id, "variableCollectionId": collection_id, **fields})
+
+    def delete_mode(self, id: str) -> None:
+        self.add("variableModes", {"action": "DELETE", "id": id})
+
+    def create_variable(self, collection_id: str, name: str, resolved_type: str, *, id: str | None = None,
+                        **fields: Any) -> str:
+        change = {
+            "action": "CREATE", "id": self._new_id(id), "name": name,
+            "variableCollectionId": collection_id, "resolvedType": resolved_type, **fields,
+        }
+        self.add("variables", change)
+        return change["id"]
+
+    def update_variable(self, id: str, **fields: Any) -> None:
+        self.add("variables", {"action": "UPDATE", "id": id, **fields})
+
+    def delete_variable(self, id: str) -> None:
+        self.add("variables", {"action": "DELETE", "id": id})
+
+    def set_value(self, variable_id: str, mode_id: str, value: Any) -> None:
+        """Set a variable's value in one mode. None removes an overridden value.
+
+        An alias to another variable is ``{"type": "VARIABLE_ALIAS", "id": variable_id}``.
+        """
+        self.add("variableModeValues", {"variableId": variable_id, "modeId": mode_id, "value": value})
+
+    def add(self, kind: str, change: Mapping[str, Any] | Any) -> None:
+        """Add a change as Figma spells it: a dict, or one of the ``Variable*`` models."""
+        if kind not in VARIABLE_CHANGE_KINDS:
+            raise ValueError(f"kind must be one of {VARIABLE_CHANGE_KINDS}, not {kind!r}")
+        if hasattr(change, "model_dump"):
+            # exclude_unset rather than exclude_none: a value of None means "remove the override".
+            change = change.model_dump(mode="json", exclude_unset=True)
+        change = dict(change)
+        if kind == "variableModes" and change.get("action") != "DELETE":
+            self._check_mode(change)
+        if _size(change) + _BODY_BYTES > self.max_bytes:
+            raise ValueError(f"a change to {kind} is larger than max_bytes={self.max_bytes} on its own")
+        if change.get("action") == "CREATE":
+            self._claim(change.get("id"))
+            if kind == "variableCollections":
+                self._claim(change.get("initialModeId"))
+            elif kind == "variableModes":
+                self._modes[change.get("variableCollectionId")] += 1  # only once nothing else can refuse it
+        self._pending[kind].append(change)
+
+    def _new_id(self, id: str | None) -> str:
+        if id is not None:
+            return id
+        while True:
+            id = f"temp-{next(self._counter)}"
+            if id not in self._created:
+                return id
+
+    def _claim(self, id: str | None) -> None:
+        if id is None:
+            return
+        if id in self._created:
+            raise ValueError(f"temporary id {id!r} is already used in this batch")
+        self._created.add(id)
+
+    def _check_mode(self, change: Mapping[str, Any]) -> None:
+        name = change.get("name")
+        if name is not None and len(name) > MAX_MODE_NAME_LENGTH:
+            raise ValueError(f"mode name {name!r} is longer than {MAX_MODE_NAME_LENGTH} characters")
+        if change.get("action") == "CREATE":
+            collection = change.get("variableCollectionId")
+            # Every collection already has a mode (a new one, its initial mode), so 39 more at most.
+            if self._modes[collection] + 1 >= MAX_MODES_PER_COLLECTION:
+                raise ValueError(
+                    f"collection {collection!r} can not have more than {MAX_MODES_PER_COLLECTION} modes"
+                )
+
+    def discard_failed(self) -> list[tuple[str, dict[str, Any]]]:
+        """Drop the changes the last submit stopped on, so the next one goes on without them.
+
+        Returns the ``(kind, change)`` pairs dropped, as they were added. A change that
+        refers to something a dropped change would have created is not dropped with it,
+        and will fail in turn.
+        """
+        dropped = []
+        for kind, change in self._rejected:
+            pending = self._pending[kind]
+            if pending and pending[0] is change:
+                pending.popleft()
+                dropped.append((kind, change))
+                if kind == "variableModes" and change.get("action") == "CREATE":
+                    self._modes[change.get("variableCollectionId")] -= 1
+        self._rejected = []
+        return dropped
+
+    # -- submitting ------------------------------------------------------------
+
+    def request_bodies(self) -> list[dict[str, list[dict[str, Any]]]]:
+        """The request bodies `submit` would send now, if each one succeeded.
+
+        Temporary ids created in one body are left as they are in the next, because
+        their real ids are not known until the earlier request has been made.
+        """
+        return [self._body(items) for items in self._plan()]
+
+    def submit(self, figma: Any, *, progress: Callable[[int, int], None] | None = None) -> VariableBatchReport:
+        """Send the changes on a :class:`~figmapy.Figma` client, one request after another.
+
+        progress: called as ``progress(done, total)`` in changes after each request.
+        """
+        report, total = self._start()
+        while self:
+            items = self._next_items()
+            try:
+                self._send(figma, items, report, total, progress)
+            except _Stop:
+                break
+        report.remaining = len(self)
+        return report
+
+    async def asubmit(self, figma: Any, *,
+                      progress: Callable[[int, int], None] | None = None) -> VariableBatchReport:
+        """:meth:`submit` on :class:`~figmapy.AsyncFigma`. The requests still go one at a time,
+        since each may need the real ids from the one before it.
+        """
+        report, total = self._start()
+        while self:
+            items = self._next_items()
+            try:
+                await self._asend(figma, items, report, total, progress)
+            except _Stop:
+                break
+        report.remaining = len(self)
+        return report
+
+    def _start(self) -> tuple[VariableBatchReport, int]:
+        report = VariableBatchReport()
+        report.temp_ids = self.temp_ids
+        self._rejected = []
+        return report, len(self)
+
+    def _send(self, figma: Any, items: list[tuple[str, dict]], report: VariableBatchReport, total: int,
+              progress: Callable[[int, int], None] | None) -> None:
+        try:
+            response = figma.post_variables(self.file_key, **self._body(items))
+        except FigmaHTTPError as exc:
+            if len(items) > 1 and _splittable(exc):
+                half = len(items) // 2
+                self._send(figma, items[:half], report, total, progress)
+                self._send(figma, items[half:], report, total, progress)
+                return
+            raise self._failed(items, exc, report) from None
+        self._applied(items, response, report, total, progress)
+
+    async def _asend(self, figma: Any, items: list[tuple[str, dict]], report: VariableBatchReport, total: int,
+                     progress: Callable[[int, int], None] | None) -> None:
+        try:
+            response = await figma.post_variables(self.file_key, **self._body(items))
+        except FigmaHTTPError as exc:
+            if len(items) > 1 and _splittable(exc):
+                half = len(items) // 2
+                await self._asend(figma, items[:half], report, total, progress)
+                await self._asend(figma, items[half:], report, total, progress)
+                return
+            raise self._failed(items, exc, report) from None
+        self._applied(items, response, report, total, progress)
+
+    def _next_items(self) -> list[tuple[str, dict]]:
+        """The changes at the front of the batch that fit in one request."""
+        return next(self._plan())
+
+    def _plan(self) -> Any:
+        """Split the pending changes, in the order Figma applies them, into runs that fit."""
+        items: list[tuple[str, dict]] = []
+        size = _BODY_BYTES
+        for kind in VARIABLE_CHANGE_KINDS:
+            for change in self._pending[kind]:
+                cost = _size(self._resolve(change)) + 1
+                full = self.max_changes is not None and len(items) >= self.max_changes
+                if items and (full or size + cost > self.max_bytes):
+                    yield items
+                    items, size = [], _BODY_BYTES
+                items.append((kind, change))
+                size += cost
+        if items:
+            yield items
+
+    def _body(self, items: list[tuple[str, dict]]) -> dict[str, list[dict[str, Any]]]:
+        body: dict[str, list[dict[str, Any]]] = {}
+        for kind, change in items:
+            body.setdefault(kind, []).append(self._resolve(change))
+        return body
+
+    def _resolve(self, change: dict[str, Any]) -> dict[str, Any]:
+        """`change` with the temporary ids of earlier requests replaced by real ones."""
+        known = self.temp_ids
+        if not known:
+            return change
+        resolved = dict(change)
+        for field in _REFERENCES:
+            if resolved.get(field) in known:
+                resolved[field] = known[resolved[field]]
+        if resolved.get("action") in ("UPDATE", "DELETE") and resolved.get("id") in known:
+            resolved["id"] = known[resolved["id"]]
+        value = resolved.get("value")
+        if isinstance(value, dict) and value.get("type") == "VARIABLE_ALIAS" and value.get("id") in known:
+            resolved["value"] = {**value, "id": known[value["id"]]}
+        mapping = resolved.get("initialModeIdToParentModeIdMapping")
+        if mapping:
+            resolved["initialModeIdToParentModeIdMapping"] = {
+                mode: known.get(parent, parent) for mode, parent in mapping.items()
+            }
+        return resolved
+
+    def _applied(self, items: list[tuple[str, dict]], response: Any, report: VariableBatchReport, total: int,
+                 progress: Callable[[int, int], None] | None) -> None:
+        for kind, _ in items:
+            self._pending[kind].popleft()  # `items` is always the front of the batch
+        self.temp_ids.update(_field(_field(response, "meta"), "tempIdToRealId") or {})
+        report.applied += len(items)
+        report.requests += 1
+        if progress is not None:
+            progress(report.applied, total)
+
+    def _failed(self, items: list[tuple[str, dict]], exc: FigmaHTTPError, report: VariableBatchReport) -> _Stop:
+        report.error = exc
+        report.failed = [(kind, self._resolve(change)) for kind, change in items]
+        self._rejected = items
+        return _Stop()
+
+
+class _Stop(Exception):
+    """A request failed; the submit ends here."""
+
+
+def _size(change: Mapping[str, Any]) -> int:
+    """Encoded size, as httpx (>=0.28, see pyproject.toml) encodes ``json=`` bodies."""
+    return len(json.dumps(change, separators=(",", ":"), ensure_ascii=False).encode())
+
+
+def _splittable(exc: FigmaHTTPError) -> bool:
+    """Whether a smaller request might get through: Figma found the body invalid or too large."""
+    return exc.status_code in (400, 413)
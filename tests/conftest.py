@@ -43,6 +43,28 @@ def text(node_id: str, name: str, characters: str) -> dict:
     }
 
 
+def frame(node_id: str, name: str, children: list, **extra) -> dict:
+    return {
+        "id": node_id,
+        "name": name,
+        "type": "FRAME",
+        "scrollBehavior": "SCROLLS",
+        "blendMode": "PASS_THROUGH",
+        "children": children,
+        "absoluteBoundingBox": {"x": 0, "y": 0, "width": 10, "height": 10},
+        "absoluteRenderBounds": {"x": 0, "y": 0, "width": 10, "height": 10},
+        "constraints": {"vertical": "TOP", "horizontal": "LEFT"},
+        "clipsContent": True,
+        "background": [],
+        "fills": [],
+        "strokes": [],
+        "strokeWeight": 1,
+        "strokeAlign": "INSIDE",
+        "effects": [],
+        **extra,
+    }
+
+
 @pytest.fixture
 def file_payload() -> dict:
     """A realistic GET /v1/files/{key} body, trimmed to what the spec requires."""
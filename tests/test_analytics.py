@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import math
+
+import httpx
+import pytest
+
+import figmapy
+from figmapy import AnalyticsTable, library_analytics
+
+
+def team_row(week, team, insertions, workspace=None):
+    return {"week": week, "team_name": team, "workspace_name": workspace, "detachments": 1, "insertions": insertions}
+
+
+PAGES = {
+    "LIB1": [
+        {"rows": [team_row("2026-01-05", "Web", 3), team_row("2026-01-05", "iOS", 4, "Apps")],
+         "next_page": True, "cursor": "c1"},
+        {"rows": [team_row("2026-01-12", "Web", 5)], "next_page": False},
+    ],
+    "LIB2": [{"rows": [team_row("2026-01-05", "Web", 7)], "next_page": False}],
+}
+
+
+def handler(log):
+    def respond(request):
+        log.append(request)
+        key = request.url.path.split("/")[4]
+        page = 1 if request.url.params.get("cursor") == "c1" else 0
+        return httpx.Response(200, json=PAGES[key][page])
+
+    return respond
+
+
+def test_pages_of_every_file_become_one_table(make_client):
+    log = []
+    figma = make_client(handler(log))
+    table = library_analytics(figma, ["LIB1", "LIB2"], "component", "actions", group_by="team",
+                              start_date="2026-01-01")
+
+    assert table.column_names == ["file_key", "week", "team_name", "workspace_name", "detachments", "insertions"]
+    assert len(table) == 4
+    assert table.columns["file_key"] == ["LIB1", "LIB1", "LIB1", "LIB2"]
+    assert list(table.columns["insertions"]) == [3, 4, 5, 7]
+    assert table.columns["workspace_name"] == [None, "Apps", None, None]
+    assert table.columns["insertions"].typecode == "d"
+    # repeated text is one object, however many rows hold it
+    assert table.columns["team_name"][0] is table.columns["team_name"][2]
+
+    assert [r.url.path for r in log] == ["/v1/analytics/libraries/LIB1/component/actions"] * 2 + [
+        "/v1/analytics/libraries/LIB2/component/actions"]
+    assert dict(log[0].url.params) == {"group_by": "team", "start_date": "2026-01-01"}
+    assert log[1].url.params["cursor"] == "c1"
+
+
+def test_async_matches_sync(make_client):
+    log = []
+
+    async def main():
+        transport = httpx.MockTransport(handler(log))
+        async with figmapy.AsyncFigma("t", http_client=httpx.AsyncClient(transport=transport)) as figma:
+            return await figmapy.alibrary_analytics(figma, ["LIB1", "LIB2"], "component", "actions",
+                                                    group_by="team", lookahead=2)
+
+    table = asyncio.run(main())
+    expected = library_analytics(make_client(handler([])), ["LIB1", "LIB2"], "component", "actions", group_by="team")
+    assert table.to_pydict() == expected.to_pydict()
+
+
+@pytest.mark.parametrize("asset, metric, group_by, columns", [
+    ("style", "usages", "file", ["file_key", "file_name", "team_name", "workspace_name", "usages"]),
+    ("variable", "actions", "variable", ["file_key", "week", "variable_key", "variable_name", "variable_type",
+                                          "collection_key", "collection_name", "detachments", "insertions"]),
+])
+def test_columns_follow_the_endpoint(asset, metric, group_by, columns):
+    table = AnalyticsTable.for_endpoint(asset, metric, group_by)
+    assert table.column_names == columns
+    assert [name for name, kind in table.schema.items() if kind == "number"] == [
+        c for c in columns if c in ("usages", "detachments", "insertions")]
+
+
+def test_bad_arguments_are_rejected_before_any_request(make_client):
+    figma = make_client(lambda request: pytest.fail("no request expected"))
+    with pytest.raises(ValueError, match="'component' or 'file'"):
+        library_analytics(figma, "LIB1", "component", "usages", group_by="team")
+    with pytest.raises(ValueError, match="asset must be"):
+        library_analytics(figma, "LIB1", "frame", "usages", group_by="frame")
+    with pytest.raises(ValueError, match="only apply to actions"):
+        library_analytics(figma, "LIB1", "style", "usages", group_by="style", start_date="2026-01-01")
+
+
+def test_missing_numbers_are_nan_and_unknown_fields_dropped():
+    table = AnalyticsTable({"name": "text", "count": "number"})
+    table.extend([{"name": "a", "count": 2, "extra": True}, {"name": "b"}])
+    assert table.columns["name"] == ["a", "b"]
+    assert table.columns["count"][0] == 2 and math.isnan(table.columns["count"][1])
+    assert repr(table) == "<AnalyticsTable 2 rows: name, count>"
+
+
+def test_to_arrow():
+    pa = pytest.importorskip("pyarrow")
+    table = AnalyticsTable({"name": "text", "count": "number"})
+    table.extend([{"name": "a", "count": 2}, {"name": None, "count": 3.5}])
+    arrow = table.to_arrow()
+    assert arrow.schema.types == [pa.string(), pa.float64()]
+    assert arrow.to_pydict() == {"name": ["a", None], "count": [2.0, 3.5]}
+
+
+def test_to_pandas():
+    pytest.importorskip("pandas")
+    table = AnalyticsTable({"name": "text", "count": "number"})
+    table.extend([{"name": "a", "count": 2}, {"name": "a", "count": 3}])
+    frame = table.to_pandas()
+    assert frame.groupby("name")["count"].sum().to_dict() == {"a": 5.0}
+
+
+def weekly_handler(log, weekday=0, fail=None):
+    """Actions by team, one row per week that starts on `weekday` and touches the requested range."""
+
+    async def respond(request):
+        key = request.url.path.split("/")[4]
+        start = datetime.date.fromisoformat(request.url.params["start_date"])
+        end = datetime.date.fromisoformat(request.url.params["end_date"])
+        if (key, str(start)) == fail:
+            return httpx.Response(500, json={"status": 500, "err": "boom"})
+        log.append(("start", key, str(start)))
+        week = start - datetime.timedelta(days=(start.weekday() - weekday) % 7)  # rounded back, as Figma does
+        weeks = []
+        while week <= end:
+            weeks.append(str(week))
+            week += datetime.timedelta(weeks=1)
+        # two rows a page, so each shard also follows its cursor
+        page = int(request.url.params.get("cursor", 0))
+        rows = [team_row(w, "Web", 1) for w in weeks[page * 2:page * 2 + 2]]
+        await asyncio.sleep(0.001)
+        log.append(("end", key, str(start)))
+        more = page * 2 + 2 < len(weeks)
+        return httpx.Response(200, json={"rows": rows, "next_page": more, "cursor": str(page + 1) if more else None})
+
+    return respond
+
+
+def fan_out(handler, keys, **kwargs):
+    async def main():
+        transport = httpx.MockTransport(handler)
+        async with figmapy.AsyncFigma("t", http_client=httpx.AsyncClient(transport=transport), max_retries=0) as figma:
+            return await figmapy.alibrary_analytics(figma, keys, "component", "actions", group_by="team", **kwargs)
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("weekday", [0, 2, 6])
+def test_windows_are_fetched_in_parallel_and_merged_in_order(weekday):
+    log = []
+    kwargs = {"start_date": "2026-01-01", "end_date": "2026-03-31"}
+    table = fan_out(weekly_handler(log, weekday), ["LIB1", "LIB2"], window_weeks=3, concurrency=4, **kwargs)
+    whole = fan_out(weekly_handler([], weekday), ["LIB1", "LIB2"], **kwargs)
+
+    # every week once, however the windows' edges fall on Figma's weeks
+    assert table.to_pydict() == whole.to_pydict()
+    weeks = table.columns["week"]
+    assert weeks[:len(weeks) // 2] == weeks[len(weeks) // 2:] == sorted(set(weeks))
+    assert table.columns["file_key"] == ["LIB1"] * (len(weeks) // 2) + ["LIB2"] * (len(weeks) // 2)
+
+    windows = {(key, start) for event, key, start in log}
+    assert len(windows) == 2 * 5  # 13 weeks in windows of 3
+    in_flight = max_in_flight = 0
+    for event, *_ in log:
+        in_flight += 1 if event == "start" else -1
+        max_in_flight = max(max_in_flight, in_flight)
+    assert max_in_flight == 4
+
+
+def test_a_failed_shard_stops_the_pull():
+    with pytest.raises(figmapy.FigmaServerError):
+        fan_out(weekly_handler([], fail=("LIB2", "2026-01-22")), ["LIB1", "LIB2"], window_weeks=3,
+                start_date="2026-01-01", end_date="2026-03-31")
+
+
+def test_window_arguments_are_checked():
+    handler = weekly_handler([])
+    with pytest.raises(ValueError, match="needs a start_date"):
+        fan_out(handler, "LIB1", window_weeks=2)
+    with pytest.raises(ValueError, match="before start_date"):
+        fan_out(handler, "LIB1", window_weeks=2, start_date=datetime.date(2026, 2, 1), end_date="2026-01-01")
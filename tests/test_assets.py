@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from figmapy import AssetStore, models
+
+
+def server():
+    """Serve each URL path back as a PNG body, recording what was requested."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, content=request.url.path.encode(), headers={"content-type": "image/png"})
+
+    return handler, calls
+
+
+def fills(*refs, run=1):
+    # Signed URLs differ on every get_image_fills call; the refs do not.
+    return {"error": False, "status": 200, "meta": {"images": {ref: f"https://s3/{ref}/{run}" for ref in refs}}}
+
+
+def test_image_refs_are_downloaded_once(tmp_path):
+    handler, calls = server()
+    http = httpx.Client(transport=httpx.MockTransport(handler))
+    store = AssetStore(tmp_path / "assets")
+    first = store.download(fills("aaa", "bbb"), http_client=http)
+    assert list(first.paths) == ["aaa", "bbb"] and first.cached == []
+    assert first.paths["aaa"].suffix == ".png" and first.paths["aaa"].read_bytes() == b"/aaa/1"
+
+    second = store.download(fills("bbb", "aaa", "ccc", run=2), http_client=http)
+    assert second.cached == ["bbb", "aaa"]
+    assert list(second.paths) == ["bbb", "aaa", "ccc"]
+    assert second.paths["aaa"] == first.paths["aaa"]
+    assert sorted(calls) == ["/aaa/1", "/bbb/1", "/ccc/2"]
+    assert len(store) == 3 and store.size == 18
+    assert not [p for p in store.directory.iterdir() if p.name.startswith(".incoming")]
+
+
+def test_the_index_survives_reopening(tmp_path):
+    store = AssetStore(tmp_path)
+    store.put("aaa", b"png", ".png")
+    store.close()
+    reopened = AssetStore(tmp_path)
+    assert "aaa" in reopened and "zzz" not in reopened
+    assert reopened.missing(["zzz", "aaa", "yyy"]) == ["zzz", "yyy"]
+    assert reopened.path("aaa").read_bytes() == b"png"
+    reopened.delete("aaa")
+    assert reopened.path("aaa") is None and len(list(tmp_path.glob("*/*.png"))) == 0
+
+
+def test_renders_are_keyed_by_version_and_params(tmp_path):
+    handler, calls = server()
+    http = httpx.Client(transport=httpx.MockTransport(handler))
+    store = AssetStore(tmp_path)
+    renders = models.GetImagesResponse.model_validate({"err": None, "images": {"1:2": "https://s3/r1", "1:3": None}})
+    keys = {i: store.render_key("KEY", i, "42", format="svg", scale=None) for i in ("1:2", "1:3")}
+    assert keys["1:2"] == "render/KEY/1:2@42?format=svg"
+    assert keys["1:2"] != store.render_key("KEY", "1:2", "43", format="svg")
+    report = store.download(renders, keys=keys, http_client=http)
+    assert report.missing == ["1:3"]
+    assert store.path(keys["1:2"]) == report.paths["1:2"]
+    assert store.missing(keys.values()) == [keys["1:3"]]
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    store = AssetStore(tmp_path, max_bytes=10)
+    store.put("old", b"1234", ".png")
+    store.put("used", b"1234", ".png")
+    store.path("old")  # now the more recently used of the two
+    store.put("new", b"1234", ".png")
+    assert "used" not in store and "old" in store and "new" in store
+    assert store.size == 8 and len(list(tmp_path.glob("*/*.png"))) == 2
+
+
+def test_a_batch_larger_than_max_bytes_keeps_the_files_it_returns(tmp_path):
+    handler, _ = server()
+    http = httpx.Client(transport=httpx.MockTransport(handler))
+    store = AssetStore(tmp_path, max_bytes=10)
+    store.put("older", b"1234", ".png")
+    report = store.download(fills("aaa", "bbb", "ccc"), http_client=http)  # 3 x 6 bytes
+    assert all(path.exists() for path in report.paths.values())
+    assert "older" not in store and len(store) == 3
+    store.put("next", b"1", ".png")  # the next write brings it back under the limit
+    assert store.size <= 10
+
+
+def test_async_download(tmp_path):
+    handler, calls = server()
+    store = AssetStore(tmp_path)
+    store.put("aaa", b"x", ".png")
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            return await store.adownload(fills("aaa", "bbb"), http_client=http)
+
+    report = asyncio.run(main())
+    assert report.cached == ["aaa"] and calls == ["/bbb/1"]
+    assert report.paths["bbb"].read_bytes() == b"/bbb/1"
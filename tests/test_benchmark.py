@@ -0,0 +1,68 @@
+"""Parse throughput in nodes per second, on the synthetic file from tools/benchmark.py.
+
+Speed is not asserted -- machines differ too much -- but every run records it: see the
+``nodes_per_second`` properties in ``pytest --junitxml`` output. They are left out of a
+plain ``pytest`` run; ``pytest -m benchmark`` runs them.
+"""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "tools"))
+
+import benchmark  # noqa: E402
+
+import figmapy  # noqa: E402
+from figmapy import models  # noqa: E402
+from figmapy._parsing import construct_trusted  # noqa: E402
+
+PAGES, FRAMES, TEXTS = 2, 20, 25
+NODES = PAGES * FRAMES * (TEXTS + 1)
+
+
+@pytest.fixture(scope="module")
+def big_file():
+    return benchmark.synthetic_file(PAGES, FRAMES, TEXTS)
+
+
+def throughput(record_property, label, parse):
+    seconds = benchmark.best_of(3, parse)
+    record_property(f"{label}_nodes_per_second", round(NODES / seconds))
+    return parse()
+
+
+@pytest.mark.benchmark
+def test_validate_throughput(big_file, record_property):
+    file = throughput(record_property, "validate", lambda: models.GetFileResponse.model_validate(big_file))
+    assert sum(1 for _ in figmapy.walk(file)) == PAGES + NODES
+
+
+@pytest.mark.benchmark
+def test_trusted_throughput(big_file, record_property):
+    file = throughput(record_property, "trusted", lambda: construct_trusted(models.GetFileResponse, big_file))
+    assert sum(1 for _ in figmapy.walk(file)) == PAGES + NODES
+
+
+@pytest.mark.benchmark
+def test_unknown_node_types_cost_nothing_extra(big_file, record_property):
+    """One node of a type the spec lacks no longer fails the file, and does not slow it."""
+    big_file["document"]["children"][0]["children"][0]["type"] = "HOLOGRAM"
+    try:
+        file = throughput(record_property, "validate_with_unknown",
+                          lambda: models.GetFileResponse.model_validate(big_file))
+    finally:
+        big_file["document"]["children"][0]["children"][0]["type"] = "FRAME"
+    assert isinstance(file.document.children[0].children[0], models.UnknownNode)
+    assert sum(1 for _ in figmapy.walk(file)) == PAGES + NODES
+
+
+@pytest.mark.benchmark
+def test_walk_throughput(big_file, record_property):
+    file = construct_trusted(models.GetFileResponse, big_file)
+    seconds = benchmark.best_of(3, lambda: sum(1 for _ in figmapy.walk(file)))
+    record_property("walk_nodes_per_second", round((PAGES + NODES) / seconds))
+    assert list(figmapy.walk(file)) == list(benchmark.recursive_walk(file.document))
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import os
+
+import httpx
+import pytest
+
+import figmapy
+from figmapy.cache import DirectoryStore, FileCache, HTTPCache, MemoryStore, SQLiteStore
+
+
+def test_memory_store_evicts_least_recently_used_by_size():
+    store = MemoryStore(max_bytes=10)
+    store.set("a", b"aaaa")
+    store.set("b", b"bbbb")
+    store.get("a")
+    store.set("c", b"cccc")
+    assert store.get("b") is None
+    assert store.get("a") == b"aaaa"
+    assert store.size == 8
+    store.set("huge", b"x" * 11)
+    assert store.get("huge") is None
+
+
+def test_directory_store_round_trips_and_evicts(tmp_path):
+    store = DirectoryStore(tmp_path, max_bytes=400)
+    old, new = os.urandom(250), os.urandom(250)  # incompressible
+    store.set("old", old)
+    assert store.get("old") == old
+    assert store.get("missing") is None
+    os.utime(store._path("old"), (0, 0))
+    store.set("new", new)
+    assert store.get("old") is None
+    assert store.get("new") == new
+    store.delete("new")
+    assert store.get("new") is None
+
+
+def file_server(file_payload, versions):
+    """Serve /meta and the file itself; `versions` is the meta version per probe."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path.endswith("/meta"):
+            return httpx.Response(200, json={"file": {"version": versions.pop(0)}})
+        return httpx.Response(200, json=dict(file_payload, version=file_payload["version"]))
+
+    return handler, calls
+
+
+def test_unchanged_file_is_served_from_the_cache(make_client, file_payload):
+    handler, calls = file_server(file_payload, [file_payload["version"]] * 2)
+    cache = FileCache()
+    client = make_client(handler, file_cache=cache)
+
+    first = client.get_file("KEY")
+    second = client.get_file("KEY")
+    assert first.name == second.name == "Untitled"
+    assert first is not second
+    assert calls == ["/v1/files/KEY/meta", "/v1/files/KEY", "/v1/files/KEY/meta"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_new_version_is_downloaded(make_client, file_payload):
+    handler, calls = file_server(file_payload, [file_payload["version"], "newer"])
+    client = make_client(handler, file_cache=FileCache())
+    client.get_file("KEY")
+    client.get_file("KEY")
+    assert calls.count("/v1/files/KEY") == 2
+
+
+def test_params_are_part_of_the_key(make_client, file_payload):
+    handler, calls = file_server(file_payload, [file_payload["version"]] * 2)
+    client = make_client(handler, file_cache=FileCache())
+    client.get_file("KEY", depth=1)
+    client.get_file("KEY", depth=2)
+    assert calls.count("/v1/files/KEY") == 2
+
+
+def test_explicit_version_skips_the_probe(make_client, file_payload):
+    handler, calls = file_server(file_payload, [])
+    client = make_client(handler, file_cache=FileCache())
+    client.get_file("KEY", version=file_payload["version"])
+    client.get_file("KEY", version=file_payload["version"])
+    assert calls == ["/v1/files/KEY"]
+
+
+def test_failed_probe_downloads_anyway(make_client, file_payload):
+    def handler(request):
+        if request.url.path.endswith("/meta"):
+            return httpx.Response(403, json={"err": "missing scope"})
+        return httpx.Response(200, json=file_payload)
+
+    assert make_client(handler, file_cache=FileCache()).get_file("KEY").name == "Untitled"
+
+
+def test_disk_store_survives_a_new_client(make_client, file_payload, tmp_path):
+    handler, calls = file_server(file_payload, [file_payload["version"]] * 2)
+    make_client(handler, file_cache=FileCache(store=DirectoryStore(tmp_path))).get_file("KEY")
+    fresh = make_client(handler, file_cache=FileCache(store=DirectoryStore(tmp_path)))
+    assert fresh.get_file("KEY").name == "Untitled"
+    assert calls.count("/v1/files/KEY") == 1
+
+
+def test_a_shared_store_keeps_tokens_apart(file_payload, tmp_path):
+    handler, calls = file_server(file_payload, [file_payload["version"]] * 2)
+    cache = FileCache(store=DirectoryStore(tmp_path))
+    for token in ("one", "two"):
+        client = figmapy.Figma(token, http_client=httpx.Client(transport=httpx.MockTransport(handler)), file_cache=cache)
+        client.get_file("KEY")
+    assert calls.count("/v1/files/KEY") == 2
+
+
+def test_chunked_nodes_probe_the_version_once(make_client, file_payload):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path.endswith("/meta"):
+            return httpx.Response(200, json={"file": {"version": file_payload["version"]}})
+        ids = request.url.params["ids"].split(",")
+        nodes = {i: {"document": {"id": i, "name": i, "type": "FRAME"}} for i in ids}
+        return httpx.Response(200, json={**file_payload, "document": None, "nodes": nodes})
+
+    client = make_client(handler, parse=False, file_cache=FileCache(), id_chunk_size=1)
+    assert list(client.get_file_nodes("KEY", ids=["1:1", "1:2", "1:3"])["nodes"]) == ["1:1", "1:2", "1:3"]
+    assert calls.count("/v1/files/KEY/meta") == 1
+    assert calls.count("/v1/files/KEY/nodes") == 3
+
+
+def test_async_chunked_nodes_probe_the_version_once(file_payload):
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.path)
+        if request.url.path.endswith("/meta"):
+            return httpx.Response(200, json={"file": {"version": file_payload["version"]}})
+        ids = request.url.params["ids"].split(",")
+        nodes = {i: {"document": {"id": i, "name": i, "type": "FRAME"}} for i in ids}
+        return httpx.Response(200, json={**file_payload, "document": None, "nodes": nodes})
+
+    async def main():
+        transport = httpx.MockTransport(handler)
+        async with figmapy.AsyncFigma(
+            "t", http_client=httpx.AsyncClient(transport=transport), parse=False, file_cache=FileCache(), id_chunk_size=1
+        ) as figma:
+            return await figma.get_file_nodes("KEY", ids=["1:1", "1:2", "1:3"])
+
+    assert len(asyncio.run(main())["nodes"]) == 3
+    assert calls.count("/v1/files/KEY/meta") == 1
+
+
+@pytest.mark.parametrize("operations", [None, {"get_file_meta"}])
+def test_http_cache_does_not_answer_the_file_cache_probe(make_client, file_payload, operations):
+    current = ["1"]
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path.endswith("/meta"):
+            return httpx.Response(200, json={"file": {"version": current[0]}})
+        return httpx.Response(200, json=dict(file_payload, version=current[0]))
+
+    client = make_client(handler, file_cache=FileCache(), http_cache=HTTPCache(operations=operations))
+    assert client.get_file("KEY").version == "1"
+    current[0] = "2"
+    assert client.get_file("KEY").version == "2"
+    assert calls.count("/v1/files/KEY/meta") == 2
+
+
+def test_http_cache_leaves_out_files_and_fast_changing_gets_by_default():
+    cache = HTTPCache()
+    assert cache.applies_to("get_team_components")
+    assert not any(map(cache.applies_to, ["get_file", "get_file_nodes", "get_file_meta", "get_comments"]))
+
+
+def test_sqlite_store_round_trips_and_evicts(tmp_path):
+    store = SQLiteStore(tmp_path / "cache.db", max_bytes=400)
+    old, new = os.urandom(250), os.urandom(250)
+    store.set("old", old)
+    assert store.get("old") == old
+    store.set("new", new)
+    assert store.get("old") is None
+    assert store.get("new") == new
+    store.close()
+
+
+STYLES = {"status": 200, "error": False, "meta": {"styles": []}}
+
+
+def etag_server(calls):
+    def handler(request):
+        calls.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, headers={"ETag": '"v1"'}, json=STYLES)
+
+    return handler
+
+
+def test_http_cache_revalidates_with_the_etag(make_client, tmp_path):
+    calls = []
+    cache = HTTPCache(SQLiteStore(tmp_path / "cache.db"), max_age=0)
+    client = make_client(etag_server(calls), http_cache=cache)
+
+    first = client.get_file_styles("KEY")
+    second = client.get_file_styles("KEY")
+    assert first.meta == second.meta
+    assert calls == [None, '"v1"']
+    assert (cache.misses, cache.revalidated) == (1, 1)
+
+
+def test_http_cache_max_age_skips_the_request(make_client):
+    calls = []
+    cache = HTTPCache(max_age=60)
+    client = make_client(etag_server(calls), http_cache=cache)
+    client.get_file_styles("KEY")
+    client.get_file_styles("KEY")
+    assert calls == [None]
+    assert cache.hits == 1
+
+
+def test_http_cache_defaults_to_max_age_without_validators(make_client):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json=STYLES)  # no ETag, no Last-Modified: what the spec documents
+
+    cache = HTTPCache()
+    client = make_client(handler, http_cache=cache)
+    client.get_file_styles("KEY")
+    client.get_file_styles("KEY")
+    assert len(calls) == 1 and cache.hits == 1
+
+
+def test_http_cache_without_max_age_warns_that_it_stores_nothing(make_client):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json=STYLES)
+
+    client = make_client(handler, http_cache=HTTPCache(max_age=0))
+    with pytest.warns(UserWarning, match="stores nothing") as caught:
+        client.get_file_styles("KEY")
+    assert caught[0].filename == __file__
+    client.get_file_styles("KEY")  # warned once per cache
+    assert len(calls) == 2
+
+
+def test_http_cache_is_limited_to_the_given_operations(make_client):
+    calls = []
+    client = make_client(etag_server(calls), http_cache=HTTPCache(operations={"get_team_styles"}))
+    client.get_file_styles("KEY")
+    client.get_file_styles("KEY")
+    assert calls == [None, None]
+
+
+def test_async_http_cache(tmp_path):
+    calls = []
+
+    async def main():
+        transport = httpx.MockTransport(etag_server(calls))
+        async with figmapy.AsyncFigma(
+            "t", http_client=httpx.AsyncClient(transport=transport), http_cache=HTTPCache(DirectoryStore(tmp_path), max_age=0)
+        ) as figma:
+            await figma.get_file_styles("KEY")
+            return await figma.get_file_styles("KEY")
+
+    assert asyncio.run(main()).meta.styles == []
+    assert calls == [None, '"v1"']
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import asyncio
+import json
+import threading
+import time
+import warnings
 
 import httpx
 import pytest
 
 import figmapy
+from figmapy import _decode
 from figmapy.errors import (
     FigmaAuthError,
     FigmaError,
@@ -101,6 +106,170 @@ def test_body_drops_unset_fields(make_client):
     assert '"message": "hi"' in seen["body"] or '"message":"hi"' in seen["body"]
 
 
+# -- chunking long ids lists -------------------------------------------------
+
+
+def render(fail=()):
+    """A get_images handler that renders every id except those in `fail`, recording requests."""
+    requests = []
+
+    def handler(request):
+        ids = request.url.params["ids"].split(",")
+        requests.append(ids)
+        if any(i in fail for i in ids):
+            return httpx.Response(400, json={"status": 400, "err": "Render timeout"})
+        return httpx.Response(200, json={"err": None, "images": {i: f"https://img/{i}" for i in ids}})
+
+    return handler, requests
+
+
+def test_long_ids_lists_are_split_and_merged(make_client):
+    handler, requests = render()
+    ids = [f"1:{i}" for i in range(5)]
+    result = make_client(handler, id_chunk_size=2).get_images("KEY", ids=ids + ["1:0"], format="svg")
+    assert requests == [["1:0", "1:1"], ["1:2", "1:3"], ["1:4"]]
+    assert list(result.images) == ids
+    assert result.images["1:4"] == "https://img/1:4"
+
+
+def test_chunks_fit_in_a_url(make_client):
+    seen = []
+
+    def handler(request):
+        seen.append(request.url)
+        ids = request.url.params["ids"].split(",")
+        return httpx.Response(200, json={"err": None, "images": dict.fromkeys(ids, "u")})
+
+    ids = [f"I{i};{'9' * 40}:{i}" for i in range(400)]
+    result = make_client(handler).get_images("KEY", ids=",".join(ids))
+    assert len(seen) > 2 and all(len(str(url)) <= figmapy.client.MAX_URL_LENGTH for url in seen)
+    assert list(result.images) == ids
+
+
+@pytest.mark.parametrize("parse", [True, False])
+@pytest.mark.parametrize("null_chunk", [0, 1])
+def test_a_chunk_with_a_null_map_merges_as_empty(make_client, parse, null_chunk):
+    chunks = []
+
+    def handler(request):
+        ids = request.url.params["ids"].split(",")
+        chunks.append(ids)
+        images = None if len(chunks) - 1 == null_chunk else dict.fromkeys(ids, "u")
+        return httpx.Response(200, json={"err": None, "images": images})
+
+    client = make_client(handler, parse=parse, id_chunk_size=2)
+    if parse:  # the spec has no null map, so that chunk is a raw dict, with a warning
+        with pytest.warns(figmapy.FigmaSpecWarning):
+            result = client.get_images("KEY", ids=["1:1", "1:2", "1:3", "1:4"])
+    else:
+        result = client.get_images("KEY", ids=["1:1", "1:2", "1:3", "1:4"])
+    images = result["images"] if isinstance(result, dict) else result.images
+    assert images == dict.fromkeys(chunks[1 - null_chunk], "u")
+
+
+def test_a_failing_chunk_is_halved_until_the_bad_id_is_alone(make_client):
+    handler, requests = render(fail={"1:5"})
+    with pytest.warns(figmapy.FigmaPartialResultWarning, match="1:5") as caught:
+        result = make_client(handler, id_chunk_size=4).get_images("KEY", ids=[f"1:{i}" for i in range(8)])
+    assert list(caught[0].message.failed) == ["1:5"] and caught[0].filename == __file__
+    assert isinstance(caught[0].message.failed["1:5"], FigmaError)
+    assert result.images["1:5"] is None
+    assert [i for i, url in result.images.items() if url] == ["1:0", "1:1", "1:2", "1:3", "1:4", "1:6", "1:7"]
+    assert ["1:5"] in requests and len(requests) == 6
+
+
+def test_failed_ids_can_fail_the_call(make_client):
+    handler, _ = render(fail={"1:1"})
+    client = make_client(handler, id_chunk_size=1)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", figmapy.FigmaPartialResultWarning)
+        with pytest.raises(figmapy.FigmaPartialResultWarning) as raised:
+            client.get_images("KEY", ids=["1:0", "1:1"])
+    assert list(raised.value.failed) == ["1:1"]
+
+
+def test_errors_about_the_file_are_not_retried_per_chunk(make_client):
+    calls = []
+
+    def handler(request):
+        calls.append(1)
+        return httpx.Response(404, json={"status": 404, "err": "Not found"})
+
+    with pytest.raises(FigmaNotFoundError):
+        make_client(handler, id_chunk_size=2).get_images("KEY", ids=["1:1", "1:2", "1:3"])
+    assert len(calls) == 1
+
+
+def test_nothing_rendering_is_an_error(make_client):
+    handler, _ = render(fail={"1:1", "1:2", "1:3"})
+    with pytest.raises(FigmaError, match="Render timeout"):
+        make_client(handler, id_chunk_size=2).get_images("KEY", ids=["1:1", "1:2", "1:3"])
+
+
+def test_file_nodes_are_merged_as_dicts(make_client, file_payload):
+    def handler(request):
+        ids = request.url.params["ids"].split(",")
+        nodes = {i: {"document": {"id": i, "name": i, "type": "FRAME"}} for i in ids}
+        return httpx.Response(200, json={**file_payload, "document": None, "nodes": nodes})
+
+    result = make_client(handler, parse=False, id_chunk_size=1).get_file_nodes("KEY", ids=["1:1", "1:2"])
+    assert list(result["nodes"]) == ["1:1", "1:2"]
+
+
+def test_async_chunks_stop_when_one_fails_for_good():
+    finished, cancelled = [], []
+
+    async def handler(request):
+        ids = request.url.params["ids"]
+        if ids == "1:1":
+            return httpx.Response(403, json={"status": 403, "err": "Forbidden"})
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(ids)
+            raise
+        finished.append(ids)
+        return httpx.Response(200, json={"err": None, "images": {ids: "u"}})
+
+    async def main():
+        transport = httpx.MockTransport(handler)
+        async with figmapy.AsyncFigma(
+            "t", http_client=httpx.AsyncClient(transport=transport), id_chunk_size=1
+        ) as figma:
+            with pytest.raises(figmapy.FigmaAuthError):
+                await figma.get_images("KEY", ids=["1:1", "1:2", "1:3"])
+            return sorted(cancelled)  # already, not when the loop shuts down
+
+    assert asyncio.run(main()) == ["1:2", "1:3"] and not finished
+
+
+def test_async_chunks_are_sent_concurrently():
+    in_flight, peak = [0], [0]
+
+    async def handler(request):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        ids = request.url.params["ids"].split(",")
+        if "1:3" in ids:
+            return httpx.Response(500, json={"status": 500, "err": "Internal error"})
+        return httpx.Response(200, json={"err": None, "images": dict.fromkeys(ids, "u")})
+
+    async def main():
+        transport = httpx.MockTransport(handler)
+        async with figmapy.AsyncFigma(
+            "t", http_client=httpx.AsyncClient(transport=transport), id_chunk_size=2, max_retries=0
+        ) as figma:
+            return await figma.get_images("KEY", ids=[f"1:{i}" for i in range(8)])
+
+    with pytest.warns(figmapy.FigmaPartialResultWarning):
+        result = asyncio.run(main())
+    assert peak[0] > 1
+    assert list(result.images) == ["1:0", "1:1", "1:2", "1:4", "1:5", "1:6", "1:7", "1:3"]
+    assert result.images["1:3"] is None
+
+
 # -- errors -----------------------------------------------------------------
 
 
@@ -175,6 +344,40 @@ def test_schema_mismatch_warns_and_returns_raw_dict(make_client, file_payload):
     assert result["name"] == "Untitled"
 
 
+@pytest.mark.parametrize("path", ["plain", "file_cache", "chunked"])
+def test_schema_mismatch_warning_points_at_the_caller(make_client, file_payload, path):
+    del file_payload["role"]
+
+    def handler(request):
+        if request.url.path.endswith("/meta"):
+            return httpx.Response(200, json={"file": {"version": file_payload["version"]}})
+        if request.url.path.endswith("/nodes"):
+            return httpx.Response(200, json={**file_payload, "nodes": {}})
+        return httpx.Response(200, json=file_payload)
+
+    with pytest.warns(FigmaSpecWarning) as caught:
+        if path == "plain":
+            make_client(handler).get_file("KEY")
+        elif path == "file_cache":
+            make_client(handler, file_cache=figmapy.FileCache()).get_file("KEY")
+        else:
+            make_client(handler, id_chunk_size=1, file_cache=figmapy.FileCache()).get_file_nodes("KEY", ids=["1:1", "1:2"])
+    assert caught and all(warning.filename == __file__ for warning in caught)
+
+
+def test_async_schema_mismatch_warning_points_at_the_caller(file_payload):
+    del file_payload["role"]
+
+    async def main():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=file_payload))
+        async with figmapy.AsyncFigma("t", http_client=httpx.AsyncClient(transport=transport)) as figma:
+            with pytest.warns(FigmaSpecWarning) as caught:
+                await figma.get_file("KEY")
+        return caught
+
+    assert asyncio.run(main())[0].filename == __file__
+
+
 def test_strict_mode_raises_on_schema_mismatch(make_client, file_payload):
     del file_payload["role"]
     with pytest.raises(FigmaValidationError):
@@ -186,6 +389,48 @@ def test_parse_false_always_returns_dicts(make_client, file_payload):
     assert isinstance(result, dict)
 
 
+# -- decoders ----------------------------------------------------------------
+
+
+@pytest.mark.parametrize("decoder", ["auto", "pydantic", "json"])
+def test_decoders_give_the_same_models(make_client, file_payload, decoder):
+    expected = figmapy.models.GetFileResponse.model_validate(file_payload)
+    file = make_client(json_ok(file_payload), decoder=decoder).get_file("KEY")
+    assert file.model_dump(warnings=False) == expected.model_dump(warnings=False)
+
+
+def test_orjson_decoder(make_client, file_payload):
+    pytest.importorskip("orjson")
+    assert make_client(json_ok(file_payload), decoder="orjson").get_file("KEY").name == "Untitled"
+
+
+def test_decoder_can_be_any_callable(make_client, file_payload):
+    seen = []
+
+    def loads(body):
+        seen.append(len(body))
+        return json.loads(body)
+
+    file = make_client(json_ok(file_payload), decoder=loads).get_file("KEY")
+    assert file.name == "Untitled"
+    assert seen
+
+
+def test_one_pass_decoding_still_warns_with_the_raw_dict(make_client, file_payload):
+    del file_payload["role"]
+    with pytest.warns(FigmaSpecWarning):
+        result = make_client(json_ok(file_payload), decoder="pydantic").get_file("KEY")
+    assert result["name"] == "Untitled"
+
+
+def test_bad_decoder_is_rejected(monkeypatch):
+    with pytest.raises(ValueError, match="decoder"):
+        figmapy.Figma("t", decoder="simdjson")
+    monkeypatch.setattr(_decode, "orjson", None)
+    with pytest.raises(ImportError, match="fast"):
+        figmapy.Figma("t", decoder="orjson")
+
+
 def test_raw_request_escape_hatch(make_client):
     seen = {}
 
@@ -259,3 +504,77 @@ def test_async_retries(file_payload):
 
     assert asyncio.run(main()).name == "Untitled"
     assert len(calls) == 2
+
+
+# -- coalescing ---------------------------------------------------------------
+
+
+def test_coalesce_shares_one_request_between_threads(make_client, file_payload):
+    calls = []
+    release = threading.Event()
+
+    def handler(request):
+        calls.append(str(request.url))
+        release.wait(5)
+        return httpx.Response(200, json=file_payload)
+
+    client = make_client(handler, coalesce=True)
+    results = []
+    start = threading.Barrier(5)
+
+    def call():
+        start.wait(5)
+        results.append(client.get_file("KEY"))
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while client._flights._waiting() < 4:  # the leader is in the handler, the rest wait on it
+        assert time.monotonic() < deadline, "callers never joined the flight"
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert [f.name for f in results] == ["Untitled"] * 5
+    assert len({id(f) for f in results}) == 5  # one response, but a model per caller
+
+
+def test_async_coalesce_dedupes_identical_gets_only(file_payload):
+    calls = []
+
+    async def handler(request):
+        calls.append((request.method, str(request.url)))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=file_payload)
+
+    async def main():
+        transport = httpx.MockTransport(handler)
+        async with figmapy.AsyncFigma(
+            "t", http_client=httpx.AsyncClient(transport=transport), coalesce=True
+        ) as figma:
+            await asyncio.gather(
+                *(figma.get_file("KEY", depth=1) for _ in range(5)),
+                figma.get_file("KEY", depth=2),
+            )
+            await figma.get_file("KEY", depth=1)  # the first flight has landed: sent again
+
+    asyncio.run(main())
+    assert len(calls) == 3
+
+
+def test_coalesced_errors_reach_every_caller(file_payload):
+    async def handler(request):
+        await asyncio.sleep(0.01)
+        return httpx.Response(404, json={"err": "gone"})
+
+    async def main():
+        transport = httpx.MockTransport(handler)
+        async with figmapy.AsyncFigma(
+            "t", http_client=httpx.AsyncClient(transport=transport), coalesce=True
+        ) as figma:
+            return await asyncio.gather(*(figma.get_file("KEY") for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(r, FigmaNotFoundError) for r in asyncio.run(main()))
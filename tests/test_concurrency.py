@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+import figmapy
+from figmapy.concurrency import AIMDConcurrency
+
+
+def test_window_grows_on_fast_successes_and_halves_on_429():
+    async def main():
+        policy = AIMDConcurrency(initial=2, maximum=4)
+        for _ in range(10):
+            await policy.acquire()
+            policy.release(200, 0.1)
+        grown = policy.window
+        await policy.acquire()
+        policy.release(429, 0.1)
+        return grown, policy.window
+
+    assert asyncio.run(main()) == (4, 2)
+
+
+def test_slow_successes_hold_the_window():
+    async def main():
+        policy = AIMDConcurrency(initial=2)
+        await policy.acquire()
+        policy.release(200, 0.1)
+        for _ in range(10):
+            await policy.acquire()
+            policy.release(200, 1.0)  # ten times slower than the best seen
+        return policy.window
+
+    assert asyncio.run(main()) == 2
+
+
+def test_failures_from_one_window_shrink_it_once():
+    async def main():
+        policy = AIMDConcurrency(initial=8)
+        for _ in range(4):
+            await policy.acquire()
+        for _ in range(4):
+            policy.release(503, 10.0)
+        return policy.window
+
+    assert asyncio.run(main()) == 4
+
+
+def test_client_never_exceeds_the_window(file_payload):
+    active = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return httpx.Response(200, json=file_payload)
+
+    async def main():
+        policy = AIMDConcurrency(initial=3, maximum=3)
+        transport = httpx.MockTransport(handler)
+        async with figmapy.AsyncFigma(
+            "t", http_client=httpx.AsyncClient(transport=transport), concurrency=policy
+        ) as figma:
+            files = await asyncio.gather(*(figma.get_file(f"K{i}") for i in range(20)))
+        return files, policy
+
+    files, policy = asyncio.run(main())
+    assert len(files) == 20
+    assert peak == 3
+    assert policy.in_flight == 0
+
+
+def test_cancelled_and_local_failures_leave_the_window_alone():
+    started = asyncio.Event()
+
+    async def handler(request):
+        if request.url.path.endswith("/timeout"):
+            raise httpx.ReadTimeout("slow", request=request)
+        started.set()
+        await asyncio.sleep(10)
+
+    async def main():
+        policy = AIMDConcurrency(initial=4)
+        transport = httpx.MockTransport(handler)
+        async with figmapy.AsyncFigma(
+            "t", http_client=httpx.AsyncClient(transport=transport), concurrency=policy, max_retries=0
+        ) as figma:
+            task = asyncio.ensure_future(figma.get_file("KEY"))
+            await started.wait()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            try:
+                await figma.request("POST", "/v1/files/KEY/comments", json_body={"message": object()})
+            except TypeError:
+                pass
+            untouched = policy.window, policy.in_flight
+            try:
+                await figma.request("GET", "/v1/timeout")
+            except httpx.ReadTimeout:
+                pass
+        return untouched, policy.window
+
+    assert asyncio.run(main()) == ((4, 0), 2)  # only the timeout shrinks it
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import figmapy
+from figmapy import TeamCrawler
+
+USER = {"id": "1", "handle": "a", "img_url": ""}
+
+
+def folder(folder_id, name, parent=None):
+    return {"id": folder_id, "name": name, "parent_folder_id": parent}
+
+
+def listed(key):
+    return {"key": key, "name": key.upper(), "last_modified": "2026-01-01T00:00:00Z"}
+
+
+# Team T: Design (files a, b; subfolder Icons with file c) and Private, which 403s.
+ROUTES = {
+    "/v2/teams/T/folders": {"name": "Team", "folders": [folder("F1", "Design"), folder("F2", "Private")]},
+    "/v2/folders/F1/folders": {"name": "Design", "folders": [folder("F3", "Icons", "F1")]},
+    "/v2/folders/F1/files": {"name": "Design", "files": [listed("a"), listed("b")]},
+    "/v2/folders/F3/folders": {"name": "Icons", "folders": []},
+    "/v2/folders/F3/files": {"name": "Icons", "files": [listed("c")]},
+    "/v1/teams/T/projects": {"name": "Team", "projects": [{"id": "P1", "name": "Old"}]},
+    "/v1/projects/P1/files": {"name": "Old", "files": [listed("d")]},
+}
+
+
+def team(calls, *, fail_meta=(), delay=0.0):
+    in_flight, peak = [0], [0]
+
+    async def handler(request):
+        path = request.url.path
+        calls.append(path)
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(delay)
+        in_flight[0] -= 1
+        if path.startswith("/v1/files/"):
+            key = path.split("/")[3]
+            if key in fail_meta:
+                return httpx.Response(404, json={"status": 404, "err": "Not found"})
+            return httpx.Response(200, json={"file": {"name": key, "last_touched_at": "2026-01-01T00:00:00Z",
+                                                      "creator": USER, "editorType": "figma", "version": "7"}})
+        if path in ROUTES:
+            return httpx.Response(200, json=ROUTES[path])
+        return httpx.Response(403, json={"status": 403, "err": "Forbidden"})
+
+    return handler, peak
+
+
+def run(crawler_args, handler, stop_after=None, **kwargs):
+    async def main():
+        transport = httpx.MockTransport(handler)
+        async with figmapy.AsyncFigma("t", http_client=httpx.AsyncClient(transport=transport), max_retries=0) as figma:
+            crawler = TeamCrawler(figma, *crawler_args, **kwargs)
+            found = []
+            async for file in crawler:
+                if stop_after is not None and len(found) == stop_after:
+                    raise KeyboardInterrupt  # the crash, while processing the next file
+                found.append(file)
+            return crawler, found
+
+    return asyncio.run(main())
+
+
+def test_crawls_folders_subfolders_and_meta():
+    calls = []
+    handler, _ = team(calls, fail_meta={"b"})
+    crawler, found = run(["T"], handler)
+    by_key = {f.key: f for f in found}
+    assert sorted(by_key) == ["a", "b", "c"]
+    assert by_key["c"].folder_path == ("Design", "Icons") and by_key["c"].folder_id == "F3"
+    assert by_key["a"].meta.version == "7" and by_key["a"].name == "A"
+    assert by_key["b"].meta is None and isinstance(by_key["b"].error, figmapy.FigmaNotFoundError)
+    assert list(crawler.errors) == ["F2"]
+
+
+def test_requests_run_concurrently_up_to_the_limit():
+    handler, peak = team([], delay=0.01)
+    run(["T"], handler, concurrency=2)
+    assert peak[0] == 2
+
+
+def test_without_meta_and_with_the_projects_api():
+    calls = []
+    handler, _ = team(calls)
+    _, found = run(["T"], handler, api="projects", meta=False)
+    assert [(f.key, f.folder_path, f.meta) for f in found] == [("d", ("Old",), None)]
+    assert not any(call.startswith("/v1/files/") for call in calls)
+
+
+def test_resumes_from_the_checkpoint(tmp_path):
+    checkpoint = tmp_path / "crawl.json"
+    calls = []
+    handler, _ = team(calls)
+    with pytest.raises(KeyboardInterrupt):
+        run(["T"], handler, stop_after=1, concurrency=1, checkpoint=checkpoint)
+    first = calls.copy()
+    state = json.loads(checkpoint.read_text())
+    assert len(state["done"]) == 1 and state["roots"] == ["F1", "F2"]
+
+    calls.clear()
+    _, found = run(["T"], handler, concurrency=1, checkpoint=checkpoint)
+    assert sorted([f.key for f in found] + state["done"]) == ["a", "b", "c"]
+    assert "/v2/teams/T/folders" not in calls
+    assert not set(calls) & {p for p in first if p.startswith("/v2/folders/F1")}
+
+    calls.clear()
+    _, found = run(["T"], handler, checkpoint=checkpoint)
+    assert found == [] and all(call.startswith("/v2/folders/F2") for call in calls)
+
+
+def test_a_checkpoint_for_another_team_is_refused(tmp_path):
+    checkpoint = tmp_path / "crawl.json"
+    run(["T"], team([])[0], checkpoint=checkpoint)
+    with pytest.raises(ValueError, match="team T"):
+        TeamCrawler(object(), "U", checkpoint=checkpoint)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import copy
+
+import pytest
+from conftest import canvas, frame, text
+
+from figmapy import diff_files, models
+
+
+@pytest.fixture
+def payload(file_payload):
+    file_payload["document"]["children"] = [
+        canvas("0:1", "Page 1", [
+            frame("2:1", "Card", [text("2:2", "Label", "Buy"), text("2:3", "Price", "$5")]),
+            text("1:2", "Title", "Hello"),
+        ]),
+        canvas("0:2", "Page 2", [frame("3:1", "Empty", [])]),
+    ]
+    return file_payload
+
+
+def nodes(payload):
+    """id -> node dict, to edit a copy of the payload in place."""
+    out, stack = {}, [payload["document"]]
+    while stack:
+        node = stack.pop()
+        out[node["id"]] = node
+        stack.extend(node.get("children", []))
+    return out
+
+
+def diff(old, new, **kwargs):
+    return diff_files(models.GetFileResponse.model_validate(old), models.GetFileResponse.model_validate(new),
+                      **kwargs)
+
+
+def summary(result):
+    return [(change.kind, change.id, sorted(change.fields)) for change in result]
+
+
+def test_identical_versions(payload):
+    result = diff(payload, copy.deepcopy(payload))
+    assert not result and len(result) == 0
+
+
+def test_changed_fields(payload):
+    new = copy.deepcopy(payload)
+    nodes(new)["2:2"]["characters"] = "Buy now"
+    nodes(new)["3:1"]["name"] = "Still empty"
+    result = diff(payload, new)
+    assert summary(result) == [("changed", "2:2", ["characters"]), ("changed", "3:1", ["name"])]
+    assert result.changed[0].fields["characters"] == ("Buy", "Buy now")
+    assert result.changed[0].old.characters == "Buy" and result.changed[0].new.characters == "Buy now"
+
+
+def test_added_and_removed_subtrees(payload):
+    new = copy.deepcopy(payload)
+    page1 = nodes(new)["0:1"]
+    page1["children"] = [page1["children"][1]]  # drop the Card frame and both its texts
+    nodes(new)["3:1"]["children"].append(text("3:2", "New", "Hi"))
+    result = diff(payload, new)
+    assert summary(result) == [
+        ("removed", "2:1", []), ("removed", "2:2", []), ("removed", "2:3", []), ("added", "3:2", []),
+    ]
+    assert [c.id for c in result.removed] == ["2:1", "2:2", "2:3"]
+    assert result.added[0].new_parent == "3:1"
+
+
+def test_moves(payload):
+    new = copy.deepcopy(payload)
+    by_id = nodes(new)
+    price = by_id["2:1"]["children"].pop()
+    price["characters"] = "$6"
+    by_id["3:1"]["children"].append(price)
+    result = diff(payload, new)
+    assert summary(result) == [("moved", "2:3", ["characters"])]
+    assert (result.moved[0].old_parent, result.moved[0].new_parent) == ("2:1", "3:1")
+    assert result.changed == result.moved
+
+
+def test_grouping_is_an_add_and_a_move(payload):
+    new = copy.deepcopy(payload)
+    page1 = nodes(new)["0:1"]
+    title = page1["children"].pop()
+    page1["children"].append(frame("4:1", "Group", [title]))
+    assert summary(diff(payload, new)) == [("added", "4:1", []), ("moved", "1:2", [])]
+
+
+def test_reordering_children(payload):
+    new = copy.deepcopy(payload)
+    nodes(new)["2:1"]["children"].reverse()
+    result = diff(payload, new)
+    assert summary(result) == [("changed", "2:1", ["children"])]
+    assert result.changed[0].fields["children"] == (["2:2", "2:3"], ["2:3", "2:2"])
+
+
+def test_ignore(payload):
+    new = copy.deepcopy(payload)
+    nodes(new)["1:2"]["absoluteRenderBounds"] = {"x": 1, "y": 1, "width": 10, "height": 10}
+    assert summary(diff(payload, new)) == [("changed", "1:2", ["absoluteRenderBounds"])]
+    assert not diff(payload, new, ignore={"absoluteRenderBounds"})
+
+
+def test_plain_dicts_give_the_same_changes(payload):
+    new = copy.deepcopy(payload)
+    by_id = nodes(new)
+    by_id["2:2"]["characters"] = "Sale"
+    by_id["3:1"]["children"].append(by_id["2:1"]["children"].pop())
+    assert summary(diff_files(payload, new)) == summary(diff(payload, new))
+
+
+def test_deep_trees_do_not_recurse():
+    def chain(depth, leaf):
+        root = node = {"id": "0", "children": []}
+        for i in range(1, depth):
+            child = {"id": str(i), "children": []}
+            node["children"].append(child)
+            node = child
+        node["name"] = leaf
+        return root
+
+    result = diff_files(chain(5000, "a"), chain(5000, "b"))
+    assert summary(result) == [("changed", "4999", ["name"])]
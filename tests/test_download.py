@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from figmapy import adownload_images, download_images, models
+
+
+def serve(bodies, *, flaky=(), expired=()):
+    """A handler serving `bodies` by URL path; `flaky` paths fail once with a 503 first."""
+    calls = []
+
+    def handler(request):
+        path = request.url.path
+        calls.append(path)
+        if path in expired:
+            return httpx.Response(403, text="Request has expired")
+        if path in flaky and calls.count(path) == 1:
+            return httpx.Response(503, headers={"Retry-After": "0"})
+        content_type = "image/svg+xml" if path.endswith("svg") else "image/png"
+        return httpx.Response(200, content=bodies[path], headers={"content-type": content_type})
+
+    return handler, calls
+
+
+def client(handler):
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+def test_downloads_a_get_images_response(tmp_path):
+    handler, _ = serve({"/a.svg": b"<svg/>", "/b.svg": b"<svg></svg>"})
+    renders = models.GetImagesResponse.model_validate(
+        {"err": None, "images": {"1:2": "https://s3/a.svg", "1:3": "https://s3/b.svg", "1:4": None}}
+    )
+    progress = []
+    report = download_images(renders, tmp_path / "out", http_client=client(handler),
+                             progress=lambda done, total: progress.append((done, total)))
+    assert report.paths == {"1:2": tmp_path / "out" / "1-2.svg", "1:3": tmp_path / "out" / "1-3.svg"}
+    assert report.paths["1:3"].read_bytes() == b"<svg></svg>"
+    assert report.missing == ["1:4"] and not report.failed
+    assert report.bytes == 17
+    assert progress == [(1, 2), (2, 2)]
+
+
+def test_image_fills_and_names(tmp_path):
+    handler, _ = serve({"/fill": b"\x89PNG"})
+    fills = {"error": False, "status": 200, "meta": {"images": {"abc123": "https://s3/fill"}}}
+    report = download_images(fills, tmp_path, names={"abc123": "Hero / background"},
+                             http_client=client(handler))
+    assert report.paths["abc123"] == tmp_path / "Hero_background.png"
+    assert report.paths["abc123"].read_bytes() == b"\x89PNG"
+
+
+def test_transient_failures_are_retried_and_expired_urls_are_not(tmp_path):
+    handler, calls = serve({"/a.png": b"a", "/b.png": b"b"}, flaky={"/a.png"}, expired={"/b.png"})
+    report = download_images({"1:1": "https://s3/a.png", "1:2": "https://s3/b.png"}, tmp_path,
+                             http_client=client(handler))
+    assert list(report.paths) == ["1:1"]
+    assert calls.count("/a.png") == 2 and calls.count("/b.png") == 1
+    assert isinstance(report.failed["1:2"], httpx.HTTPStatusError)
+    assert "403" in str(report.failed["1:2"])
+
+
+def test_a_broken_stream_leaves_no_file(tmp_path):
+    def handler(request):
+        raise httpx.ReadError("connection reset", request=request)
+
+    report = download_images({"1:1": "https://s3/a.png"}, tmp_path, http_client=client(handler), max_retries=0)
+    assert isinstance(report.failed["1:1"], httpx.ReadError)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_bad_concurrency(tmp_path):
+    with pytest.raises(ValueError, match="concurrency"):
+        download_images({}, tmp_path, concurrency=0)
+
+
+def test_async_downloads_are_concurrent_and_bounded(tmp_path):
+    in_flight, peak = [0], [0]
+
+    async def handler(request):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        return httpx.Response(200, content=request.url.path.encode(), headers={"content-type": "image/png"})
+
+    images = {f"1:{i}": f"https://s3/{i}" for i in range(10)}
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            return await adownload_images(images, tmp_path, concurrency=3, http_client=http)
+
+    report = asyncio.run(main())
+    assert peak[0] == 3
+    assert list(report.paths) == list(images)
+    assert (tmp_path / "1-7.png").read_bytes() == b"/7"
+
+
+@pytest.mark.parametrize("download", ["sync", "async"])
+def test_keys_that_share_a_name_get_a_file_each(tmp_path, download):
+    bodies = {f"/{i}": f"body {i}".encode() for i in range(3)}
+    images = {f"1:{i}": f"https://s3/{i}" for i in range(3)}
+    names = dict.fromkeys(images, "Property 1=Default")
+    names["1:2"] = "property 1=default"  # same file on a case-insensitive file system
+    handler, _ = serve(bodies)
+    if download == "sync":
+        report = download_images(images, tmp_path, names=names, http_client=client(handler))
+    else:
+        async def main():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+                return await adownload_images(images, tmp_path, names=names, http_client=http)
+
+        report = asyncio.run(main())
+    assert [path.name for path in report.paths.values()] == [
+        "Property_1_Default.png", "Property_1_Default-2.png", "property_1_default-3.png",
+    ]
+    assert [path.read_bytes() for path in report.paths.values()] == list(bodies.values())
@@ -15,6 +15,8 @@ from pathlib import Path
 
 import pytest
 import yaml
+from conftest import canvas, text
+from pydantic import ValidationError
 
 import figmapy
 from figmapy._endpoints import AsyncEndpoints, SyncEndpoints
@@ -82,6 +84,23 @@ def test_models_accept_unknown_fields():
     assert node.aFieldFromTheFuture == "hello"
 
 
+def test_models_accept_unknown_node_types():
+    page = canvas("0:1", "Page 1", [
+        {"id": "1:1", "name": "Ghost", "type": "HOLOGRAM", "glow": 3, "children": [text("1:2", "T", "Hi")]},
+    ])
+    node = figmapy.models.CanvasNode.model_validate(page).children[0]
+    assert isinstance(node, figmapy.models.UnknownNode)
+    assert node.glow == 3
+    assert isinstance(node.children[0], figmapy.models.TextNode)
+
+
+def test_known_node_types_are_not_swallowed_by_the_fallback():
+    broken = text("1:2", "T", "Hi")
+    del broken["characters"]
+    with pytest.raises(ValidationError, match="characters"):
+        figmapy.models.CanvasNode.model_validate(canvas("0:1", "Page 1", [broken]))
+
+
 @pytest.mark.slow
 def test_checked_in_code_matches_the_spec():
     """Fails if someone edited a generated file, or bumped the spec without regenerating."""
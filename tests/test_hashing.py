@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import copy
+
+import pytest
+from conftest import canvas, frame, text
+
+from figmapy import VOLATILE_FIELDS, NodeHashes, hash_nodes, models
+from figmapy import hashing as hashing_module
+
+
+@pytest.fixture
+def payload(file_payload):
+    file_payload["document"]["children"] = [
+        canvas("0:1", "Page 1", [
+            frame("2:1", "Card", [text("2:2", "Label", "Buy")]),
+            frame("3:1", "Hero", [text("3:2", "Heading", "Hi")]),
+        ]),
+    ]
+    return file_payload
+
+
+def hashes_of(payload, **kwargs):
+    return hash_nodes(models.GetFileResponse.model_validate(payload), **kwargs)
+
+
+def test_every_node_has_a_stable_digest(payload):
+    hashes = hashes_of(payload)
+    assert list(hashes) == ["0:0", "0:1", "2:1", "2:2", "3:1", "3:2"]
+    assert hashes == hashes_of(copy.deepcopy(payload))
+    assert len(hashes["2:1"]) == 32 and hashes["2:1"] != hashes["3:1"]
+    assert hashes.parent("2:2") == "2:1" and hashes.parent("0:0") is None
+
+
+def test_a_change_reaches_every_ancestor_and_nothing_else(payload):
+    before = hashes_of(payload)
+    payload["document"]["children"][0]["children"][0]["children"][0]["characters"] = "Buy now"
+    after = hashes_of(payload)
+    assert after.changed(before) == ["0:0", "0:1", "2:1", "2:2"]
+    assert after.changed_since(before, "2:1") and not after.changed_since(before, "3:1")
+    assert after.own("2:1") == before.own("2:1")  # its own fields are the same
+
+
+def test_new_nodes_count_as_changed(payload):
+    before = hashes_of(payload)
+    payload["document"]["children"][0]["children"].append(frame("4:1", "New", []))
+    after = hashes_of(payload)
+    assert after.changed(before) == ["0:0", "0:1", "4:1"]
+    assert before.keys() - after.keys() == set()
+
+
+def test_volatile_fields_are_ignored(payload):
+    before = hashes_of(payload)
+    payload["document"]["children"][0]["children"][1]["pluginData"] = {"plugin": {"k": "v"}}
+    assert hashes_of(payload).changed(before) == []
+    assert "pluginData" in VOLATILE_FIELDS
+    assert hashes_of(payload, ignore=()).changed(hashes_of(payload, ignore=())) == []
+    assert hashes_of(payload, ignore=())["3:1"] != hashes_of(payload)["3:1"]
+
+
+def test_incompatible_hashes_treat_everything_as_changed(payload):
+    default, everything = hashes_of(payload), hashes_of(payload, ignore=())
+    assert not default.compatible(everything)
+    assert everything.changed(default) == list(everything)
+    assert everything.changed_since(default, "3:2")
+
+
+@pytest.mark.parametrize("name", ["hashes.json", "hashes.json.gz"])
+def test_save_and_load(payload, tmp_path, name):
+    hashes = hashes_of(payload)
+    hashes.save(tmp_path / name)
+    loaded = NodeHashes.load(tmp_path / name)
+    assert dict(loaded) == dict(hashes)
+    assert loaded.own("2:2") == hashes.own("2:2") and loaded.parent("2:2") == "2:1"
+    assert loaded.compatible(hashes) and hashes.changed(loaded) == []
+
+
+def test_plain_dicts(payload):
+    hashes = hash_nodes(copy.deepcopy(payload))
+    assert list(hashes) == list(hashes_of(payload))
+    payload["document"]["children"][0]["children"][1]["name"] = "Hero 2"
+    assert hash_nodes(payload).changed(hashes) == ["0:0", "0:1", "3:1"]
+
+
+def test_digests_do_not_depend_on_orjson(payload):
+    document = models.GetFileResponse.model_validate(payload).document
+    values = [document, {"tiny": 6.1e-17, "small": 1e-7, "big": 1e16, "text": "1e+16 é", "n": [1, 2.5, None]}]
+    for value in values:
+        assert hashing_module._encode_json(value) == hashing_module._encode_orjson(value)
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import sys
+from types import SimpleNamespace
+
 import httpx
 import pytest
 
 import figmapy
-from figmapy import models
+from figmapy import FigmaError, models
 
 
 @pytest.fixture
@@ -40,6 +44,51 @@ def test_walk_accepts_a_document_or_a_file(file):
     assert list(figmapy.walk(file)) == list(figmapy.walk(file.document))
 
 
+def tree(spec):
+    """("A", [("B", []), ...]) -> nested namespaces with name/children, like nodes."""
+    name, children = spec
+    return SimpleNamespace(name=name, children=[tree(child) for child in children])
+
+
+TREE = tree(("root", [("a", [("a1", [("a1x", [])]), ("a2", [])]), ("b", [("b1", [])])]))
+
+
+def test_walk_orders():
+    assert [n.name for n in figmapy.walk(TREE)] == ["a", "a1", "a1x", "a2", "b", "b1"]
+    assert [n.name for n in figmapy.walk(TREE, order="breadth")] == ["a", "b", "a1", "a2", "b1", "a1x"]
+    assert [n.name for n in figmapy.walk(TREE, include_self=True, order="breadth")][:2] == ["root", "a"]
+
+
+@pytest.mark.parametrize("order", ["depth", "breadth"])
+def test_walk_max_depth_and_prune(order):
+    def names(**kwargs):
+        return sorted(n.name for n in figmapy.walk(TREE, order=order, **kwargs))
+
+    assert names(max_depth=0) == []
+    assert names(max_depth=0, include_self=True) == ["root"]
+    assert names(max_depth=1) == ["a", "b"]
+    assert names(max_depth=2) == ["a", "a1", "a2", "b", "b1"]
+    assert names(prune=lambda n: n.name == "a") == ["b", "b1"]
+    assert names(prune=lambda n: n.name == "a1", max_depth=2) == ["a", "a2", "b", "b1"]
+    assert names(prune=lambda n: n.name == "root", include_self=True) == []
+
+
+def test_walk_rejects_bad_arguments():
+    with pytest.raises(ValueError, match="order"):
+        figmapy.walk(TREE, order="sideways")
+    with pytest.raises(ValueError, match="max_depth"):
+        figmapy.walk(TREE, max_depth=-1)
+
+
+def test_walk_handles_nesting_deeper_than_the_recursion_limit():
+    root = leaf = SimpleNamespace(name="0", children=[])
+    for depth in range(1, sys.getrecursionlimit() * 2):
+        child = SimpleNamespace(name=str(depth), children=[])
+        leaf.children.append(child)
+        leaf = child
+    assert sum(1 for _ in figmapy.walk(root)) == sys.getrecursionlimit() * 2 - 1
+
+
 def test_find_and_find_all(file):
     assert figmapy.find(file, type="TEXT").characters == "Hello"
     assert figmapy.find(file, name="nope") is None
@@ -47,6 +96,33 @@ def test_find_and_find_all(file):
     assert figmapy.find_all(file, where=lambda n: n.name.endswith("2")) != []
 
 
+def test_node_index_lookups(file):
+    index = figmapy.NodeIndex(file)
+    assert len(index) == 3
+    assert list(index) == list(figmapy.walk(file))
+    assert index.by_id["1:2"].characters == "Hello"
+    assert [n.id for n in index.by_type["CANVAS"]] == ["0:1", "0:2"]
+    assert index.by_name["Title"] == [index.get("1:2")]
+    assert "1:2" in index and "9:9" not in index
+
+
+def test_node_index_parents(file):
+    index = figmapy.NodeIndex(file)
+    title = index.by_id["1:2"]
+    assert index.parent(title).id == "0:1"
+    assert index.parent("0:1") is file.document
+    assert [n.id for n in index.ancestors(title)] == ["0:1", "0:0"]
+    assert index.parent(file.document) is None
+
+
+def test_find_and_find_all_accept_an_index(file):
+    index = figmapy.NodeIndex(file)
+    for kwargs in ({"type": "TEXT"}, {"name": "Page 2"}, {"type": "CANVAS", "name": "Page 1"},
+                   {"where": lambda n: n.name.endswith("2")}, {"type": "CANVAS", "name": "Title"}):
+        assert figmapy.find_all(index, **kwargs) == figmapy.find_all(file, **kwargs)
+        assert figmapy.find(index, **kwargs) == figmapy.find(file, **kwargs)
+
+
 def test_pages_and_page(file):
     assert [p.name for p in figmapy.pages(file)] == ["Page 1", "Page 2"]
     assert figmapy.page(file, "Page 2").id == "0:2"
@@ -88,3 +164,122 @@ def test_iter_pages_follows_the_cursor():
     collected = [p["rows"][0] for p in figmapy.iter_pages(endpoint, file_key="KEY")]
     assert collected == [1, 2, 3]
     assert seen_cursors == [None, "c1", "c2"]
+
+
+@pytest.mark.parametrize("first, last", [
+    ({"rows": [1], "has_next_page": True, "next_cursor": "c1"}, {"rows": [2], "has_next_page": False, "next_cursor": ""}),
+    ({"meta": {"items": [1], "has_more": True, "cursor": "c1"}}, {"meta": {"items": [2], "has_more": False}}),
+])
+def test_iter_pages_knows_each_pagination_shape(first, last):
+    seen_cursors = []
+
+    def endpoint(cursor=None):
+        seen_cursors.append(cursor)
+        return first if cursor is None else last
+
+    assert len(list(figmapy.iter_pages(endpoint))) == 2
+    assert seen_cursors == [None, "c1"]
+
+
+def test_iter_pages_without_a_cursor_parameter_is_a_clear_error():
+    def endpoint(limit=None):
+        return {"meta": {"activity_logs": [], "next_page": True, "cursor": "c1"}}
+
+    with pytest.raises(TypeError, match="no `cursor` parameter"):
+        list(figmapy.iter_pages(endpoint))
+
+
+def activity_logs(log):
+    """GET /v1/activity_logs in three pages; the spec has no `cursor` parameter for it."""
+
+    def handler(request):
+        log.append(request)
+        n = int(request.url.params.get("cursor", 0))
+        more = n < 2
+        meta = {"activity_logs": [], "next_page": more, "cursor": str(n + 1) if more else None}
+        return httpx.Response(200, json={"status": 200, "error": False, "meta": meta})
+
+    return handler
+
+
+def test_iter_pages_follows_a_cursor_the_spec_does_not_list(make_client):
+    log = []
+    figma = make_client(activity_logs(log))
+    pages = list(figmapy.iter_pages(figma.get_activity_logs, limit=2, order="asc"))
+    assert len(pages) == 3
+    assert all(isinstance(page, figmapy.models.GetActivityLogsResponse) for page in pages)
+    assert {r.url.path for r in log} == {"/v1/activity_logs"}
+    assert [dict(r.url.params) for r in log] == [
+        {"limit": "2", "order": "asc"},
+        {"limit": "2", "order": "asc", "cursor": "1"},
+        {"limit": "2", "order": "asc", "cursor": "2"},
+    ]
+
+
+def test_aiter_pages_follows_a_cursor_the_spec_does_not_list():
+    log = []
+
+    async def main():
+        transport = httpx.MockTransport(activity_logs(log))
+        async with figmapy.AsyncFigma("t", http_client=httpx.AsyncClient(transport=transport)) as figma:
+            return [page async for page in figmapy.aiter_pages(figma.get_activity_logs)]
+
+    assert len(asyncio.run(main())) == 3
+    assert [r.url.params.get("cursor") for r in log] == [None, "1", "2"]
+
+
+def paged_endpoint(count, log):
+    """An async endpoint with `count` pages, logging ("fetch", n) as each is requested."""
+
+    async def endpoint(cursor=None):
+        n = int(cursor or 0)
+        log.append(("fetch", n))
+        await asyncio.sleep(0)
+        if n == count - 1:
+            return {"rows": [n], "next_page": False}
+        return {"rows": [n], "next_page": True, "cursor": str(n + 1)}
+
+    return endpoint
+
+
+@pytest.mark.parametrize("lookahead", [0, 1, 3])
+def test_aiter_pages_fetches_ahead_up_to_lookahead(lookahead):
+    log = []
+
+    async def main():
+        async for page in figmapy.aiter_pages(paged_endpoint(6, log), lookahead=lookahead):
+            for _ in range(5):
+                await asyncio.sleep(0)  # time for the background fetches
+            log.append(("done", page["rows"][0]))
+
+    asyncio.run(main())
+    assert [n for what, n in log if what == "fetch"] == list(range(6))
+    for n in range(6):
+        fetched_before = max(m for what, m in log[:log.index(("done", n))] if what == "fetch")
+        assert fetched_before == min(n + lookahead, 5)
+
+
+def test_aiter_pages_stops_fetching_when_the_consumer_stops():
+    log = []
+
+    async def main():
+        async for page in figmapy.aiter_pages(paged_endpoint(100, log), lookahead=2):
+            if page["rows"][0] == 3:
+                break
+        await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert len(log) <= 6
+
+
+def test_aiter_pages_raises_what_the_endpoint_raised():
+    async def endpoint(cursor=None):
+        if cursor:
+            raise FigmaError("boom")
+        return {"rows": [0], "next_page": True, "cursor": "1"}
+
+    async def main():
+        return [page async for page in figmapy.aiter_pages(endpoint)]
+
+    with pytest.raises(FigmaError, match="boom"):
+        asyncio.run(main())
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+
+import httpx
+import pytest
+
+import figmapy
+from figmapy import IncrementalSync, Watermark, WatermarkStore
+
+USER = {"id": "1", "handle": "a", "img_url": ""}
+
+
+class Org:
+    """A project whose files can be edited between runs, served over a mock transport."""
+
+    def __init__(self, file_payload, **edited):
+        self.file_payload = file_payload
+        self.edited = dict(edited)  # key -> last_modified
+        self.calls: list[str] = []
+        self.broken: set[str] = set()
+        self.touched: dict[str, str] = {}  # key -> last_touched_at, when not last_modified
+
+    def edit(self, key, when):
+        self.edited[key] = when
+
+    def handler(self, request):
+        path = request.url.path
+        self.calls.append(path)
+        if path == "/v1/projects/P/files":
+            files = [{"key": k, "name": k.upper(), "last_modified": when} for k, when in self.edited.items()]
+            return httpx.Response(200, json={"name": "Project", "files": files})
+        key = path.split("/")[3]
+        if key in self.broken:
+            return httpx.Response(403, json={"status": 403, "err": "Forbidden"})
+        if path.endswith("/meta"):
+            return httpx.Response(200, json={"file": {
+                "name": key, "last_touched_at": self.touched.get(key, self.edited[key]), "creator": USER,
+                "editorType": "figma", "version": f"v-{self.edited[key]}",
+            }})
+        if path.endswith(("/components", "/styles")):
+            return httpx.Response(200, json={"status": 200, "error": False, "meta": {}})
+        if path.endswith("/variables/local"):
+            return httpx.Response(200, json={"status": 200, "error": False, "meta": {}})
+        return httpx.Response(200, json={**self.file_payload, "version": f"v-{self.edited[key]}"})
+
+
+def run(org, store, source, **kwargs):
+    async def main():
+        transport = httpx.MockTransport(org.handler)
+        async with figmapy.AsyncFigma("t", http_client=httpx.AsyncClient(transport=transport), max_retries=0,
+                                      parse=kwargs.pop("parse", True)) as figma:
+            sync = IncrementalSync(figma, store, **kwargs)
+            synced = [s async for s in (sync.project("P") if source == "P" else sync.files(source))]
+            return sync.report, synced
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def store(tmp_path):
+    return WatermarkStore(tmp_path / "state.db")
+
+
+def test_only_files_whose_watermark_moved_are_fetched(file_payload, store):
+    org = Org(file_payload, a="2026-01-01T00:00:00Z", b="2026-01-01T00:00:00Z", c="2026-01-02T00:00:00Z")
+    report, synced = run(org, store, "P", operations=["get_file"])
+    assert sorted(report.fetched) == ["a", "b", "c"] and report.skipped == []
+    assert synced[0].results["get_file"].name == "Untitled" and synced[0].previous is None
+
+    org.calls.clear()
+    org.edit("b", "2026-01-05T10:00:00.000Z")
+    report, synced = run(org, store, "P", operations=["get_file"])
+    assert report.fetched == ["b"] and sorted(report.skipped) == ["a", "c"]
+    assert org.calls == ["/v1/projects/P/files", "/v1/files/b"]
+    assert synced[0].previous == Watermark("2026-01-01T00:00:00+00:00", "v-2026-01-01T00:00:00Z")
+    assert synced[0].watermark.last_modified == "2026-01-05T10:00:00+00:00"
+    assert store.get("b") == synced[0].watermark
+
+
+def test_default_operations_and_plain_dicts(file_payload, store):
+    org = Org(file_payload, a="2026-01-01T00:00:00Z")
+    report, synced = run(org, store, "P", parse=False)
+    assert list(synced[0].results) == list(figmapy.DEFAULT_OPERATIONS)
+    assert sorted(org.calls) == sorted([
+        "/v1/projects/P/files", "/v1/files/a", "/v1/files/a/components", "/v1/files/a/styles",
+        "/v1/files/a/variables/local",
+    ])
+    report, _ = run(org, store, "P", parse=False)
+    assert report.skipped == ["a"]
+
+
+def test_bare_keys_are_compared_by_version(file_payload, store):
+    org = Org(file_payload, a="2026-01-01T00:00:00Z", b="2026-01-01T00:00:00Z")
+    run(org, store, ["a", "b"], operations=["get_file"])
+    org.calls.clear()
+    org.edit("a", "2026-02-01T00:00:00Z")
+    report, synced = run(org, store, ["a", "b"], operations=["get_file"])
+    assert [s.key for s in synced] == ["a"] and report.skipped == ["b"]
+    assert sorted(org.calls) == ["/v1/files/a", "/v1/files/a/meta", "/v1/files/b/meta"]
+
+
+def test_switching_between_listing_and_bare_keys_does_not_refetch(file_payload, store):
+    org = Org(file_payload, a="2026-01-01T00:00:00Z")
+    org.touched["a"] = "2026-01-01T00:05:00Z"  # meta's time is a different clock from the listing's
+    run(org, store, "P", operations=["get_file"])
+    for source in (["a"], ["a"], "P"):
+        report, synced = run(org, store, source, operations=["get_file"])
+        assert synced == [] and report.skipped == ["a"], source
+    org.edit("a", "2026-01-02T00:00:00Z")
+    report, _ = run(org, store, ["a"], operations=["get_file"])
+    assert report.fetched == ["a"]
+
+
+def test_a_store_from_before_touched_is_upgraded(tmp_path):
+    db = sqlite3.connect(tmp_path / "old.db")
+    db.execute("CREATE TABLE watermarks (key TEXT PRIMARY KEY, last_modified TEXT, version TEXT, synced_at REAL NOT NULL)")
+    db.execute("INSERT INTO watermarks VALUES ('a', 'x', '1', 0)")
+    db.commit()
+    db.close()
+    store = WatermarkStore(tmp_path / "old.db")
+    assert store.get("a") == Watermark("x", "1")
+    store.set("a", Watermark("x", "1", "t"))
+    assert store.get("a").touched == "t"
+
+
+def test_failures_keep_the_old_watermark_and_missing_files_are_gone(file_payload, store):
+    org = Org(file_payload, a="2026-01-01T00:00:00Z", b="2026-01-01T00:00:00Z")
+    run(org, store, "P", operations=["get_file"])
+    org.edit("a", "2026-03-01T00:00:00Z")
+    org.broken.add("a")
+    del org.edited["b"]
+    report, synced = run(org, store, "P", operations=["get_file"])
+    assert synced == [] and list(report.failed) == ["a"]
+    assert isinstance(report.failed["a"], figmapy.FigmaAuthError)
+    assert store.get("a").last_modified == "2026-01-01T00:00:00+00:00"
+    assert report.gone == ["b"]
+
+
+def test_watermark_comparison():
+    old = Watermark("2026-01-01T00:00:00+00:00", "1")
+    assert not Watermark("2026-01-01T00:00:00+00:00").moved_since(old)
+    assert Watermark("2026-01-02T00:00:00+00:00").moved_since(old)
+    assert Watermark(None, "2").moved_since(old) and not Watermark(None, "1").moved_since(old)
+    assert Watermark("2026-01-01T00:00:00+00:00").moved_since(None)
+    assert Watermark("x").moved_since(Watermark(None, "1"))  # nothing in common to compare
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import gc
+import inspect
+
+import httpx
+import pydantic
+import pytest
+from conftest import canvas, text
+
+import figmapy
+from figmapy import models
+from figmapy._parsing import _gc_paused, construct_trusted
+from figmapy.errors import FigmaValidationError
+
+
+def json_ok(payload):
+    return lambda request: httpx.Response(200, json=payload)
+
+
+def raw(items, index):
+    """Peek at a list item without triggering lazy validation."""
+    return list.__getitem__(items, index)
+
+
+# -- parse="lazy" ------------------------------------------------------------
+
+
+def test_lazy_validates_the_top_level_only(make_client, file_payload):
+    file = make_client(json_ok(file_payload), parse="lazy").get_file("KEY")
+    assert isinstance(file, models.GetFileResponse)
+    assert file.name == "Untitled"
+    assert isinstance(raw(file.document.children, 0), dict)
+
+    first = file.document.children[0]
+    assert isinstance(first, models.CanvasNode)
+    assert isinstance(raw(file.document.children, 1), dict)  # the other page is untouched
+    assert isinstance(raw(first.children, 0), dict)
+    assert first.children[0].characters == "Hello"
+
+
+def test_lazy_has_the_same_api_as_eager(make_client, file_payload):
+    eager = make_client(json_ok(file_payload)).get_file("KEY")
+    lazy = make_client(json_ok(file_payload), parse="lazy").get_file("KEY")
+    assert [n.name for n in figmapy.walk(lazy)] == [n.name for n in figmapy.walk(eager)]
+    assert figmapy.find(lazy, type="TEXT").characters == "Hello"
+
+
+def test_lazy_dumps_like_eager_without_being_read_first(make_client, file_payload):
+    eager = make_client(json_ok(file_payload)).get_file("KEY")
+    lazy = make_client(json_ok(file_payload), parse="lazy").get_file("KEY")
+    assert isinstance(raw(lazy.document.children, 0), dict)
+    assert lazy.model_dump(warnings=False) == eager.model_dump(warnings=False)
+    fresh = make_client(json_ok(file_payload), parse="lazy").get_file("KEY")
+    assert fresh.model_dump_json(warnings=False) == eager.model_dump_json(warnings=False)
+    page = make_client(json_ok(file_payload), parse="lazy").get_file("KEY").document.children[0]
+    assert page.model_dump(warnings=False) == eager.document.children[0].model_dump(warnings=False)
+
+
+
+@pytest.mark.parametrize("method", ["model_dump", "model_dump_json"])
+def test_dump_keeps_pydantics_signature(method):
+    ours = inspect.signature(getattr(models.TextNode, method))
+    assert ours == inspect.signature(getattr(pydantic.BaseModel, method))
+    assert "exclude_none" in ours.parameters
+
+def test_lazy_file_nodes(make_client):
+    payload = {
+        "name": "Untitled", "role": "owner", "lastModified": "2026-08-19T23:01:51Z",
+        "editorType": "figma", "thumbnailUrl": "https://example.invalid/t.png", "version": "1",
+        "nodes": {"0:1": {"document": canvas("0:1", "Page 1", [text("1:2", "Title", "Hi")]),
+                          "components": {}, "componentSets": {}, "schemaVersion": 0, "styles": {}}},
+    }
+    result = make_client(json_ok(payload), parse="lazy").get_file_nodes("KEY", ids=["0:1"])
+    page = result.nodes["0:1"].document
+    assert isinstance(raw(page.children, 0), dict)
+    assert page.children[0].characters == "Hi"
+
+
+def test_lazy_reports_bad_nodes_when_they_are_read(make_client, file_payload):
+    del file_payload["document"]["children"][1]["backgroundColor"]
+    file = make_client(json_ok(file_payload), parse="lazy", strict=True).get_file("KEY")
+    assert file.document.children[0].name == "Page 1"
+    with pytest.raises(FigmaValidationError, match="0:2"):
+        file.document.children[1]
+
+
+def test_lazy_bad_nodes_warn_unless_strict(make_client, file_payload):
+    del file_payload["document"]["children"][1]["backgroundColor"]
+    file = make_client(json_ok(file_payload), parse="lazy").get_file("KEY")
+    with pytest.warns(figmapy.FigmaSpecWarning, match="0:2") as caught:
+        page = file.document.children[1]
+    assert caught[0].filename == __file__
+    assert isinstance(page, dict) and page["name"] == "Page 2"
+    assert file.document.children[-1] is page  # kept as the raw dict, warned about once
+
+
+def test_unknown_parse_mode_is_rejected():
+    with pytest.raises(ValueError, match="parse"):
+        figmapy.Figma("t", parse="sometimes")
+
+
+# -- parse="trusted" ---------------------------------------------------------
+
+
+def test_trusted_builds_the_same_models_as_validation(make_client, file_payload):
+    eager = make_client(json_ok(file_payload)).get_file("KEY")
+    trusted = make_client(json_ok(file_payload), parse="trusted").get_file("KEY")
+    assert trusted.model_dump(warnings=False) == eager.model_dump(warnings=False)
+    assert [type(n) for n in figmapy.walk(trusted)] == [type(n) for n in figmapy.walk(eager)]
+    assert trusted.lastModified == eager.lastModified
+    assert trusted.model_fields_set == eager.model_fields_set
+
+
+def test_trusted_converts_nested_values():
+    node = text("1:2", "Title", "Hi")
+    node["fills"] = [{"type": "SOLID", "blendMode": "NORMAL", "color": {"r": 1, "g": 0, "b": 0, "a": 1}}]
+    built = construct_trusted(models.TextNode, node)
+    assert isinstance(built.fills[0], models.SolidPaint)
+    assert isinstance(built.fills[0].color.r, float)
+    assert built.blendMode is models.BlendMode.PASS_THROUGH
+    assert isinstance(built.absoluteBoundingBox, models.Rectangle)
+
+
+def test_trusted_does_not_check_anything():
+    node = text("1:2", "Title", "Hi")
+    node["blendMode"] = "SOMETHING_NEW"
+    node["futureField"] = 1
+    del node["characters"]
+    built = construct_trusted(models.TextNode, node)
+    assert built.blendMode == "SOMETHING_NEW"
+    assert built.model_extra == {"futureField": 1}
+    assert "characters" not in built.model_fields_set
+
+
+def test_gc_threshold_is_raised_until_the_last_overlapping_build_ends():
+    before = gc.get_threshold()
+    first, second = _gc_paused(), _gc_paused()
+    first.__enter__()
+    second.__enter__()
+    first.__exit__(None, None, None)
+    assert gc.get_threshold()[0] >= 50_000  # the other build is still going
+    assert gc.isenabled()
+    second.__exit__(None, None, None)
+    assert gc.get_threshold() == before
+
+
+def test_gc_threshold_set_during_a_build_is_kept():
+    before = gc.get_threshold()
+    try:
+        with _gc_paused():
+            gc.set_threshold(1234, 5, 6)
+        assert gc.get_threshold() == (1234, 5, 6)
+    finally:
+        gc.set_threshold(*before)
+
+
+def test_gc_pause_leaves_a_disabled_collector_disabled():
+    gc.disable()
+    try:
+        with _gc_paused():
+            pass
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
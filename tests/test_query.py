@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pytest
+from conftest import frame, text
+
+import figmapy
+from figmapy import Selector, models, select, select_many
+
+
+@pytest.fixture
+def file(file_payload):
+    hidden = dict(text("3:2", "Caption", "psst"), visible=False)
+    file_payload["document"]["children"][1]["children"] = [
+        frame("2:1", "Card", [text("2:2", "Label", "Buy"), frame("2:3", "Frame 12", [hidden])],
+              layoutMode="HORIZONTAL"),
+    ]
+    return models.GetFileResponse.model_validate(file_payload)
+
+
+def ids(nodes):
+    return [node.id for node in nodes]
+
+
+@pytest.mark.parametrize(
+    "selector, expected",
+    [
+        ("TEXT", ["1:2", "2:2", "3:2"]),
+        ("*", ["0:1", "1:2", "0:2", "2:1", "2:2", "2:3", "3:2"]),
+        ('[name="Page *"]', ["0:1", "0:2"]),
+        ('FRAME[name="Frame ?*"]', ["2:3"]),
+        (r"[name=/^(Title|Label)$/]", ["1:2", "2:2"]),
+        ("[visible=false]", ["3:2"]),
+        ("TEXT[visible!=false]", ["1:2", "2:2"]),
+        ("[layoutMode=HORIZONTAL]", ["2:1"]),
+        ("[absoluteBoundingBox.width=10]", ["1:2", "2:1", "2:2", "2:3", "3:2"]),
+        ("[characters]", ["1:2", "2:2", "3:2"]),
+        ("CANVAS TEXT", ["1:2", "2:2", "3:2"]),
+        ("CANVAS > TEXT", ["1:2"]),
+        ("FRAME > TEXT", ["2:2", "3:2"]),
+        ('CANVAS > FRAME FRAME > [visible=false]', ["3:2"]),
+        ("DOCUMENT > CANVAS", ["0:1", "0:2"]),
+        ("CANVAS > TEXT, FRAME", ["1:2", "2:1", "2:3"]),
+        ("COMPONENT", []),
+    ],
+)
+def test_selectors(file, selector, expected):
+    assert ids(select(file, selector)) == expected
+
+
+def test_select_many_matches_separate_selects_in_one_walk(file):
+    queries = {"text": "TEXT", "hidden": "[visible=false]", "nested": "FRAME FRAME TEXT", "none": "VECTOR"}
+    results = select_many(file, queries)
+    assert results == {key: select(file, selector) for key, selector in queries.items()}
+
+
+def test_a_node_is_reported_once_per_query(file):
+    assert ids(select(file, "TEXT, [name=Label]")) == ["1:2", "2:2", "3:2"]
+
+
+def test_select_agrees_with_find_all(file):
+    assert select(file, "TEXT") == figmapy.find_all(file, type="TEXT")
+    assert Selector('[name="Card"]').select(file.document) == figmapy.find_all(file, name="Card")
+
+
+def test_prune(file):
+    assert ids(select(file, "TEXT", prune=lambda n: n.type == "FRAME")) == ["1:2"]
+
+
+def test_matches_single_node(file):
+    card = figmapy.find(file, name="Card")
+    assert Selector("FRAME[layoutMode=HORIZONTAL]").matches(card)
+    assert not Selector("CANVAS > FRAME").matches(card)
+    assert Selector("CANVAS > FRAME").matches(card, [file.document, file.document.children[1]])
+
+
+@pytest.mark.parametrize("source", ["", "TEXT >", "[name=", "[=x]", "TEXT]", "[name=/(/]", "TEXT,", "a $ b"])
+def test_bad_selectors(source):
+    with pytest.raises(ValueError, match="Bad selector"):
+        Selector(source)
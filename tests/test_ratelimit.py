@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+import figmapy
+from figmapy.ratelimit import RateLimiter, TokenBucket, operation_name
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_operation_name_matches_path_templates():
+    assert operation_name("GET", "/v1/files/KEY") == "get_file"
+    assert operation_name("GET", "/v1/files/KEY/nodes") == "get_file_nodes"
+    assert operation_name("POST", "/v1/files/KEY/comments") == "post_comment"
+    assert operation_name("GET", "/v1/not_wrapped_yet") is None
+
+
+def test_bucket_goes_into_debt_and_reports_the_wait():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1.0, capacity=2, clock=clock)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 1.0
+    assert bucket.reserve() == 2.0
+    clock.now = 10
+    assert bucket.reserve() == 0  # refilled, but never above capacity
+    assert bucket.available == 1
+
+
+def test_tiers_and_costs_pick_separate_buckets():
+    clock = FakeClock()
+    limiter = RateLimiter(rates={1: 60, 2: 60, 3: 60}, costs={"get_images": 30}, clock=clock)
+    assert limiter.tier("GET", "/v1/files/KEY") == 1
+    assert limiter.tier("GET", "/v1/files/KEY/meta") == 3
+    assert limiter.tier("GET", "/v1/not_wrapped_yet") == 2
+
+    assert limiter.reserve("token", "GET", "/v1/images/KEY") == 0
+    assert limiter.reserve("token", "GET", "/v1/images/KEY") == 0
+    assert limiter.reserve("token", "GET", "/v1/images/KEY") == 30.0
+    # a different tier, and a different token, are unaffected
+    assert limiter.reserve("token", "GET", "/v1/me") == 0
+    assert limiter.reserve("other", "GET", "/v1/images/KEY") == 0
+
+
+def test_client_waits_before_sending(make_client, file_payload, monkeypatch):
+    slept = []
+    monkeypatch.setattr("time.sleep", slept.append)
+    clock = FakeClock()
+    limiter = RateLimiter(rates={1: 1}, burst=1, clock=clock)
+    client = make_client(lambda r: httpx.Response(200, json=file_payload), rate_limiter=limiter)
+
+    client.get_file("KEY")
+    client.get_file("KEY")
+    assert slept == [60.0]
+
+
+def test_429_drains_the_shared_bucket(make_client, file_payload, monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda _: None)
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+    responses = [httpx.Response(429, headers={"Retry-After": "30"}, json={}),
+                 httpx.Response(200, json=file_payload)]
+    client = make_client(lambda r: responses.pop(0), rate_limiter=limiter)
+    client.get_file("KEY")
+
+    # an async client on the same token shares the penalty
+    other = figmapy.AsyncFigma("figd_test", rate_limiter=limiter)
+    assert limiter.reserve(other._limiter_key, "GET", "/v1/files/OTHER") > 0
+    asyncio.run(other.aclose())
+
+
+def test_429_without_retry_after_still_holds_the_tier_back():
+    clock = FakeClock()
+    limiter = RateLimiter(rates={1: 60}, clock=clock)  # one token a second
+    for retry_after in (None, 0):
+        limiter.penalize("token", "GET", "/v1/files/KEY", retry_after)
+        assert limiter.reserve("token", "GET", "/v1/files/KEY") == 2.0  # the drained second, then this one
+        clock.now += 10
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import math
+import random
+from types import SimpleNamespace
+
+import pytest
+
+import figmapy
+from figmapy import SpatialIndex, models
+
+
+def node(name: str, x: float, y: float, width: float, height: float, children=(), **extra):
+    box = SimpleNamespace(x=x, y=y, width=width, height=height)
+    return SimpleNamespace(name=name, absoluteBoundingBox=box, children=list(children), **extra)
+
+
+@pytest.fixture(scope="module")
+def scattered():
+    rng = random.Random(7)
+    frames = []
+    for f in range(40):
+        fx, fy = rng.uniform(0, 5000), rng.uniform(0, 5000)
+        children = [node(f"{f}/{c}", fx + rng.uniform(0, 300), fy + rng.uniform(0, 300),
+                         rng.uniform(1, 100), rng.uniform(1, 100)) for c in range(25)]
+        frames.append(node(f"{f}", fx, fy, 400, 400, children))
+    return SimpleNamespace(name="Page", type="CANVAS", children=frames)
+
+
+def brute(page, keep, x0, y0, x1, y1):
+    out = []
+    for candidate in figmapy.walk(page):
+        b = candidate.absoluteBoundingBox
+        if keep(b.x, b.y, b.x + b.width, b.y + b.height, x0, y0, x1, y1):
+            out.append(candidate)
+    return out
+
+
+def overlaps(a, b, c, d, x0, y0, x1, y1):
+    return a <= x1 and c >= x0 and b <= y1 and d >= y0
+
+
+def inside(a, b, c, d, x0, y0, x1, y1):
+    return a >= x0 and c <= x1 and b >= y0 and d <= y1
+
+
+def covers(a, b, c, d, x0, y0, x1, y1):
+    return a <= x0 and c >= x1 and b <= y0 and d >= y1
+
+
+def test_queries_agree_with_a_linear_scan(scattered):
+    index = SpatialIndex(scattered, leaf_size=4)
+    assert len(index) == 40 * 26
+    rng = random.Random(11)
+    for _ in range(50):
+        x, y, w, h = rng.uniform(0, 5000), rng.uniform(0, 5000), rng.uniform(0, 800), rng.uniform(0, 800)
+        assert index.intersecting((x, y, w, h)) == brute(scattered, overlaps, x, y, x + w, y + h)
+        assert index.within((x, y, w, h)) == brute(scattered, inside, x, y, x + w, y + h)
+        assert index.containing((x, y, 1, 1)) == brute(scattered, covers, x, y, x + 1, y + 1)
+        assert index.at(x, y) == brute(scattered, covers, x, y, x, y)
+
+
+def test_nearest_agrees_with_a_linear_scan(scattered):
+    index = SpatialIndex(scattered)
+    everything = list(figmapy.walk(scattered))
+
+    def distance(candidate, x, y):
+        b = candidate.absoluteBoundingBox
+        return math.hypot(max(b.x - x, 0, x - b.x - b.width), max(b.y - y, 0, y - b.y - b.height))
+
+    rng = random.Random(3)
+    for _ in range(30):
+        x, y = rng.uniform(-500, 5500), rng.uniform(-500, 5500)
+        expected = sorted(everything, key=lambda n: distance(n, x, y))[:5]
+        assert [distance(n, x, y) for n in index.nearest(x, y, k=5)] == [distance(n, x, y) for n in expected]
+    assert index.nearest(0, 0, k=0) == []
+
+
+def test_point_query_returns_outermost_first():
+    inner = node("inner", 10, 10, 10, 10)
+    outer = node("outer", 0, 0, 100, 100, [inner])
+    index = SpatialIndex(SimpleNamespace(children=[outer, node("far", 500, 500, 1, 1)]))
+    assert index.at(15, 15) == [outer, inner]
+    assert index.at(20, 20) == [outer, inner]  # edges count
+    assert index.containing(inner) == [outer, inner]
+    assert index.within(outer) == [outer, inner]
+    assert index.nearest(15, 15, k=2) == [outer, inner]  # both at distance 0
+    assert index.at(300, 300) == []
+
+
+def test_render_bounds_and_nodes_without_bounds():
+    shadowed = node("shadowed", 0, 0, 10, 10, absoluteRenderBounds=SimpleNamespace(x=-5, y=-5, width=20, height=20))
+    hidden = node("hidden", 0, 0, 10, 10, absoluteRenderBounds=None)
+    page = SimpleNamespace(children=[shadowed, hidden])
+    assert SpatialIndex(page).at(-2, -2) == []
+    index = SpatialIndex(page, bounds="absoluteRenderBounds")
+    assert len(index) == 1
+    assert index.at(-2, -2) == [shadowed]
+    with pytest.raises(ValueError, match="absoluteRenderBounds"):
+        index.intersecting(hidden)
+
+
+def test_empty_index():
+    index = SpatialIndex(SimpleNamespace(children=[]))
+    assert len(index) == 0
+    assert index.at(0, 0) == [] and index.intersecting((0, 0, 1, 1)) == [] and index.nearest(0, 0) == []
+
+
+def test_for_pages_on_a_real_file(file_payload):
+    file = models.GetFileResponse.model_validate(file_payload)
+    indexes = SpatialIndex.for_pages(file)
+    assert list(indexes) == ["0:1", "0:2"]
+    title = figmapy.find(file, name="Title")
+    assert indexes["0:1"].intersecting(title.absoluteBoundingBox) == [title]
+    assert indexes["0:1"].at(5, 5) == [title]
+    assert len(indexes["0:2"]) == 0
+    with pytest.raises(ValueError, match="for_pages"):
+        SpatialIndex(file)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from conftest import canvas, text
+
+import figmapy
+from figmapy import models
+from figmapy._stream import PageScanner
+from figmapy.errors import FigmaError, FigmaNotFoundError
+
+
+def chunked(body: bytes, size: int) -> list[bytes]:
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def scan(body: bytes, size: int, frames: bool = False) -> list:
+    scanner = PageScanner(frames=frames)
+    out = []
+    for chunk in chunked(body, size):
+        out += scanner.feed(chunk)
+    scanner.close()
+    return [(page_id, json.loads(raw)) for page_id, raw in out]
+
+
+@pytest.fixture
+def tricky_payload(file_payload):
+    """Strings that look like structure, split wherever the chunks happen to fall."""
+    page = file_payload["document"]["children"][0]
+    page["name"] = 'a "quoted" {page} [1], \\ done'
+    page["children"].append(text("1:3", "]}", '{"not": ["json"]}'))
+    file_payload["document"]["children"][1]["id"] = "0:\"2"
+    return file_payload
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100_000])
+def test_scanner_yields_each_page_whatever_the_chunking(tricky_payload, size):
+    body = json.dumps(tricky_payload).encode()
+    pages = [page for _, page in scan(body, size)]
+    assert pages == tricky_payload["document"]["children"]
+
+
+def test_scanner_yields_top_level_nodes_with_their_page(tricky_payload):
+    body = json.dumps(tricky_payload, indent=2).encode()
+    nodes = scan(body, 5, frames=True)
+    assert [(page_id, node["id"]) for page_id, node in nodes] == [("0:1", "1:2"), ("0:1", "1:3")]
+
+
+def test_scanner_only_keeps_the_current_page(file_payload):
+    file_payload["document"]["children"] = [
+        canvas(f"0:{p}", f"Page {p}", [text(f"{p}:{t}", "T", "x" * 200) for t in range(20)]) for p in range(10)
+    ]
+    body = json.dumps(file_payload).encode()
+    page_size = len(json.dumps(file_payload["document"]["children"][0]))
+    scanner = PageScanner()
+    largest = 0
+    for chunk in chunked(body, 512):
+        scanner.feed(chunk)
+        largest = max(largest, len(scanner._buf))
+    assert largest < page_size + 512 < len(body) / 5
+
+
+def test_scanner_notices_a_truncated_body(file_payload):
+    body = json.dumps(file_payload).encode()
+    scanner = PageScanner()
+    scanner.feed(body[: len(body) // 2])
+    with pytest.raises(FigmaError, match="ended"):
+        scanner.close()
+
+
+def streaming(payload: dict, size: int = 50):
+    body = json.dumps(payload).encode()
+    return lambda request: httpx.Response(200, content=iter(chunked(body, size)))
+
+
+def test_stream_file_yields_canvas_nodes(make_client, file_payload):
+    pages = list(make_client(streaming(file_payload)).stream_file("KEY", geometry="paths"))
+    assert [type(p) for p in pages] == [models.CanvasNode, models.CanvasNode]
+    assert pages[0].children[0].characters == "Hello"
+
+
+def test_stream_file_frames(make_client, file_payload):
+    nodes = list(make_client(streaming(file_payload)).stream_file("KEY", frames=True))
+    assert [(page_id, type(node)) for page_id, node in nodes] == [("0:1", models.TextNode)]
+
+
+def test_stream_file_passes_params_and_raises_errors(make_client):
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.params.get("depth"))
+        return httpx.Response(404, json={"status": 404, "err": "Not found"})
+
+    with pytest.raises(FigmaNotFoundError):
+        list(make_client(handler).stream_file("KEY", depth=2))
+    assert seen == ["2"]
+
+
+def test_stream_file_retries_before_streaming(make_client, file_payload, monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda s: None)
+    responses = iter([httpx.Response(429, headers={"Retry-After": "0"}, json={"err": "slow down"})])
+
+    def handler(request):
+        return next(responses, None) or streaming(file_payload)(request)
+
+    assert len(list(make_client(handler).stream_file("KEY"))) == 2
+
+
+def test_async_stream_file(file_payload):
+    body = json.dumps(file_payload).encode()
+
+    async def chunks():
+        for chunk in chunked(body, 64):
+            yield chunk
+
+    async def main():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=chunks()))
+        async with figmapy.AsyncFigma("t", http_client=httpx.AsyncClient(transport=transport)) as figma:
+            return [page async for page in figma.stream_file("KEY")]
+
+    pages = asyncio.run(main())
+    assert [page.name for page in pages] == ["Page 1", "Page 2"]
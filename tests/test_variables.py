@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import figmapy
+from figmapy import VariableBatch
+from figmapy.variables import VARIABLE_CHANGE_KINDS
+
+
+class Server:
+    """post_variables that hands out real ids and rejects bad references, like Figma."""
+
+    def __init__(self, reject=()):
+        self.bodies: list[dict] = []
+        self.real: set[str] = {"VariableCollectionId:existing"}
+        self.reject = set(reject)
+        self.count = 0
+
+    def handler(self, request):
+        body = json.loads(request.content)
+        assert list(body) == [kind for kind in VARIABLE_CHANGE_KINDS if kind in body]
+        if any(change.get("name") in self.reject for changes in body.values() for change in changes):
+            return httpx.Response(400, json={"status": 400, "error": True, "message": "Invalid name"})
+        temp: dict[str, str] = {}
+        for changes in body.values():
+            for change in changes:
+                for field in ("variableCollectionId", "variableId", "modeId"):
+                    if field in change:
+                        assert change[field] in self.real or change[field] in temp, change
+                if change.get("action") == "CREATE":
+                    for id in (change.get("id"), change.get("initialModeId")):
+                        if id is not None:
+                            self.count += 1
+                            temp[id] = f"Real:{self.count}"
+        self.real.update(temp.values())
+        self.bodies.append(body)
+        return httpx.Response(200, json={"status": 200, "error": False, "meta": {"tempIdToRealId": temp}})
+
+
+def tokens(batch, count):
+    colors = batch.create_collection("Colors", initial_mode_id="light")
+    dark = batch.create_mode(colors, "Dark")
+    variables = []
+    for i in range(count):
+        var = batch.create_variable(colors, f"color/{i}", "COLOR")
+        batch.set_value(var, "light", {"r": 1, "g": 1, "b": 1, "a": 1})
+        batch.set_value(var, dark, {"r": 0, "g": 0, "b": 0, "a": 1})
+        variables.append(var)
+    batch.set_value(variables[0], dark, {"type": "VARIABLE_ALIAS", "id": variables[-1]})
+    return colors, variables
+
+
+def test_splits_into_requests_that_fit_and_resolves_temporary_ids(make_client):
+    server = Server()
+    batch = VariableBatch("FILE", max_bytes=4000)
+    colors, variables = tokens(batch, 50)
+    seen = []
+    report = batch.submit(make_client(server.handler), progress=lambda done, total: seen.append((done, total)))
+
+    assert report.ok and report.applied == 153 and len(batch) == 0
+    assert report.requests == len(server.bodies) > 3
+    assert all(len(json.dumps(body, separators=(",", ":"))) <= 4000 for body in server.bodies)
+    assert seen[-1] == (153, 153) and [done for done, _ in seen] == sorted(done for done, _ in seen)
+    # The order one request would have applied them in
+    sent = [(kind, change) for body in server.bodies for kind, changes in body.items() for change in changes]
+    assert [kind for kind, _ in sent] == sorted((kind for kind, _ in sent), key=VARIABLE_CHANGE_KINDS.index)
+    assert [c["name"] for k, c in sent if k == "variables"] == [f"color/{i}" for i in range(50)]
+    # ...with the ids of objects created in earlier requests filled in
+    alias = sent[-1][1]["value"]
+    assert alias == {"type": "VARIABLE_ALIAS", "id": batch.temp_ids[variables[-1]]}
+    assert set(batch.temp_ids) == {colors, "light", "temp-2", *variables}
+
+
+def test_max_changes(make_client):
+    server = Server()
+    batch = VariableBatch("FILE", max_changes=10)
+    tokens(batch, 10)
+    assert [sum(map(len, body.values())) for body in batch.request_bodies()] == [10, 10, 10, 3]
+    assert batch.submit(make_client(server.handler)).requests == 4
+
+
+def test_a_rejected_change_is_isolated_and_the_batch_can_resume(make_client):
+    server = Server(reject={"color/7"})
+    batch = VariableBatch("FILE")
+    tokens(batch, 20)
+    report = batch.submit(make_client(server.handler, max_retries=0))
+
+    assert not report.ok and isinstance(report.error, figmapy.FigmaHTTPError)
+    assert [(kind, change["name"]) for kind, change in report.failed] == [("variables", "color/7")]
+    # everything before the bad change went in; it and everything after it did not
+    assert report.applied == 2 + 7 and report.remaining == len(batch) == 63 - 9
+    assert "ok" not in repr(report) and "remaining" in repr(report)
+
+    server.reject.clear()
+    report = batch.submit(make_client(server.handler))
+    assert report.ok and report.applied == 54 and len(batch) == 0
+
+
+def test_a_change_figma_keeps_rejecting_can_be_discarded(make_client):
+    server = Server(reject={"bad"})
+    batch = VariableBatch("FILE")
+    colors, _ = tokens(batch, 5)
+    batch.create_variable(colors, "bad", "COLOR")
+    batch.create_variable(colors, "after", "COLOR")
+    client = make_client(server.handler, max_retries=0)
+    assert [change["name"] for _, change in batch.submit(client).failed] == ["bad"]
+
+    assert [(kind, change["name"]) for kind, change in batch.discard_failed()] == [("variables", "bad")]
+    assert batch.discard_failed() == []
+    report = batch.submit(client)  # the server still rejects it
+    assert report.ok and len(batch) == 0
+    names = [c["name"] for body in server.bodies for c in body.get("variables", [])]
+    assert "bad" not in names and names[-1] == "after"
+
+
+def test_async_submit():
+    server = Server()
+    batch = VariableBatch("FILE", max_bytes=4000)
+    tokens(batch, 30)
+
+    async def main():
+        transport = httpx.MockTransport(server.handler)
+        async with figmapy.AsyncFigma("t", http_client=httpx.AsyncClient(transport=transport)) as figma:
+            return await batch.asubmit(figma)
+
+    report = asyncio.run(main())
+    assert report.ok and report.applied == 93 and report.requests > 1
+
+
+def test_changes_are_checked_as_they_are_added():
+    batch = VariableBatch("FILE", max_bytes=500)
+    batch.create_mode("VariableCollectionId:existing", "Mode", id="m")
+    with pytest.raises(ValueError, match="already used"):
+        batch.create_variable("VariableCollectionId:existing", "x", "FLOAT", id="m")
+    with pytest.raises(ValueError, match="longer than 40"):
+        batch.create_mode("VariableCollectionId:existing", "x" * 41)
+    with pytest.raises(ValueError, match="larger than max_bytes"):
+        batch.update_variable("v", description="x" * 600)
+    with pytest.raises(ValueError, match="larger than max_bytes"):
+        batch.add("variableModes", {"action": "CREATE", "id": "big", "name": "Big",
+                                    "variableCollectionId": "VariableCollectionId:existing", "x": "x" * 600})
+    # ...and a refused mode does not count towards the collection's 40
+    for i in range(38):
+        batch.create_mode("VariableCollectionId:existing", f"Mode {i}")
+    with pytest.raises(ValueError, match="more than 40 modes"):
+        batch.create_mode("VariableCollectionId:existing", "One too many")
+    with pytest.raises(ValueError, match="kind must be"):
+        batch.add("styles", {})
+
+
+def test_models_are_accepted():
+    batch = VariableBatch("FILE")
+    batch.add("variableModeValues", figmapy.models.VariableModeValue(variableId="v", modeId="m", value=None))
+    assert batch.request_bodies() == [{"variableModeValues": [{"variableId": "v", "modeId": "m", "value": None}]}]
@@ -0,0 +1,414 @@
+"""Throughput benchmarks on a synthetic file, for changes that claim to be faster.
+
+    python tools/benchmark.py parse                       # ~10k nodes
+    python tools/benchmark.py parse --pages 20 --frames 100
+    python tools/benchmark.py decode                      # bytes -> model, per decoder
+    python tools/benchmark.py walk                        # ~500k nodes
+    python tools/benchmark.py query                       # find_all per rule vs select_many
+    python tools/benchmark.py spatial                     # scanning bounds vs SpatialIndex
+    python tools/benchmark.py diff                        # comparing dumps vs diff_files
+    python tools/benchmark.py hash                        # hash_nodes, save and load
+    python tools/benchmark.py download                    # one at a time vs download_images
+    python tools/benchmark.py analytics                   # rows as models vs AnalyticsTable
+
+The file is generated, not downloaded: pages of frames of text nodes, shaped like what
+``get_file`` returns. Numbers are best-of-``--repeat`` wall time and nodes per second.
+``download`` serves images from an in-process transport with simulated latency.
+``analytics`` reports the memory the kept rows take, measured with tracemalloc.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from figmapy import (  # noqa: E402
+    AnalyticsTable,
+    NodeHashes,
+    SpatialIndex,
+    diff_files,
+    download_images,
+    find_all,
+    hash_nodes,
+    models,
+    select_many,
+    walk,
+)
+from figmapy._decode import loads_for  # noqa: E402
+from figmapy._parsing import construct_trusted  # noqa: E402
+
+
+def _box(x: float, y: float) -> dict:
+    return {"x": x, "y": y, "width": 120, "height": 24}
+
+
+def text_node(node_id: str, y: float, x: float = 0) -> dict:
+    return {
+        "id": node_id,
+        "name": f"Label {node_id}",
+        "type": "TEXT",
+        "scrollBehavior": "SCROLLS",
+        "characters": "Lorem ipsum dolor sit amet",
+        "blendMode": "PASS_THROUGH",
+        "absoluteBoundingBox": _box(x, y),
+        "absoluteRenderBounds": _box(x, y),
+        "constraints": {"vertical": "TOP", "horizontal": "LEFT"},
+        "fills": [{"type": "SOLID", "blendMode": "NORMAL", "color": {"r": 0, "g": 0, "b": 0, "a": 1}}],
+        "strokes": [],
+        "effects": [],
+        "style": {"fontFamily": "Inter", "fontWeight": 400, "fontSize": 14, "textAlignHorizontal": "LEFT",
+                  "textAlignVertical": "TOP", "letterSpacing": 0, "lineHeightPx": 20, "lineHeightUnit": "PIXELS"},
+        "characterStyleOverrides": [],
+        "styleOverrideTable": {},
+        "lineTypes": ["NONE"],
+        "lineIndentations": [0],
+    }
+
+
+def frame_node(node_id: str, children: list, x: float = 0, y: float = 0) -> dict:
+    return {
+        "id": node_id,
+        "name": f"Frame {node_id}",
+        "type": "FRAME",
+        "scrollBehavior": "SCROLLS",
+        "blendMode": "PASS_THROUGH",
+        "children": children,
+        "absoluteBoundingBox": _box(x, y),
+        "absoluteRenderBounds": _box(x, y),
+        "constraints": {"vertical": "TOP", "horizontal": "LEFT"},
+        "clipsContent": True,
+        "background": [],
+        "fills": [],
+        "strokes": [],
+        "strokeWeight": 1,
+        "strokeAlign": "INSIDE",
+        "effects": [],
+        "cornerRadius": 0,
+        "layoutGrids": [],
+    }
+
+
+def synthetic_file(pages: int, frames: int, texts: int) -> dict:
+    """A ``get_file`` response with pages * frames * (texts + 1) nodes below the pages."""
+    canvases = []
+    for p in range(pages):
+        # Frames on a grid 20 wide, each a column of text nodes.
+        children = [
+            frame_node(f"{p}:{f}", [text_node(f"{p}:{f}:{t}", (f // 20) * 2000 + t * 24, (f % 20) * 200)
+                                    for t in range(texts)], (f % 20) * 200, (f // 20) * 2000)
+            for f in range(frames)
+        ]
+        canvases.append({
+            "id": f"0:{p}", "name": f"Page {p}", "type": "CANVAS", "scrollBehavior": "SCROLLS",
+            "children": children, "backgroundColor": {"r": 1, "g": 1, "b": 1, "a": 1},
+            "prototypeStartNodeID": None, "flowStartingPoints": [],
+            "prototypeDevice": {"type": "NONE", "rotation": "NONE"},
+        })
+    return {
+        "name": "Benchmark", "role": "owner", "lastModified": "2026-01-01T00:00:00Z", "editorType": "figma",
+        "version": "1", "schemaVersion": 0, "components": {}, "componentSets": {}, "styles": {},
+        "document": {"id": "0:0", "name": "Document", "type": "DOCUMENT", "scrollBehavior": "SCROLLS",
+                     "children": canvases},
+    }
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def report(label: str, seconds: float, nodes: int, baseline: float | None = None, unit: str = "nodes") -> None:
+    line = f"  {label:<30} {seconds * 1000:9.1f} ms  {nodes / seconds:12,.0f} {unit}/s"
+    if baseline is not None:
+        line += f"  {baseline / seconds:5.2f}x"
+    print(line)
+
+
+def bench_parse(args: argparse.Namespace) -> None:
+    data = synthetic_file(args.pages, args.frames, args.texts)
+    nodes = args.pages * args.frames * (args.texts + 1)
+    model = models.GetFileResponse
+    print(f"parse: {nodes:,} nodes, best of {args.repeat}")
+    eager = best_of(args.repeat, lambda: model.model_validate(data))
+    report('parse=True (model_validate)', eager, nodes)
+    report('parse="trusted"', best_of(args.repeat, lambda: construct_trusted(model, data)), nodes, eager)
+
+
+def bench_decode(args: argparse.Namespace) -> None:
+    body = json.dumps(synthetic_file(args.pages, args.frames, args.texts)).encode()
+    nodes = args.pages * args.frames * (args.texts + 1)
+    model = models.GetFileResponse
+    print(f"decode: {len(body) / 2**20:.1f} MiB, {nodes:,} nodes, best of {args.repeat}")
+    two_pass = best_of(args.repeat, lambda: model.model_validate(json.loads(body)))
+    report('decoder="json"', two_pass, nodes)
+    try:
+        orjson_loads = loads_for("orjson")
+    except ImportError:
+        print('  decoder="orjson"               (orjson not installed)')
+    else:
+        report('decoder="orjson"', best_of(args.repeat, lambda: model.model_validate(orjson_loads(body))), nodes,
+               two_pass)
+    report('decoder="pydantic" (one pass)', best_of(args.repeat, lambda: model.model_validate_json(body)), nodes,
+           two_pass)
+
+
+def recursive_walk(node: object):
+    """``walk`` as of 2026.1.0: nested generators, one frame per level."""
+    for child in getattr(node, "children", None) or ():
+        yield child
+        yield from recursive_walk(child)
+
+
+def bench_walk(args: argparse.Namespace) -> None:
+    file = construct_trusted(models.GetFileResponse, synthetic_file(args.pages, args.frames, args.texts))
+    nodes = args.pages * (args.frames * (args.texts + 1) + 1)
+    print(f"walk: {nodes:,} nodes, best of {args.repeat}")
+
+    def count(nodes):
+        return lambda: sum(1 for _ in nodes())
+
+    baseline = best_of(args.repeat, count(lambda: recursive_walk(file.document)))
+    report("recursive generators", baseline, nodes)
+    report("walk()", best_of(args.repeat, count(lambda: walk(file))), nodes, baseline)
+    report('walk(order="breadth")', best_of(args.repeat, count(lambda: walk(file, order="breadth"))), nodes,
+           baseline)
+    report("walk(max_depth=2)", best_of(args.repeat, count(lambda: walk(file, max_depth=2))), nodes, baseline)
+    report("walk(prune=TEXT)", best_of(args.repeat, count(lambda: walk(file, prune=lambda n: n.type == "TEXT"))),
+           nodes, baseline)
+
+
+def bench_query(args: argparse.Namespace) -> None:
+    file = construct_trusted(models.GetFileResponse, synthetic_file(args.pages, args.frames, args.texts))
+    nodes = args.pages * (args.frames * (args.texts + 1) + 1)
+    # Lint-style rules: a type plus a predicate each, as find_all(where=...) and as selectors.
+    types = ("TEXT", "FRAME", "COMPONENT", "INSTANCE", "VECTOR", "RECTANGLE", "GROUP", "ELLIPSE")
+    rules = {f"rule{i}": (types[i % len(types)], f"Label {i}:*") for i in range(args.rules)}
+    print(f"query: {nodes:,} nodes, {len(rules)} rules, best of {args.repeat}")
+
+    def one_walk_per_rule():
+        return {key: find_all(file, type=type, where=lambda n, p=prefix[:-1]: n.name.startswith(p))
+                for key, (type, prefix) in rules.items()}
+
+    selectors = {key: f'{type}[name="{prefix}"]' for key, (type, prefix) in rules.items()}
+    baseline = best_of(args.repeat, one_walk_per_rule)
+    report("find_all per rule", baseline, nodes)
+    report("select_many", best_of(args.repeat, lambda: select_many(file, selectors)), nodes, baseline)
+
+
+def bench_spatial(args: argparse.Namespace) -> None:
+    import random
+
+    file = construct_trusted(models.GetFileResponse, synthetic_file(1, args.frames, args.texts))
+    page = file.document.children[0]
+    nodes = args.frames * (args.texts + 1)
+    rng = random.Random(0)
+    points = [(rng.uniform(0, 4000), rng.uniform(0, (args.frames // 20 + 1) * 2000)) for _ in range(args.queries)]
+    print(f"spatial: {nodes:,} nodes on one page, {args.queries} point queries, best of {args.repeat}")
+
+    def scan():
+        boxes = [(b.x, b.y, b.x + b.width, b.y + b.height, n) for n in walk(page) for b in [n.absoluteBoundingBox]]
+        for x, y in points:
+            [n for x0, y0, x1, y1, n in boxes if x0 <= x <= x1 and y0 <= y <= y1]
+
+    def indexed():
+        index = SpatialIndex(page)
+        for x, y in points:
+            index.at(x, y)
+
+    baseline = best_of(args.repeat, scan)
+    report("scan every node", baseline, nodes * args.queries)
+    report("SpatialIndex (incl. build)", best_of(args.repeat, indexed), nodes * args.queries, baseline)
+    index = SpatialIndex(page)
+    report("SpatialIndex build", best_of(args.repeat, lambda: SpatialIndex(page)), nodes)
+    report("SpatialIndex.nearest(k=5)", best_of(args.repeat, lambda: [index.nearest(x, y, 5) for x, y in points]),
+           nodes * args.queries, baseline)
+
+
+def bench_diff(args: argparse.Namespace) -> None:
+    data = synthetic_file(args.pages, args.frames, args.texts)
+    nodes = args.pages * args.frames * (args.texts + 1)
+    old = models.GetFileResponse.model_validate(data)
+    # A typical edit: a handful of texts changed on one page.
+    for t in range(5):
+        data["document"]["children"][0]["children"][0]["children"][t]["characters"] = "Edited"
+    new = models.GetFileResponse.model_validate(data)
+    print(f"diff: {nodes:,} nodes, 5 changed, best of {args.repeat}")
+
+    def compare_dumps():
+        before = {n.id: n.model_dump(exclude={"children"}, warnings=False) for n in walk(old)}
+        after = {n.id: n.model_dump(exclude={"children"}, warnings=False) for n in walk(new)}
+        return [i for i in before.keys() | after.keys() if before.get(i) != after.get(i)]
+
+    baseline = best_of(args.repeat, compare_dumps)
+    report("model_dump every node", baseline, nodes)
+    report("diff_files", best_of(args.repeat, lambda: diff_files(old, new)), nodes, baseline)
+
+
+def bench_hash(args: argparse.Namespace) -> None:
+    file = models.GetFileResponse.model_validate(synthetic_file(args.pages, args.frames, args.texts))
+    nodes = args.pages * args.frames * (args.texts + 1)
+    print(f"hash: {nodes:,} nodes, best of {args.repeat}")
+    report("hash_nodes", best_of(args.repeat, lambda: hash_nodes(file)), nodes)
+    hashes = hash_nodes(file)
+    report("NodeHashes.to_bytes", best_of(args.repeat, hashes.to_bytes), nodes)
+    data = hashes.to_bytes()
+    report("NodeHashes.from_bytes", best_of(args.repeat, lambda: NodeHashes.from_bytes(data)), nodes)
+    previous = NodeHashes.from_bytes(data)
+    report("changed(previous)", best_of(args.repeat, lambda: hashes.changed(previous)), nodes)
+
+
+def bench_download(args: argparse.Namespace) -> None:
+    body = b"\x89PNG" + bytes(args.size)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        time.sleep(args.latency / 1000)
+        return httpx.Response(200, content=body, headers={"content-type": "image/png"})
+
+    images = {f"1:{i}": f"https://images.invalid/{i}" for i in range(args.images)}
+    print(f"download: {args.images} images of {len(body):,} bytes, {args.latency} ms latency, "
+          f"best of {args.repeat}")
+
+    with tempfile.TemporaryDirectory() as out, httpx.Client(transport=httpx.MockTransport(handler)) as http:
+        def one_at_a_time():
+            for key, url in images.items():
+                Path(out, key.replace(":", "-") + ".png").write_bytes(http.get(url).content)
+
+        baseline = best_of(args.repeat, one_at_a_time)
+        report("httpx.get one at a time", baseline, args.images, unit="images")
+        seconds = best_of(args.repeat, lambda: download_images(
+            images, out, concurrency=args.concurrency, http_client=http))
+        report(f"download_images ({args.concurrency} at once)", seconds, args.images, baseline, unit="images")
+
+
+def bench_analytics(args: argparse.Namespace) -> None:
+    teams = [f"Team {i}" for i in range(200)]
+    weeks = [f"2026-{m:02}-{d:02}" for m in range(1, 13) for d in (5, 12, 19, 26)]
+    pages = [
+        {"rows": [
+            {"week": weeks[(p + r) % len(weeks)], "team_name": teams[r % len(teams)], "workspace_name": None,
+             "detachments": r % 7, "insertions": r % 101}
+            for r in range(args.page_size)
+        ], "next_page": True, "cursor": str(p)}
+        for p in range(args.rows // args.page_size)
+    ]
+    # Decode each page from bytes, as a response would be, so no string is shared with `pages`.
+    bodies = [json.dumps(page).encode() for page in pages]
+    rows = len(bodies) * args.page_size
+    print(f"analytics: {rows:,} rows in pages of {args.page_size}")
+
+    def kept(build: Callable[[], object]) -> tuple[float, int]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = build()
+        seconds = time.perf_counter() - start
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del result  # held until now, so the traced memory includes it
+        return seconds, size
+
+    def as_models():
+        model = models.GetLibraryAnalyticsComponentActionsResponse
+        return [row for body in bodies for row in model.model_validate_json(body).rows]
+
+    def as_columns():
+        table = AnalyticsTable.for_endpoint("component", "actions", "team")
+        for body in bodies:
+            table.extend(json.loads(body)["rows"], file_key="LIB")
+        return table
+
+    baseline, baseline_size = kept(as_models)
+    report("one model per row", baseline, rows, unit="rows")
+    print(f"  {'':<30} {baseline_size / 2**20:9.1f} MB")
+    seconds, size = kept(as_columns)
+    report("AnalyticsTable", seconds, rows, baseline, unit="rows")
+    print(f"  {'':<30} {size / 2**20:9.1f} MB  {baseline_size / size:5.2f}x less")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parse = commands.add_parser("parse", help="model_validate vs parse=\"trusted\"")
+    parse.add_argument("--pages", type=int, default=5)
+    parse.add_argument("--frames", type=int, default=40)
+    parse.add_argument("--texts", type=int, default=50)
+    parse.add_argument("--repeat", type=int, default=5)
+    parse.set_defaults(run=bench_parse)
+
+    decode = commands.add_parser("decode", help="json / orjson + model_validate vs model_validate_json")
+    decode.add_argument("--pages", type=int, default=5)
+    decode.add_argument("--frames", type=int, default=40)
+    decode.add_argument("--texts", type=int, default=50)
+    decode.add_argument("--repeat", type=int, default=3)
+    decode.set_defaults(run=bench_decode)
+
+    walk_ = commands.add_parser("walk", help="walk() vs the old recursive generator walk")
+    walk_.add_argument("--pages", type=int, default=10)
+    walk_.add_argument("--frames", type=int, default=500)
+    walk_.add_argument("--texts", type=int, default=99)
+    walk_.add_argument("--repeat", type=int, default=3)
+    walk_.set_defaults(run=bench_walk)
+
+    query = commands.add_parser("query", help="one find_all per rule vs one select_many")
+    query.add_argument("--pages", type=int, default=5)
+    query.add_argument("--frames", type=int, default=40)
+    query.add_argument("--texts", type=int, default=50)
+    query.add_argument("--rules", type=int, default=20)
+    query.add_argument("--repeat", type=int, default=3)
+    query.set_defaults(run=bench_query)
+
+    spatial = commands.add_parser("spatial", help="point queries: scanning bounds vs SpatialIndex")
+    spatial.add_argument("--frames", type=int, default=400)
+    spatial.add_argument("--texts", type=int, default=50)
+    spatial.add_argument("--queries", type=int, default=1000)
+    spatial.add_argument("--repeat", type=int, default=3)
+    spatial.set_defaults(run=bench_spatial)
+
+    diff = commands.add_parser("diff", help="comparing model dumps vs diff_files")
+    diff.add_argument("--pages", type=int, default=5)
+    diff.add_argument("--frames", type=int, default=40)
+    diff.add_argument("--texts", type=int, default=50)
+    diff.add_argument("--repeat", type=int, default=3)
+    diff.set_defaults(run=bench_diff)
+
+    hash_ = commands.add_parser("hash", help="hash_nodes and NodeHashes persistence")
+    hash_.add_argument("--pages", type=int, default=5)
+    hash_.add_argument("--frames", type=int, default=40)
+    hash_.add_argument("--texts", type=int, default=50)
+    hash_.add_argument("--repeat", type=int, default=3)
+    hash_.set_defaults(run=bench_hash)
+
+    download = commands.add_parser("download", help="httpx.get one at a time vs download_images")
+    download.add_argument("--images", type=int, default=200)
+    download.add_argument("--size", type=int, default=50_000)
+    download.add_argument("--latency", type=float, default=20.0, help="milliseconds per request")
+    download.add_argument("--concurrency", type=int, default=16)
+    download.add_argument("--repeat", type=int, default=3)
+    download.set_defaults(run=bench_download)
+
+    analytics = commands.add_parser("analytics", help="library analytics rows as models vs AnalyticsTable")
+    analytics.add_argument("--rows", type=int, default=200_000)
+    analytics.add_argument("--page-size", type=int, default=1000)
+    analytics.set_defaults(run=bench_analytics)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -117,6 +117,7 @@ def generate_models(flat_spec_path: Path) -> None:
     # pydantic maps `format: uri` to AnyUrl, which normalises the URL and is not a str.
     # Figma hands out signed, short-lived URLs; give them back exactly as received.
     text = _urls_as_str(text)
+    text = _unknown_node_fallback(text)
     MODELS_OUT.write_text(
         '"""Generated from spec/openapi.yaml by tools/generate.py. Do not edit."""\n\n'
         "# fmt: off\n"
@@ -144,6 +145,101 @@ def _urls_as_str(text: str) -> str:
     return "".join(out)
 
 
+# A node union as datamodel-codegen writes it: discriminated on `type`, members all *Node.
+_NODE_UNION = re.compile(
+    r"Annotated\[\s*Union\[(?P<members>(?:\s*\w+Node,)+)\s*\],\s*Field\(discriminator='type'\),\s*\]"
+)
+_NODE_TYPE = re.compile(r"^    type: (?:Annotated\[\s*)?Literal\['(\w+)'\]", re.M)
+
+_UNKNOWN_NODE = '''
+
+#: Every node `type` this spec knows. Nodes of any other type parse as UnknownNode.
+NODE_TYPES = frozenset({types})
+
+
+class UnknownNode(FigmaModel):
+    """
+    A node whose `type` is newer than the spec this release was generated from.
+
+    Node unions dispatch on `type`, and a type none of their members declare falls
+    through to this instead of failing the whole response. Everything Figma sent is
+    kept as an attribute, and children are parsed like any other node's.
+    """
+
+    id: str
+    name: str
+    type: str
+    children: Optional[list[{children}]] = None
+
+    @field_validator('type')
+    @classmethod
+    def _not_a_known_type(cls, value: str) -> str:
+        if value in NODE_TYPES:
+            # A known type that failed its own model: report that, do not swallow it.
+            raise ValueError(f'{{value!r}} nodes are not parsed as UnknownNode')
+        return value
+'''
+
+
+def _unknown_node_fallback(text: str) -> str:
+    """Let node unions accept node types the spec does not know yet.
+
+    The node unions are discriminated on `type`, so pydantic goes straight to the one
+    model that matches instead of trying each in turn. On its own that makes a single
+    node of a brand-new type fail the whole response, which breaks the promise that
+    Figma's additions pass through untouched. Each union is wrapped as
+    ``Union[<discriminated>, UnknownNode]`` in left-to-right mode: known types still
+    cost one dispatch, and only an unmatched tag goes on to UnknownNode.
+    """
+    children = None
+    members: set[str] = set()
+
+    def wrap(match: re.Match) -> str:
+        nonlocal children
+        members.update(re.findall(r"\w+", match.group("members")))
+        wrapped = f"Annotated[Union[{match.group(0)}, UnknownNode], Field(union_mode='left_to_right')]"
+        if children is None and "DocumentNode" not in match.group("members"):
+            children = wrapped  # the SubcanvasNode union: what any node's children can be
+        return wrapped
+
+    text = _NODE_UNION.sub(wrap, text)
+    if children is None:
+        return text  # the spec changed shape; nothing to wrap
+    text = re.sub(r"^(from pydantic import .*)$", r"\1, field_validator", text, count=1, flags=re.M)
+    types = sorted(_node_types(text, members))
+    block = _UNKNOWN_NODE.format(types="{" + ", ".join(map(repr, types)) + "}", children=children)
+    # datamodel-codegen ends the module with model_rebuild() calls; UnknownNode goes
+    # before them, since the classes being rebuilt refer to it.
+    classes, rebuilds = text.rstrip("\n").rsplit("\n\n\n", 1)
+    text = f"{classes}\n{block}\n\n{rebuilds}\nUnknownNode.model_rebuild()\n"
+    return _format(text)
+
+
+def _node_types(text: str, classes: set[str]) -> set[str]:
+    """The `type` literal each of `classes` declares, read from the generated source."""
+    types = set()
+    for block in text.split("\n\n\nclass ")[1:]:
+        name = block[: block.index("(")]
+        match = _NODE_TYPE.search(block)
+        if name in classes and match:
+            types.add(match.group(1))
+    return types
+
+
+def _format(text: str) -> str:
+    """Reformat the edited models with ruff, which the dev extra installs.
+
+    Isolated from the repo's ruff settings, which exclude the generated files and use
+    110 columns: 88 and preserved quotes match datamodel-codegen's own formatting.
+    """
+    result = subprocess.run(
+        [sys.executable, "-m", "ruff", "format", "--isolated", "--line-length", "88",
+         "--config", "format.quote-style='preserve'", "-"],
+        input=text, capture_output=True, text=True, check=True,
+    )
+    return result.stdout
+
+
 class Operation:
     def __init__(self, path: str, method: str, op: dict, spec: dict):
         self.path = path
@@ -284,6 +380,14 @@ def generate_endpoints(spec: dict, spec_version: str) -> int:
             out.append("")
         out.append("\n")
 
+    # Lets hand-written code (rate limiting, chunking) recognise a request by the
+    # operation it belongs to, without parsing docstrings or duplicating paths.
+    out.append("#: (HTTP method, path template) -> method name, for every operation.")
+    out.append("OPERATIONS = {")
+    for op in sorted(operations, key=lambda o: (o.path, o.method)):
+        out.append(f"    ({op.method!r}, {op.path!r}): {op.name!r},")
+    out.append("}")
+
     ENDPOINTS_OUT.write_text("\n".join(out).rstrip() + "\n", encoding="utf8")
     return len(operations)
 